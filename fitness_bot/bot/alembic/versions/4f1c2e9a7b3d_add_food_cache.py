@@ -0,0 +1,27 @@
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '4f1c2e9a7b3d'
+down_revision: Union[str, Sequence[str], None] = 'b6d812c2aad0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('food_cache',
+    sa.Column('query', sa.Text(), nullable=False),
+    sa.Column('food_id', sa.Text(), nullable=True),
+    sa.Column('name', sa.Text(), nullable=True),
+    sa.Column('kcal_per_100g', sa.Float(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('query')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('food_cache')
@@ -0,0 +1,29 @@
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '7c3a9d51e2f4'
+down_revision: Union[str, Sequence[str], None] = '4f1c2e9a7b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fsm_storage',
+    sa.Column('key', sa.Text(), nullable=False),
+    sa.Column('state', sa.Text(), nullable=True),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_fsm_storage_expires_at', 'fsm_storage', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fsm_storage_expires_at', table_name='fsm_storage')
+    op.drop_table('fsm_storage')
@@ -0,0 +1,24 @@
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '8e1f3a6c2b90'
+down_revision: Union[str, Sequence[str], None] = '2d8b6f0c4a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('city_weather',
+    sa.Column('city', sa.Text(), nullable=False),
+    sa.Column('temperature_c', sa.Float(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('city')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('city_weather')
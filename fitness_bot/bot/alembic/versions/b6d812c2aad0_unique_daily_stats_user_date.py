@@ -0,0 +1,57 @@
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b6d812c2aad0'
+down_revision: Union[str, Sequence[str], None] = '53da5167f76a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        WITH totals AS (
+            SELECT
+                MIN(id) AS keep_id,
+                SUM(water_logged_ml) AS water_logged_ml,
+                SUM(calories_consumed_kcal) AS calories_consumed_kcal,
+                SUM(calories_burned_kcal) AS calories_burned_kcal,
+                MAX(updated_at) AS updated_at
+            FROM daily_stats
+            GROUP BY user_id, date
+            HAVING COUNT(*) > 1
+        )
+        UPDATE daily_stats AS s
+        SET water_logged_ml = t.water_logged_ml,
+            calories_consumed_kcal = t.calories_consumed_kcal,
+            calories_burned_kcal = t.calories_burned_kcal,
+            updated_at = t.updated_at
+        FROM totals AS t
+        WHERE s.id = t.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM daily_stats AS d
+        USING daily_stats AS k
+        WHERE d.user_id = k.user_id
+          AND d.date = k.date
+          AND d.id > k.id
+        """
+    )
+
+    op.create_index(
+        "ux_daily_stats_user_id_date",
+        "daily_stats",
+        ["user_id", "date"],
+        unique=True,
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_daily_stats_user_id_date", table_name="daily_stats", schema="public")
@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+from domain.exceptions import ConcurrencyConflictError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CONFLICT_ATTEMPTS = 3
+
+
+def retry_on_conflict(
+    attempts: int = DEFAULT_CONFLICT_ATTEMPTS, backoff_s: float = 0.005
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Декоратор сценария, повторяющий его при конфликте версий.
+
+    Входные параметры:
+        attempts (int): Максимальное число попыток, включая первую.
+        backoff_s (float): Базовая пауза между попытками; растёт линейно
+        с номером попытки.
+
+    Логика работы:
+        - Сценарий должен целиком состоять из чтения, изменения и записи
+          через репозитории, чтобы его можно было выполнить повторно.
+        - Повтор выполняется в той же транзакции: неудачный UPDATE
+          с проверкой версии не меняет строк, а чтения репозиториев
+          перезагружают объекты из базы.
+        - После исчерпания попыток исключение передаётся вызывающему.
+
+    Возвращаемое значение:
+        Callable: Декоратор.
+    """
+
+    def decorator(use_case: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(use_case)
+        async def wrapper(*args, **kwargs) -> T:
+            for attempt in range(1, attempts + 1):
+                try:
+                    return await use_case(*args, **kwargs)
+                except ConcurrencyConflictError:
+                    if attempt == attempts:
+                        raise
+                    logger.info(
+                        "%s: version conflict, retry %d/%d",
+                        use_case.__name__,
+                        attempt,
+                        attempts - 1,
+                    )
+                    await asyncio.sleep(backoff_s * attempt)
+
+        return wrapper
+
+    return decorator
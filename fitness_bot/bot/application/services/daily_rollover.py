@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from domain.interfaces.unit_of_work import UnitOfWork
+from infrastructure.api.weather_client import WeatherClient
+
+logger = logging.getLogger(__name__)
+
+
+def next_local_midnight(now: datetime, zone: ZoneInfo) -> datetime:
+    local_now = now.astimezone(zone)
+    midnight = datetime.combine(local_now.date() + timedelta(days=1), time(), tzinfo=zone)
+    return midnight.astimezone(timezone.utc)
+
+
+class DailyRolloverScheduler:
+    def __init__(
+        self,
+        uow_factory: Callable[[], UnitOfWork],
+        weather_client: WeatherClient,
+        active_days: int = 14,
+        check_interval_s: float = 300.0,
+        weather_concurrency: int = 8,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        """
+        Инициализирует планировщик суточного перехода по часовым поясам.
+
+        Входные параметры:
+            uow_factory (Callable[[], UnitOfWork]): Фабрика единиц работы
+            основного сервера.
+            weather_client (WeatherClient): Клиент погодного сервиса.
+            active_days (int): Пользователь считается активным, если у него
+            есть суточная статистика за последние active_days дней.
+            check_interval_s (float): Максимальный интервал между проверками,
+            за который подхватываются новые часовые пояса.
+            weather_concurrency (int): Число одновременных запросов погоды.
+            clock (Callable[[], datetime]): Источник текущего времени UTC.
+
+        Логика работы:
+            - Для каждого часового пояса пользователей (User.timezone)
+              отслеживает локальную дату; при её смене (и при запуске)
+              выполняет переход.
+            - Переход обновляет температуру городов активных пользователей
+              пояса в city_weather, затем одним INSERT ... SELECT создаёт
+              строки daily_stats на новую локальную дату с целями,
+              учитывающими температуру.
+            - Запросы погоды выполняются до открытия транзакции.
+            - Между переходами спит до ближайшей локальной полуночи,
+              но не дольше check_interval_s.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.uow_factory = uow_factory
+        self.weather_client = weather_client
+        self.active_days = active_days
+        self.check_interval_s = check_interval_s
+        self._weather_semaphore = asyncio.Semaphore(weather_concurrency)
+        self._clock = clock
+        self._rolled: Dict[str, date] = {}
+        self._zones: Dict[str, Optional[ZoneInfo]] = {}
+        self.stats = {
+            "rollovers": 0,
+            "rows_created": 0,
+            "cities_refreshed": 0,
+            "weather_failures": 0,
+            "failures": 0,
+        }
+
+    def _zone(self, name: str) -> Optional[ZoneInfo]:
+        if name not in self._zones:
+            try:
+                self._zones[name] = ZoneInfo(name)
+            except (ZoneInfoNotFoundError, ValueError):
+                logger.warning("Unknown user timezone %r, skipping rollover", name)
+                self._zones[name] = None
+        return self._zones[name]
+
+    async def _temperature(self, city: str) -> Optional[float]:
+        async with self._weather_semaphore:
+            try:
+                return await self.weather_client.get_temperature(city)
+            except Exception:
+                self.stats["weather_failures"] += 1
+                logger.warning("Weather lookup for %s failed", city, exc_info=True)
+                return None
+
+    async def rollover(self, timezone_name: str, stats_date: date) -> int:
+        """
+        Выполняет суточный переход для одного часового пояса.
+
+        Входные параметры:
+            timezone_name (str): Часовой пояс пользователей.
+            stats_date (date): Новая локальная дата пояса.
+
+        Возвращаемое значение:
+            int: Число созданных строк суточной статистики.
+        """
+        active_since = stats_date - timedelta(days=self.active_days)
+        async with self.uow_factory() as uow:
+            cities = await uow.users.get_active_cities(timezone_name, active_since)
+
+        fetched_at = self._clock().replace(tzinfo=None)
+        temperatures = await asyncio.gather(*(self._temperature(city) for city in cities))
+        refreshed = {
+            city: temperature
+            for city, temperature in zip(cities, temperatures)
+            if temperature is not None
+        }
+
+        async with self.uow_factory() as uow:
+            await uow.city_weather.upsert_many(refreshed, fetched_at)
+            created = await uow.daily_stats.precreate_for_timezone(
+                timezone_name,
+                stats_date,
+                active_since,
+                weather_since=fetched_at - timedelta(days=1),
+            )
+
+        self.stats["rollovers"] += 1
+        self.stats["rows_created"] += created
+        self.stats["cities_refreshed"] += len(refreshed)
+        logger.info(
+            "Daily rollover %s %s: %d rows, %d/%d cities with weather",
+            timezone_name,
+            stats_date,
+            created,
+            len(refreshed),
+            len(cities),
+        )
+        return created
+
+    async def run_due(self) -> datetime:
+        """
+        Выполняет переходы для поясов, у которых сменилась локальная дата.
+
+        Возвращаемое значение:
+            datetime: Момент (UTC) ближайшей следующей полуночи среди поясов.
+        """
+        async with self.uow_factory() as uow:
+            timezone_names: List[str] = await uow.users.get_timezones()
+
+        now = self._clock()
+        wake_at = now + timedelta(seconds=self.check_interval_s)
+        for timezone_name in timezone_names:
+            zone = self._zone(timezone_name)
+            if zone is None:
+                continue
+            local_date = now.astimezone(zone).date()
+            if self._rolled.get(timezone_name) != local_date:
+                try:
+                    await self.rollover(timezone_name, local_date)
+                except Exception:
+                    self.stats["failures"] += 1
+                    logger.exception("Daily rollover for %s failed", timezone_name)
+                    continue
+                self._rolled[timezone_name] = local_date
+            wake_at = min(wake_at, next_local_midnight(now, zone))
+        return wake_at
+
+    async def run_periodically(self) -> None:
+        while True:
+            try:
+                wake_at = await self.run_due()
+            except Exception:
+                logger.exception("Daily rollover check failed")
+                wake_at = self._clock() + timedelta(seconds=self.check_interval_s)
+            delay_s = (wake_at - self._clock()).total_seconds()
+            await asyncio.sleep(max(delay_s, 1.0))
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "timezones": len(self._rolled)}
@@ -0,0 +1,51 @@
+from typing import Sequence
+
+import numpy as np
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> np.ndarray:
+    """
+    Выбирает точки ряда алгоритмом Largest-Triangle-Three-Buckets.
+
+    Входные параметры:
+        xs (Sequence[float]): Значения по оси X, упорядоченные по возрастанию.
+        ys (Sequence[float]): Значения по оси Y той же длины.
+        threshold (int): Сколько точек оставить.
+
+    Логика работы:
+        - Первая и последняя точки сохраняются всегда.
+        - Остальные точки делятся на threshold - 2 корзины, из каждой
+          берётся точка, образующая наибольший треугольник с предыдущей
+          выбранной точкой и средним следующей корзины.
+        - Площади внутри корзины считаются векторно.
+
+    Возвращаемое значение:
+        np.ndarray: Индексы выбранных точек по возрастанию.
+    """
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
@@ -0,0 +1,188 @@
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from domain.entities.food_cache_entry import FoodCacheEntry
+from domain.interfaces.unit_of_work import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _singularize(word: str) -> str:
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "sses", "xes", "oes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_food_query(query: str) -> str:
+    """
+    Приводит запрос продукта к ключу кэша.
+
+    Входные параметры:
+        query (str): Запрос пользователя.
+
+    Логика работы:
+        - Переводит строку в нижний регистр и схлопывает пробелы.
+        - Приводит английские слова во множественном числе к единственному
+          по простым правилам (bananas -> banana, berries -> berry).
+
+    Возвращаемое значение:
+        str: Нормализованный ключ запроса.
+    """
+    collapsed = _WHITESPACE_RE.sub(" ", query.strip().lower())
+    return " ".join(_singularize(word) for word in collapsed.split(" "))
+
+
+class FoodLookupCache:
+    def __init__(
+        self,
+        uow_factory: Callable[[], UnitOfWork],
+        ttl_s: float,
+        negative_ttl_s: float,
+        memory_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Инициализирует двухуровневый кэш результатов поиска продуктов.
+
+        Входные параметры:
+            uow_factory (Callable[[], UnitOfWork]): Фабрика единиц работы
+            для доступа к таблице food_cache.
+            ttl_s (float): Время жизни найденного продукта.
+            negative_ttl_s (float): Время жизни результата «не найдено».
+            memory_size (int): Максимальное число записей в памяти процесса.
+            clock (Callable[[], float]): Источник монотонного времени.
+
+        Логика работы:
+            - Первый уровень — LRU в памяти процесса.
+            - Второй уровень — таблица food_cache в базе данных.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.uow_factory = uow_factory
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.memory_size = memory_size
+        self._clock = clock
+        self._memory: "OrderedDict[str, Tuple[float, FoodCacheEntry]]" = OrderedDict()
+        self.stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "stores": 0,
+        }
+
+    def _remember(self, entry: FoodCacheEntry) -> None:
+        ttl_s = (entry.expires_at - datetime.utcnow()).total_seconds()
+        if ttl_s <= 0:
+            return
+        self._memory[entry.query] = (self._clock() + ttl_s, entry)
+        self._memory.move_to_end(entry.query)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _from_memory(self, key: str) -> Optional[FoodCacheEntry]:
+        cached = self._memory.get(key)
+        if cached is None:
+            return None
+        expires_at, entry = cached
+        if expires_at <= self._clock():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return entry
+
+    async def get(self, key: str) -> Optional[FoodCacheEntry]:
+        """
+        Ищет запись кэша по нормализованному ключу.
+
+        Входные параметры:
+            key (str): Ключ, полученный из normalize_food_query.
+
+        Логика работы:
+            - Проверяет LRU в памяти.
+            - При промахе читает таблицу food_cache и кладёт найденную
+              запись в память.
+            - Ошибки базы данных не прерывают поиск и считаются промахом.
+
+        Возвращаемое значение:
+            Optional[FoodCacheEntry]: Актуальная запись (в том числе
+            отрицательная) или None при промахе.
+        """
+        entry = self._from_memory(key)
+        if entry is not None:
+            self.stats["memory_hits"] += 1
+        else:
+            try:
+                async with self.uow_factory() as uow:
+                    entry = await uow.food_cache.get(key, datetime.utcnow())
+            except Exception:
+                logger.exception("Food cache read failed for %r", key)
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["db_hits"] += 1
+            self._remember(entry)
+
+        if entry.is_negative:
+            self.stats["negative_hits"] += 1
+        return entry
+
+    async def put(self, key: str, result: Optional[Tuple[str, str, float]]) -> None:
+        """
+        Сохраняет результат поиска продукта в оба уровня кэша.
+
+        Входные параметры:
+            key (str): Нормализованный ключ запроса.
+            result (Optional[Tuple[str, str, float]]): Идентификатор, название
+            и калорийность на 100 грамм либо None, если продукт не найден.
+
+        Логика работы:
+            - Найденный продукт хранится ttl_s, отрицательный результат — negative_ttl_s.
+            - Ошибка записи в базу данных не прерывает обработку запроса.
+
+        Возвращаемое значение:
+            None.
+        """
+        now = datetime.utcnow()
+        if result is None:
+            entry = FoodCacheEntry(
+                query=key,
+                fetched_at=now,
+                expires_at=now + timedelta(seconds=self.negative_ttl_s),
+            )
+        else:
+            food_id, name, kcal_per_100g = result
+            entry = FoodCacheEntry(
+                query=key,
+                fetched_at=now,
+                expires_at=now + timedelta(seconds=self.ttl_s),
+                food_id=food_id,
+                name=name,
+                kcal_per_100g=kcal_per_100g,
+            )
+
+        self._remember(entry)
+        self.stats["stores"] += 1
+        try:
+            async with self.uow_factory() as uow:
+                await uow.food_cache.upsert(entry)
+        except Exception:
+            logger.exception("Food cache write failed for %r", key)
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "memory_entries": len(self._memory)}
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from domain.entities.daily_stats_series import DailyStatsSeries
+
+
+@dataclass
+class ProgressAnalytics:
+    water_goal_hit_ratio: float
+    calorie_goal_kept_ratio: float
+    water_trend_ml_per_day: float
+    calories_trend_kcal_per_day: float
+    water_trend: np.ndarray
+    calories_trend: np.ndarray
+    water_rolling_avg: Optional[np.ndarray] = None
+    calories_rolling_avg: Optional[np.ndarray] = None
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Скользящее среднее по окну window с неполными окнами в начале ряда.
+
+    Входные параметры:
+        values (np.ndarray): Значения ряда.
+        window (int): Размер окна в точках.
+
+    Возвращаемое значение:
+        np.ndarray: Средние значения той же длины, что и values.
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype=np.float64)
+    cumsum = np.cumsum(values, dtype=np.float64)
+    result = cumsum.copy()
+    result[window:] = cumsum[window:] - cumsum[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return result / counts
+
+
+def goal_hit_ratio(values: np.ndarray, goals: np.ndarray, at_least: bool = True) -> float:
+    """
+    Доля точек с заданной целью, в которых цель выполнена.
+
+    Входные параметры:
+        values (np.ndarray): Фактические значения.
+        goals (np.ndarray): Цели той же длины.
+        at_least (bool): True — цель выполнена при values >= goals,
+        False — при values <= goals.
+
+    Возвращаемое значение:
+        float: Доля от 0 до 1; 0, если ни в одной точке цель не задана.
+    """
+    with_goal = goals > 0
+    total = int(np.count_nonzero(with_goal))
+    if total == 0:
+        return 0.0
+    hit = values >= goals if at_least else values <= goals
+    return float(np.count_nonzero(hit & with_goal)) / total
+
+
+def linear_trend(days: np.ndarray, values: np.ndarray) -> tuple[float, np.ndarray]:
+    """
+    Линейный тренд ряда методом наименьших квадратов.
+
+    Входные параметры:
+        days (np.ndarray): Номера дней (ось X).
+        values (np.ndarray): Значения ряда.
+
+    Возвращаемое значение:
+        tuple[float, np.ndarray]: Наклон в единицах за день и значения
+        линии тренда в точках days.
+    """
+    if len(days) < 2:
+        return 0.0, values.astype(np.float64)
+    x = days.astype(np.float64)
+    y = values.astype(np.float64)
+    x_mean = x.mean()
+    denominator = np.sum((x - x_mean) ** 2)
+    if denominator == 0:
+        return 0.0, np.full_like(y, y.mean())
+    slope = float(np.sum((x - x_mean) * (y - y.mean())) / denominator)
+    intercept = y.mean() - slope * x_mean
+    return slope, intercept + slope * x
+
+
+def analyze_progress(series: DailyStatsSeries, rolling_window: Optional[int] = 7) -> ProgressAnalytics:
+    """
+    Вычисляет аналитику прогресса по ряду суточной статистики.
+
+    Входные параметры:
+        series (DailyStatsSeries): Ряд статистики в колоночном виде.
+        rolling_window (Optional[int]): Окно скользящего среднего в точках;
+        None отключает скользящее среднее (для агрегированных рядов).
+
+    Логика работы:
+        - Считает долю дней с выполненной целью по воде и долю дней,
+          когда потребление не превысило цель по калориям.
+        - Строит линейные тренды воды и потреблённых калорий.
+        - При заданном окне считает скользящие средние.
+
+    Возвращаемое значение:
+        ProgressAnalytics: Результаты анализа.
+    """
+    days = series.dates.astype(np.int64)
+    water_slope, water_trend = linear_trend(days, series.water_logged_ml)
+    calories_slope, calories_trend = linear_trend(days, series.calories_consumed_kcal)
+
+    analytics = ProgressAnalytics(
+        water_goal_hit_ratio=goal_hit_ratio(series.water_logged_ml, series.water_goal_ml),
+        calorie_goal_kept_ratio=goal_hit_ratio(
+            series.calories_consumed_kcal, series.calorie_goal_kcal, at_least=False
+        ),
+        water_trend_ml_per_day=water_slope,
+        calories_trend_kcal_per_day=calories_slope,
+        water_trend=water_trend,
+        calories_trend=calories_trend,
+    )
+    if rolling_window:
+        analytics.water_rolling_avg = rolling_mean(series.water_logged_ml, rolling_window)
+        analytics.calories_rolling_avg = rolling_mean(series.calories_consumed_kcal, rolling_window)
+    return analytics
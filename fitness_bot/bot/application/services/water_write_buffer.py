@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Callable, List, Optional, Tuple
+
+from domain.entities.daily_stats import DailyStats
+from domain.entities.water_log import WaterLog
+from domain.interfaces.unit_of_work import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+PendingWaterLog = Tuple[WaterLog, "asyncio.Future[Tuple[int, DailyStats]]"]
+
+
+class WaterWriteBuffer:
+    def __init__(
+        self,
+        uow_factory: Callable[[], UnitOfWork],
+        max_delay_s: float = 0.005,
+        max_batch: int = 200,
+        synchronous_commit: bool = True,
+        on_user_commit: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Инициализирует буфер групповой записи отметок воды.
+
+        Входные параметры:
+            uow_factory (Callable[[], UnitOfWork]): Фабрика единиц работы
+            основного сервера.
+            max_delay_s (float): Максимальное время ожидания записи в буфере
+            до начала сброса.
+            max_batch (int): Размер пакета, при котором сброс начинается сразу.
+            synchronous_commit (bool): Ждать ли записи WAL на диск при фиксации
+            пакета; False ускоряет фиксацию ценой потери последних пакетов
+            при сбое сервера БД.
+            on_user_commit (Optional[Callable[[int], None]]): Вызывается для
+            каждого пользователя пакета после фиксации (инвалидация кэшей,
+            маршрутизация чтений на основной сервер).
+
+        Логика работы:
+            - submit() ставит запись в очередь и ждёт результата сброса.
+            - Фоновая задача забирает накопленные записи всех пользователей
+              и сохраняет их одной транзакцией: многострочный INSERT
+              в water_logs и групповой upsert daily_stats.
+            - Каждый вызывающий получает идентификатор своей записи;
+              при ошибке пакета исключение получают все его участники.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.uow_factory = uow_factory
+        self.max_delay_s = max_delay_s
+        self.max_batch = max_batch
+        self.synchronous_commit = synchronous_commit
+        self.on_user_commit = on_user_commit
+        self._pending: List[PendingWaterLog] = []
+        self._wakeup = asyncio.Event()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.stats = {
+            "entries": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "max_batch": 0,
+            "flush_total_s": 0.0,
+            "flush_max_s": 0.0,
+        }
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, user_id: int, ml: int) -> Tuple[int, DailyStats]:
+        """
+        Добавляет отметку воды в буфер и ждёт её сохранения.
+
+        Входные параметры:
+            user_id (int): Идентификатор пользователя.
+            ml (int): Объём воды в миллилитрах.
+
+        Возвращаемое значение:
+            Tuple[int, DailyStats]: Идентификатор записи и суточная статистика
+            пользователя после сброса пакета.
+
+        Исключения:
+            RuntimeError: Если буфер закрыт или не запущен.
+        """
+        if self._closed or self._task is None:
+            raise RuntimeError("WaterWriteBuffer is not running")
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Tuple[int, DailyStats]]" = loop.create_future()
+        water_log = WaterLog(
+            id=0,
+            user_id=user_id,
+            date=date.today(),
+            logged_at=datetime.utcnow(),
+            ml=ml,
+        )
+        self._pending.append((water_log, future))
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay_s, self._wakeup.set)
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            while self._pending:
+                batch = self._pending[: self.max_batch]
+                del self._pending[: self.max_batch]
+                await self._flush(batch)
+            if self._closed:
+                return
+
+    async def _flush(self, batch: List[PendingWaterLog]) -> None:
+        started = time.perf_counter()
+        water_logs = [water_log for water_log, _ in batch]
+        try:
+            async with self.uow_factory() as uow:
+                results = await uow.water_logs.add_many_with_stats(
+                    water_logs, synchronous_commit=self.synchronous_commit
+                )
+        except Exception as error:
+            self.stats["failed_batches"] += 1
+            logger.exception("Water batch of %d entries failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        elapsed = time.perf_counter() - started
+        self.stats["batches"] += 1
+        self.stats["entries"] += len(batch)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+        self.stats["flush_total_s"] += elapsed
+        self.stats["flush_max_s"] = max(self.stats["flush_max_s"], elapsed)
+
+        if self.on_user_commit is not None:
+            for user_id in {water_log.user_id for water_log in water_logs}:
+                self.on_user_commit(user_id)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._task is None:
+            return
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    def snapshot(self) -> dict:
+        batches = self.stats["batches"]
+        return {
+            "entries": self.stats["entries"],
+            "batches": batches,
+            "failed_batches": self.stats["failed_batches"],
+            "pending": len(self._pending),
+            "max_batch": self.stats["max_batch"],
+            "avg_batch": round(self.stats["entries"] / batches, 2) if batches else 0.0,
+            "flush_avg_ms": round(self.stats["flush_total_s"] / batches * 1000, 3) if batches else 0.0,
+            "flush_max_ms": round(self.stats["flush_max_s"] * 1000, 3),
+        }
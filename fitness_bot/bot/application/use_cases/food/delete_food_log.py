@@ -1,4 +1,3 @@
-from datetime import date, datetime
 from domain.entities.food_log import FoodLog
 from domain.interfaces.unit_of_work import UnitOfWork
 from domain.exceptions import EntityNotFoundError
@@ -17,10 +16,8 @@ async def delete_food_log(log_id: int, user_id: int, uow: UnitOfWork) -> None:
         - Загружает запись о приёме пищи по идентификатору.
         - Проверяет, что запись существует и принадлежит указанному пользователю.
         - Удаляет запись о приёме пищи.
-        - Гарантирует существование суточной статистики за дату записи.
-        - Уменьшает значение потреблённых калорий в суточной статистике
-          на калорийность удалённой записи.
-        - Обновляет время последнего изменения суточной статистики.
+        - Атомарно уменьшает значение потреблённых калорий в суточной
+          статистике за дату записи на калорийность удалённой записи.
 
     Возвращаемое значение:
         None.
@@ -42,7 +39,4 @@ async def delete_food_log(log_id: int, user_id: int, uow: UnitOfWork) -> None:
     await uow.food_logs.delete(log_id)
 
                          
-    daily_stats = await uow.daily_stats.get_or_create(log_user_id, log_date)
-    daily_stats.calories_consumed_kcal -= int(kcal_total)
-    daily_stats.updated_at = datetime.utcnow()
-    await uow.daily_stats.update(daily_stats)
\ No newline at end of file
+    await uow.daily_stats.increment(log_user_id, log_date, kcal_consumed=-int(kcal_total))
\ No newline at end of file
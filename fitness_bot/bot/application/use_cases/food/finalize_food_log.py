@@ -30,11 +30,8 @@ async def finalize_food_log(
 
         Логика работы:
             - Формирует доменную сущность записи о приёме пищи с текущей датой и временем.
-            - Сохраняет запись в хранилище.
-            - Гарантирует существование суточной статистики пользователя за текущую дату.
-            - Увеличивает значение потреблённых калорий в суточной статистике
-              на калорийность добавленной записи.
-            - Обновляет время последнего изменения суточной статистики.
+            - Одним запросом сохраняет запись и атомарно увеличивает значение
+              потреблённых калорий в суточной статистике за текущую дату.
 
         Возвращаемое значение:
             int: Идентификатор созданной записи о приёме пищи.
@@ -52,12 +49,5 @@ async def finalize_food_log(
         grams=grams,
         kcal_total=kcal_total,
     )
-    await uow.food_logs.add(food_log)
-
-                         
-    today = date.today()
-    daily_stats = await uow.daily_stats.get_or_create(user_id, today)
-    daily_stats.calories_consumed_kcal += int(kcal_total)
-    daily_stats.updated_at = datetime.utcnow()
-    await uow.daily_stats.update(daily_stats)
-    return food_log.id
\ No newline at end of file
+    log_id, _ = await uow.food_logs.add_with_stats(food_log)
+    return log_id
\ No newline at end of file
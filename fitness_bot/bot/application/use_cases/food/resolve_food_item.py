@@ -1,51 +1,62 @@
 from typing import Optional, Tuple
 
+from application.services.food_lookup_cache import FoodLookupCache, normalize_food_query
 from infrastructure.api.food_client import FoodClient
-from config.settings import settings
 
 
-async def resolve_food_item(query: str) -> Optional[Tuple[str, float]]:
+async def resolve_food_item(
+    query: str, food_client: FoodClient, food_cache: FoodLookupCache
+) -> Optional[Tuple[str, float]]:
     """
     Определяет продукт по текстовому запросу и возвращает его название
     и калорийность на 100 грамм.
 
     Входные параметры:
         query (str): Текстовый запрос пользователя для поиска продукта.
+        food_client (FoodClient): Клиент внешнего API продуктов
+        с общей HTTP-сессией приложения.
+        food_cache (FoodLookupCache): Кэш результатов поиска продуктов.
 
     Логика работы:
-        - Инициализирует клиент для работы с внешним API продуктов.
+        - Нормализует запрос и ищет результат в кэше.
+        - При попадании в кэш возвращает сохранённый результат без обращения
+          к внешнему API, в том числе отрицательный.
         - Выполняет поиск продуктов по заданному запросу с ограничением на один результат.
         - Проверяет, что продукт найден.
         - Получает калорийность найденного продукта на 100 грамм.
         - Проверяет корректность значения калорийности.
-        - Гарантирует закрытие клиента независимо от результата выполнения.
+        - Сохраняет результат (или его отсутствие) в кэш. Отсутствие
+          кэшируется, только если сервис ответил, что продукта нет;
+          ошибки сервиса не кэшируются.
 
     Возвращаемое значение:
         Optional[Tuple[str, float]]:
             Кортеж из названия продукта и калорийности на 100 грамм,
             если данные успешно получены.
             None, если продукт не найден или данные некорректны.
+
+    Исключения:
+        FoodApiError: Если сервис продуктов недоступен или вернул ошибку.
     """
-    food_client = FoodClient(
-        consumer_key=settings.FATSECRET_CONSUMER_KEY or "",
-        consumer_secret=settings.FATSECRET_CONSUMER_SECRET or "",
-    )
-
-    try:
-        items = await food_client.foods_search(query, max_results=1)
-        print(items)
-        if not items:
+    key = normalize_food_query(query)
+    cached = await food_cache.get(key)
+    if cached is not None:
+        if cached.is_negative:
             return None
+        return cached.name, cached.kcal_per_100g
 
-        food_id = items[0].food_id
-        name = items[0].name
+    items = await food_client.foods_search(query, max_results=1)
+    if not items:
+        await food_cache.put(key, None)
+        return None
 
-        kcal_per_100g = await food_client.get_food_kcal_per_100g(food_id)
-        print(kcal_per_100g)
-        if not kcal_per_100g or kcal_per_100g <= 0:
-            return None
-        print(name, kcal_per_100g)
-        return name, kcal_per_100g
+    food_id = items[0].food_id
+    name = items[0].name
+
+    kcal_per_100g = await food_client.get_food_kcal_per_100g(food_id)
+    if not kcal_per_100g or kcal_per_100g <= 0:
+        await food_cache.put(key, None)
+        return None
 
-    finally:
-        await food_client.close()
\ No newline at end of file
+    await food_cache.put(key, (food_id, name, kcal_per_100g))
+    return name, kcal_per_100g
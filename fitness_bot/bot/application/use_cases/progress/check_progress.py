@@ -1,6 +1,7 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Dict
 
+from domain.entities.daily_stats import DailyStats
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
@@ -15,8 +16,9 @@ async def check_progress(user_id: int, uow: UnitOfWork) -> Dict[str, int]:
 
     Логика работы:
         - Определяет текущую дату.
-        - Загружает суточную статистику пользователя за текущую дату
-          или создаёт её при отсутствии.
+        - Загружает суточную статистику пользователя за текущую дату.
+        - Если статистики ещё нет, вычисляет цели по профилю пользователя
+          без записи в базу данных.
         - Формирует словарь с ключевыми показателями воды и калорий.
 
     Возвращаемое значение:
@@ -27,7 +29,19 @@ async def check_progress(user_id: int, uow: UnitOfWork) -> Dict[str, int]:
             а также калорийный баланс.
     """
     today = date.today()
-    daily_stats = await uow.daily_stats.get_or_create(user_id, today)
+    daily_stats = await uow.daily_stats.get(user_id, today)
+    if daily_stats is None:
+        user = await uow.users.get(user_id)
+        now = datetime.utcnow()
+        daily_stats = DailyStats(
+            id=0,
+            user_id=user_id,
+            date=today,
+            created_at=now,
+            updated_at=now,
+            water_goal_ml=user.calculate_water_goal_ml() if user else 0,
+            calorie_goal_kcal=user.calculate_calorie_goal_kcal() if user else 0,
+        )
 
     return {
         "water_logged_ml": daily_stats.water_logged_ml,
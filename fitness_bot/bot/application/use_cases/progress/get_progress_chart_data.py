@@ -1,13 +1,91 @@
 from datetime import date, timedelta
-from typing import List
+from typing import Optional
 
+import numpy as np
+
+from application.services.downsampling import lttb_indices
 from domain.interfaces.unit_of_work import UnitOfWork
-from domain.entities.daily_stats import DailyStats
+from domain.entities.daily_stats_series import DailyStatsSeries
+
+DEFAULT_MAX_CHART_POINTS = 120
+
+
+def chart_resolution_for_period(period_days: int) -> str:
+    """
+    Выбирает самое грубое разрешение графика, при котором период
+    ещё читается без потери формы.
+
+    Входные параметры:
+        period_days (int): Длина периода в днях.
+
+    Логика работы:
+        - До года ряд строится по дням: пики отдельных дней важнее
+          средних, а лишние точки прореживаются LTTB.
+        - До пяти лет — по неделям, дальше — по месяцам; недельный ряд
+          за несколько лет тоже прореживается до бюджета точек.
+
+    Возвращаемое значение:
+        str: "day" до 365 дней, "week" до 1825 дней, иначе "month".
+    """
+    if period_days <= 365:
+        return "day"
+    if period_days <= 1825:
+        return "week"
+    return "month"
+
+
+def rolling_window_for_period(
+    period_days: int, max_points: int = DEFAULT_MAX_CHART_POINTS
+) -> Optional[int]:
+    """
+    Возвращает окно скользящего среднего для графика периода.
+
+    Входные параметры:
+        period_days (int): Длина периода в днях.
+        max_points (int): Бюджет точек графика.
+
+    Возвращаемое значение:
+        Optional[int]: 7 для подневного ряда без прореживания, иначе None:
+        после LTTB и агрегации точки не соответствуют отдельным дням.
+    """
+    if chart_resolution_for_period(period_days) == "day" and period_days <= max_points:
+        return 7
+    return None
+
+
+def downsample_series(series: DailyStatsSeries, max_points: int) -> DailyStatsSeries:
+    """
+    Сокращает ряд статистики до max_points точек алгоритмом LTTB.
+
+    Входные параметры:
+        series (DailyStatsSeries): Ряд, отсортированный по дате.
+        max_points (int): Бюджет точек.
+
+    Логика работы:
+        - Отбирает точки отдельно по воде и по потреблённым калориям,
+          каждому ряду отдаётся половина бюджета.
+        - Объединяет выбранные индексы, чтобы сохранить пики обоих графиков.
+
+    Возвращаемое значение:
+        DailyStatsSeries: Подмножество исходного ряда в порядке дат.
+    """
+    if len(series) <= max_points:
+        return series
+
+    xs = series.dates.astype(np.int64)
+    budget = max(3, max_points // 2)
+    water_indices = lttb_indices(xs, series.water_logged_ml, budget)
+    kcal_indices = lttb_indices(xs, series.calories_consumed_kcal, budget)
+    indices = np.union1d(water_indices, kcal_indices)
+    return series.take(indices)
 
 
 async def get_progress_chart_data(
-    user_id: int, period_days: int, uow: UnitOfWork
-) -> List[DailyStats]:
+    user_id: int,
+    period_days: int,
+    uow: UnitOfWork,
+    max_points: int = DEFAULT_MAX_CHART_POINTS,
+) -> DailyStatsSeries:
     """
     Возвращает данные суточной статистики пользователя за указанный период
     для построения графиков прогресса.
@@ -17,19 +95,23 @@ async def get_progress_chart_data(
         period_days (int): Количество дней, за которые требуется получить данные.
         uow (UnitOfWork): Единица работы, предоставляющая доступ
         к репозиторию суточной статистики.
+        max_points (int): Максимальное число точек на графике.
 
     Логика работы:
         - Проверяет, что период задан положительным числом.
         - Определяет диапазон дат от начальной до текущей даты.
         - Ограничивает диапазон дат максимальной глубиной в 10 лет.
-        - Загружает суточную статистику пользователя за указанный период.
-        - Сортирует записи по дате в порядке возрастания.
+        - Выбирает разрешение по длине периода: дни, недели или месяцы.
+        - Загружает суточную статистику за период в колоночном виде;
+          недельные и месячные интервалы агрегируются в базе данных.
+        - Если точек больше max_points, прореживает ряд алгоритмом LTTB.
 
     Возвращаемое значение:
-        List[DailyStats]:
-            Список объектов суточной статистики пользователя
-            за указанный период, отсортированный по дате.
-            Может быть пустым, если данные отсутствуют.
+        DailyStatsSeries:
+            Ряд суточной статистики пользователя за указанный период,
+            отсортированный по дате. Может быть пустым, если данные отсутствуют.
+            Для недельного и месячного разрешения значения — средние
+            за день в интервале, а даты — начала интервалов.
 
     Исключения:
         ValueError: Если period_days меньше либо равен нулю.
@@ -45,9 +127,8 @@ async def get_progress_chart_data(
     if date_from < today - timedelta(days=365 * 10):
         date_from = today
 
-    daily_stats = await uow.daily_stats.get_for_user_in_range(
-        user_id, date_from, date_to
+    resolution = chart_resolution_for_period(period_days)
+    series = await uow.daily_stats.get_series_for_user_in_range(
+        user_id, date_from, date_to, resolution
     )
-                                               
-    daily_stats.sort(key=lambda s: s.date)
-    return daily_stats
\ No newline at end of file
+    return downsample_series(series, max_points)
@@ -1,11 +1,11 @@
 from datetime import date, datetime
 import math
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 from infrastructure.api.weather_client import WeatherClient
-from config.settings import settings
 
 
-async def finalize_profile(user_id: int, uow: UnitOfWork) -> None:
+async def finalize_profile(user_id: int, uow: UnitOfWork, weather_client: WeatherClient) -> None:
     """
     Завершает настройку профиля пользователя и рассчитывает суточные цели
     по воде и калориям с учётом параметров профиля и погодных условий.
@@ -14,6 +14,8 @@ async def finalize_profile(user_id: int, uow: UnitOfWork) -> None:
         user_id (int): Идентификатор пользователя.
         uow (UnitOfWork): Единица работы, предоставляющая доступ
         к репозиториям пользователей и суточной статистики.
+        weather_client (WeatherClient): Клиент погодного сервиса
+        с общей HTTP-сессией приложения.
 
     Логика работы:
         - Загружает пользователя по идентификатору и проверяет его существование.
@@ -29,19 +31,22 @@ async def finalize_profile(user_id: int, uow: UnitOfWork) -> None:
               либо использует ручное значение при отключённом автоматическом режиме.
         - Загружает или создаёт суточную статистику за текущую дату.
         - Сохраняет рассчитанные цели и температуру в суточной статистике
-          и обновляет время последнего изменения.
+          и обновляет время последнего изменения; при конфликте версий
+          статистика перечитывается и запись повторяется без повторного
+          запроса погоды.
 
     Возвращаемое значение:
         None.
 
     Исключения:
         ValueError: Если пользователь с указанным идентификатором не найден.
+        ConcurrencyConflictError: Если суточную статистику не удалось
+        сохранить после всех повторов.
     """
     user = await uow.users.get(user_id)
     if user is None:
         raise ValueError(f"User {user_id} not found")
 
-    weather_client = WeatherClient(settings.WEATHER_API_KEY)
     temperature = await weather_client.get_temperature(user.city)
 
     water_goal_ml = user.calculate_water_goal_ml(temperature)
@@ -49,10 +54,14 @@ async def finalize_profile(user_id: int, uow: UnitOfWork) -> None:
 
                                                 
     today = date.today()
-    daily_stats = await uow.daily_stats.get_or_create(user_id, today)
-    daily_stats.temperature_c = temperature
-    daily_stats.water_goal_ml = water_goal_ml
-    daily_stats.calorie_goal_kcal = calorie_goal_kcal
-    daily_stats.updated_at = datetime.utcnow()
 
-    await uow.daily_stats.update(daily_stats)
\ No newline at end of file
+    @retry_on_conflict()
+    async def store_goals() -> None:
+        daily_stats = await uow.daily_stats.get_or_create(user_id, today)
+        daily_stats.temperature_c = temperature
+        daily_stats.water_goal_ml = water_goal_ml
+        daily_stats.calorie_goal_kcal = calorie_goal_kcal
+        daily_stats.updated_at = datetime.utcnow()
+        await uow.daily_stats.update(daily_stats)
+
+    await store_goals()
\ No newline at end of file
@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_activity_minutes(user_id: int, activity_minutes_per_day: int, uow: UnitOfWork) -> None:
     """
     Устанавливает количество минут физической активности пользователя в день
@@ -27,6 +29,8 @@ async def set_activity_minutes(user_id: int, activity_minutes_per_day: int, uow:
 
     Исключения:
         ValueError: Если пользователь с указанным идентификатором не найден.
+        ConcurrencyConflictError: Если профиль изменялся параллельно
+        и сохранить его не удалось после всех повторов.
     """
     user = await uow.users.get(user_id)
     if user is None:
@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_age(user_id: int, age_years: int, uow: UnitOfWork) -> None:
     """
     Устанавливает возраст пользователя и обновляет метку последнего изменения.
@@ -25,6 +27,8 @@ async def set_age(user_id: int, age_years: int, uow: UnitOfWork) -> None:
 
     Исключения:
         ValueError: Если пользователь с указанным идентификатором не найден.
+        ConcurrencyConflictError: Если профиль изменялся параллельно
+        и сохранить его не удалось после всех повторов.
     """
     user = await uow.users.get(user_id)
     if user is None:
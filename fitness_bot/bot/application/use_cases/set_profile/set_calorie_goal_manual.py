@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_calorie_goal_manual(user_id: int, calorie_goal_kcal: int, uow: UnitOfWork) -> None:
     """
     Устанавливает ручную суточную цель по калориям для пользователя
@@ -27,6 +29,8 @@ async def set_calorie_goal_manual(user_id: int, calorie_goal_kcal: int, uow: Uni
 
     Исключения:
         ValueError: Если пользователь с указанным идентификатором не найден.
+        ConcurrencyConflictError: Если профиль изменялся параллельно
+        и сохранить его не удалось после всех повторов.
     """
     user = await uow.users.get(user_id)
     if user is None:
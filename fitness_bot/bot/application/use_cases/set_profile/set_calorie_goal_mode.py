@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_calorie_goal_mode(user_id: int, mode: str, uow: UnitOfWork) -> None:
     """
     Устанавливает режим расчёта суточной цели по калориям для пользователя
@@ -29,6 +31,8 @@ async def set_calorie_goal_mode(user_id: int, mode: str, uow: UnitOfWork) -> Non
     Исключения:
         ValueError: Если режим расчёта задан некорректно
         или пользователь с указанным идентификатором не найден.
+        ConcurrencyConflictError: Если профиль изменялся параллельно
+        и сохранить его не удалось после всех повторов.
     """
     if mode not in ("auto", "manual"):
         raise ValueError("Mode must be 'auto' or 'manual'")
@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_city(user_id: int, city: str, uow: UnitOfWork) -> None:
     """
     Устанавливает город проживания пользователя и обновляет метку
@@ -26,6 +28,8 @@ async def set_city(user_id: int, city: str, uow: UnitOfWork) -> None:
 
     Исключения:
         ValueError: Если пользователь с указанным идентификатором не найден.
+        ConcurrencyConflictError: Если профиль изменялся параллельно
+        и сохранить его не удалось после всех повторов.
     """
     user = await uow.users.get(user_id)
     if user is None:
@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_height(user_id: int, height_cm: float, uow: UnitOfWork) -> None:
     
     user = await uow.users.get(user_id)
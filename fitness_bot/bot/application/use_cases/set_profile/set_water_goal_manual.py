@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_water_goal_manual(user_id: int, water_goal_ml: int, uow: UnitOfWork) -> None:
     
     user = await uow.users.get(user_id)
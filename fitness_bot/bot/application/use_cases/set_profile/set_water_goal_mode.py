@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_water_goal_mode(user_id: int, mode: str, uow: UnitOfWork) -> None:
     
     if mode not in ("auto", "manual"):
@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from application.services.concurrency import retry_on_conflict
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
+@retry_on_conflict()
 async def set_weight(user_id: int, weight_kg: float, uow: UnitOfWork) -> None:
     
     user = await uow.users.get(user_id)
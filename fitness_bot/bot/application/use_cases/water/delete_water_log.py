@@ -1,5 +1,3 @@
-from datetime import date, datetime
-
 from domain.entities.water_log import WaterLog
 from domain.interfaces.unit_of_work import UnitOfWork
 from domain.exceptions import EntityNotFoundError
@@ -19,10 +17,8 @@ async def delete_water_log(log_id: int, user_id: int, uow: UnitOfWork) -> None:
         - Загружает запись о потреблении воды по идентификатору.
         - Проверяет, что запись существует и принадлежит указанному пользователю.
         - Удаляет запись о потреблении воды.
-        - Загружает суточную статистику за дату записи.
-        - Уменьшает объём зафиксированной воды в суточной статистике
-          на значение удалённой записи.
-        - Обновляет время последнего изменения суточной статистики.
+        - Атомарно уменьшает объём зафиксированной воды в суточной
+          статистике за дату записи на значение удалённой записи.
 
     Возвращаемое значение:
         None.
@@ -43,7 +39,4 @@ async def delete_water_log(log_id: int, user_id: int, uow: UnitOfWork) -> None:
                     
     await uow.water_logs.delete(log_id)
 
-    daily_stats = await uow.daily_stats.get_or_create(log_user_id, log_date)
-    daily_stats.water_logged_ml -= ml
-    daily_stats.updated_at = datetime.utcnow()
-    await uow.daily_stats.update(daily_stats)
\ No newline at end of file
+    await uow.daily_stats.increment(log_user_id, log_date, water_ml=-ml)
\ No newline at end of file
@@ -1,10 +1,12 @@
 from datetime import date, datetime
+from typing import Tuple
 
+from domain.entities.daily_stats import DailyStats
 from domain.entities.water_log import WaterLog
 from domain.interfaces.unit_of_work import UnitOfWork
 
 
-async def log_water(user_id: int, ml: int, uow: UnitOfWork) -> int:
+async def log_water(user_id: int, ml: int, uow: UnitOfWork) -> Tuple[int, DailyStats]:
     """
     Создаёт запись о потреблении воды и обновляет суточную статистику пользователя.
 
@@ -17,15 +19,12 @@ async def log_water(user_id: int, ml: int, uow: UnitOfWork) -> int:
     Логика работы:
         - Формирует сущность записи о потреблении воды с текущей датой
           и временем фиксации.
-        - Сохраняет запись о воде в хранилище.
-        - Загружает суточную статистику пользователя за текущую дату.
-        - Увеличивает показатель потреблённой воды
-          на объём добавленной записи.
-        - Обновляет время последнего изменения суточной статистики.
-        - Сохраняет изменения в хранилище.
+        - Одним запросом сохраняет запись о воде и атомарно увеличивает
+          показатель потреблённой воды в суточной статистике за текущую дату.
 
     Возвращаемое значение:
-        int: Идентификатор созданной записи о потреблении воды.
+        Tuple[int, DailyStats]: Идентификатор созданной записи о потреблении
+        воды и суточная статистика после её учёта.
     """
                          
     water_log = WaterLog(
@@ -35,12 +34,4 @@ async def log_water(user_id: int, ml: int, uow: UnitOfWork) -> int:
         logged_at=datetime.utcnow(),
         ml=ml,
     )
-    await uow.water_logs.add(water_log)
-
-
-    today = date.today()
-    daily_stats = await uow.daily_stats.get_or_create(user_id, today)
-    daily_stats.water_logged_ml += ml
-    daily_stats.updated_at = datetime.utcnow()
-    await uow.daily_stats.update(daily_stats)
-    return water_log.id
\ No newline at end of file
+    return await uow.water_logs.add_with_stats(water_log)
\ No newline at end of file
@@ -1,5 +1,3 @@
-from datetime import date, datetime
-
 from domain.entities.workout_log import WorkoutLog
 from domain.interfaces.unit_of_work import UnitOfWork
 from domain.exceptions import EntityNotFoundError
@@ -22,8 +20,9 @@ async def delete_workout_log(log_id: int, user_id: int, uow: UnitOfWork) -> None
     await uow.workout_logs.delete(log_id)
 
                          
-    daily_stats = await uow.daily_stats.get_or_create(log_user_id, log_date)
-    daily_stats.calories_burned_kcal -= int(kcal_burned)
-    daily_stats.water_goal_ml -= water_bonus_ml
-    daily_stats.updated_at = datetime.utcnow()
-    await uow.daily_stats.update(daily_stats)
\ No newline at end of file
+    await uow.daily_stats.increment(
+        log_user_id,
+        log_date,
+        kcal_burned=-int(kcal_burned),
+        water_goal_bonus=-water_bonus_ml,
+    )
\ No newline at end of file
@@ -23,13 +23,5 @@ async def finalize_workout_log(
         kcal_burned=kcal_burned,
         water_bonus_ml=water_bonus_ml,
     )
-    await uow.workout_logs.add(workout_log)
-
-                         
-    today = date.today()
-    daily_stats = await uow.daily_stats.get_or_create(user_id, today)
-    daily_stats.calories_burned_kcal += int(kcal_burned)
-    daily_stats.water_goal_ml += water_bonus_ml
-    daily_stats.updated_at = datetime.utcnow()
-    await uow.daily_stats.update(daily_stats)
-    return workout_log.id
\ No newline at end of file
+    log_id, _ = await uow.workout_logs.add_with_stats(workout_log)
+    return log_id
\ No newline at end of file
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+
+from config.settings import settings
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork, UnitOfWork
+from infrastructure.api.http_registry import HttpClientRegistry
+from infrastructure.charts.render_service import ChartRenderService
+from application.services.food_lookup_cache import FoodLookupCache
+from application.services.daily_rollover import DailyRolloverScheduler
+from application.services.water_write_buffer import WaterWriteBuffer
+from infrastructure.config.database import AsyncSessionFactory, ReadSessionFactory, dispose_engines
+from infrastructure.fsm.factory import build_fsm_storage
+from infrastructure.fsm.postgres_storage import PostgresStorage
+from infrastructure.metrics import metrics
+from infrastructure.telegram.outbound_scheduler import OutboundScheduler
+from presentation.routers import setup_routers
+from presentation.callbacks import callbacks
+from presentation.keyboards.registry import keyboard_registry
+from presentation.middlewares.fsm_snapshot import FSMSnapshotMiddleware
+from presentation.middlewares.unit_of_work import UnitOfWorkMiddleware
+from presentation.middlewares.user_serializer import UserSerializerMiddleware
+from presentation.services.chart_cache import ChartCache
+from presentation.webhook import run_webhook
+
+from aiogram import Bot, Dispatcher
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    http_clients = HttpClientRegistry()
+    await http_clients.start()
+
+    chart_renderer = ChartRenderService(
+        workers=settings.CHART_RENDER_WORKERS,
+        max_queue=settings.CHART_RENDER_MAX_QUEUE,
+        job_timeout_s=settings.CHART_RENDER_TIMEOUT_S,
+    )
+    await chart_renderer.start()
+
+    chart_cache = ChartCache(max_entries=settings.CHART_CACHE_MAX_ENTRIES)
+    SqlAlchemyUnitOfWork.add_commit_listener(chart_cache.invalidate_user)
+    metrics.register("chart_cache", chart_cache.snapshot)
+
+    food_cache = FoodLookupCache(
+        uow_factory=lambda: SqlAlchemyUnitOfWork(AsyncSessionFactory),
+        ttl_s=settings.FOOD_CACHE_TTL_S,
+        negative_ttl_s=settings.FOOD_CACHE_NEGATIVE_TTL_S,
+        memory_size=settings.FOOD_CACHE_MEMORY_SIZE,
+    )
+    metrics.register("food_cache", food_cache.snapshot)
+
+    water_buffer = None
+    if settings.WATER_BUFFER_ENABLED:
+        water_buffer = WaterWriteBuffer(
+            uow_factory=lambda: SqlAlchemyUnitOfWork(AsyncSessionFactory),
+            max_delay_s=settings.WATER_BUFFER_MAX_DELAY_S,
+            max_batch=settings.WATER_BUFFER_MAX_BATCH,
+            synchronous_commit=settings.WATER_BUFFER_SYNCHRONOUS_COMMIT,
+            on_user_commit=SqlAlchemyUnitOfWork.notify_commit,
+        )
+        await water_buffer.start()
+        metrics.register("water_buffer", water_buffer.snapshot)
+
+    bot = Bot(token=settings.TELEGRAM_BOT_TOKEN)
+    outbound = OutboundScheduler(
+        global_rate=settings.TELEGRAM_GLOBAL_RATE,
+        chat_rate=settings.TELEGRAM_CHAT_RATE,
+        chat_burst=settings.TELEGRAM_CHAT_BURST,
+        max_retries=settings.TELEGRAM_MAX_RETRIES,
+    )
+    bot.session.middleware(outbound)
+    metrics.register("telegram_outbound", outbound.snapshot)
+    fsm_storage = build_fsm_storage()
+    dp = Dispatcher(
+        storage=fsm_storage,
+        food_client=http_clients.food_client,
+        weather_client=http_clients.weather_client,
+        food_cache=food_cache,
+        chart_renderer=chart_renderer,
+        chart_cache=chart_cache,
+        water_buffer=water_buffer,
+    )
+
+    user_serializer = UserSerializerMiddleware(max_depth=settings.USER_QUEUE_MAX_DEPTH)
+    dp.update.outer_middleware(user_serializer)
+    metrics.register("user_serializer", user_serializer.snapshot)
+    fsm_snapshot = FSMSnapshotMiddleware()
+    dp.update.outer_middleware(fsm_snapshot)
+    metrics.register("fsm_snapshot", fsm_snapshot.snapshot)
+    unit_of_work = UnitOfWorkMiddleware(AsyncSessionFactory, ReadSessionFactory)
+    dp.message.middleware(unit_of_work)
+    dp.callback_query.middleware(unit_of_work)
+    metrics.register("db_sessions", unit_of_work.snapshot)
+    metrics.register("keyboards", keyboard_registry.snapshot)
+    metrics.register("callbacks", callbacks.snapshot)
+
+    dp.include_router(setup_routers())
+
+    metrics_task = None
+    if settings.METRICS_LOG_INTERVAL_S > 0:
+        metrics_task = asyncio.create_task(metrics.log_periodically(settings.METRICS_LOG_INTERVAL_S))
+
+    rollover_task = None
+    if settings.ROLLOVER_ENABLED:
+        rollover = DailyRolloverScheduler(
+            uow_factory=lambda: SqlAlchemyUnitOfWork(AsyncSessionFactory),
+            weather_client=http_clients.weather_client,
+            active_days=settings.ROLLOVER_ACTIVE_DAYS,
+            check_interval_s=settings.ROLLOVER_CHECK_INTERVAL_S,
+            weather_concurrency=settings.ROLLOVER_WEATHER_CONCURRENCY,
+        )
+        metrics.register("daily_rollover", rollover.snapshot)
+        rollover_task = asyncio.create_task(rollover.run_periodically())
+
+    purge_task = None
+    if isinstance(fsm_storage, PostgresStorage):
+        purge_task = asyncio.create_task(fsm_storage.purge_periodically(settings.FSM_PURGE_INTERVAL_S))
+
+    try:
+        if settings.BOT_RUN_MODE == "webhook":
+            await run_webhook(
+                dp,
+                bot,
+                host=settings.WEBHOOK_HOST,
+                port=settings.WEBHOOK_PORT,
+                path=settings.WEBHOOK_PATH,
+                workers=settings.WEBHOOK_WORKERS,
+                queue_size=settings.WEBHOOK_QUEUE_SIZE,
+                secret_token=settings.WEBHOOK_SECRET_TOKEN or None,
+                public_url=(
+                    settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH
+                    if settings.WEBHOOK_URL
+                    else None
+                ),
+            )
+        else:
+            await dp.start_polling(bot)
+    finally:
+        if metrics_task is not None:
+            metrics_task.cancel()
+        if purge_task is not None:
+            purge_task.cancel()
+        if rollover_task is not None:
+            rollover_task.cancel()
+        if water_buffer is not None:
+            await water_buffer.close()
+        await http_clients.close()
+        await chart_renderer.close()
+        await dispose_engines()
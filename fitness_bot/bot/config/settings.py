@@ -1,5 +1,8 @@
 from pathlib import Path
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Annotated, Literal
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 #просто подсос енвшника
 BASE_DIR = Path(__file__).resolve().parents[2]
 
@@ -11,6 +14,7 @@ class Settings(BaseSettings):
     )
 
     POSTGRES_DSN: str
+    POSTGRES_REPLICA_DSNS: Annotated[list[str], NoDecode] = []
     TELEGRAM_BOT_TOKEN: str
     WEATHER_API_KEY: str | None = None
     FOOD_API_KEY: str | None = None
@@ -18,4 +22,75 @@ class Settings(BaseSettings):
     FATSECRET_CONSUMER_SECRET: str | None = None
     AI_API_KEY: str | None = None
 
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_READ_POOL_SIZE: int = 5
+    DB_READ_MAX_OVERFLOW: int = 5
+    REPLICA_STALENESS_WINDOW_S: float = 5.0
+    REPLICA_FAILURE_COOLDOWN_S: float = 30.0
+    DB_POOL_TIMEOUT_S: float = 30.0
+    DB_POOL_RECYCLE_S: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_STATEMENT_TIMEOUT_MS: int = 5000
+
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 20
+    HTTP_KEEPALIVE_TIMEOUT_S: float = 30.0
+    HTTP_DNS_CACHE_TTL_S: int = 300
+    HTTP_CONNECT_TIMEOUT_S: float = 5.0
+    HTTP_FOOD_TIMEOUT_S: float = 15.0
+    HTTP_WEATHER_TIMEOUT_S: float = 10.0
+
+    FOOD_CACHE_TTL_S: float = 30 * 24 * 3600
+    FOOD_CACHE_NEGATIVE_TTL_S: float = 6 * 3600
+    FOOD_CACHE_MEMORY_SIZE: int = 2048
+
+    CHART_RENDER_WORKERS: int = 2
+    CHART_RENDER_MAX_QUEUE: int = 8
+    CHART_RENDER_TIMEOUT_S: float = 15.0
+    CHART_CACHE_MAX_ENTRIES: int = 2000
+
+    BOT_RUN_MODE: Literal["polling", "webhook"] = "polling"
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_PATH: str = "/telegram/webhook"
+    WEBHOOK_URL: str | None = None
+    WEBHOOK_SECRET_TOKEN: str | None = None
+    WEBHOOK_WORKERS: int = 16
+    WEBHOOK_QUEUE_SIZE: int = 1000
+
+    FSM_STORAGE: Literal["memory", "postgres", "redis"] = "memory"
+    FSM_TTL_S: float = 7 * 24 * 3600
+    FSM_MEMORY_MAX_KEYS: int = 10000
+    FSM_PURGE_INTERVAL_S: float = 3600.0
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    TELEGRAM_GLOBAL_RATE: float = 30.0
+    TELEGRAM_CHAT_RATE: float = 1.0
+    TELEGRAM_CHAT_BURST: float = 3.0
+    TELEGRAM_MAX_RETRIES: int = 3
+
+    USER_QUEUE_MAX_DEPTH: int = 5
+
+    WATER_BUFFER_ENABLED: bool = False
+    WATER_BUFFER_MAX_DELAY_S: float = 0.005
+    WATER_BUFFER_MAX_BATCH: int = 200
+    WATER_BUFFER_SYNCHRONOUS_COMMIT: bool = True
+
+    ROLLOVER_ENABLED: bool = True
+    ROLLOVER_ACTIVE_DAYS: int = 14
+    ROLLOVER_CHECK_INTERVAL_S: float = 300.0
+    ROLLOVER_WEATHER_CONCURRENCY: int = 8
+
+    METRICS_LOG_INTERVAL_S: float = 0.0
+
+    @field_validator("POSTGRES_REPLICA_DSNS", mode="before")
+    @classmethod
+    def split_replica_dsns(cls, value):
+        if isinstance(value, str):
+            return [dsn.strip() for dsn in value.split(",") if dsn.strip()]
+        return value
+
 settings = Settings()
\ No newline at end of file
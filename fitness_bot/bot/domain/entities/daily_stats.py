@@ -17,6 +17,7 @@ class DailyStats:
     water_logged_ml: int = 0
     calories_consumed_kcal: int = 0
     calories_burned_kcal: int = 0
+    version: int = 1
 
     @property
     def water_remaining_ml(self) -> int:
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+
+@dataclass
+class DailyStatsSeries:
+    dates: np.ndarray
+    water_logged_ml: np.ndarray
+    water_goal_ml: np.ndarray
+    calories_consumed_kcal: np.ndarray
+    calories_burned_kcal: np.ndarray
+    calorie_goal_kcal: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "DailyStatsSeries":
+        counters = {
+            f.name: np.empty(0, dtype=np.int32) for f in fields(cls) if f.name != "dates"
+        }
+        return cls(dates=np.empty(0, dtype="datetime64[D]"), **counters)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def take(self, indices: np.ndarray) -> "DailyStatsSeries":
+        return DailyStatsSeries(
+            **{f.name: getattr(self, f.name)[indices] for f in fields(self)}
+        )
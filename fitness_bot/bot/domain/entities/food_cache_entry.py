@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class FoodCacheEntry:
+    query: str
+    fetched_at: datetime
+    expires_at: datetime
+    food_id: Optional[str] = None
+    name: Optional[str] = None
+    kcal_per_100g: Optional[float] = None
+
+    @property
+    def is_negative(self) -> bool:
+        return self.name is None or self.kcal_per_100g is None
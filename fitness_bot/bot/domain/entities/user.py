@@ -19,6 +19,7 @@ class User:
     calorie_goal_kcal_manual: Optional[int] = None
     water_goal_mode: str = "auto"
     water_goal_ml_manual: Optional[int] = None
+    version: int = 1
 
     def calculate_base_water_goal_ml(self) -> int:
         return int(self.weight_kg * 30)
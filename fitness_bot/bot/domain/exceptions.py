@@ -12,4 +12,7 @@ class EntityNotFoundError(DomainError):
     pass
 
 class BusinessRuleViolationError(DomainError):
+    pass
+
+class ConcurrencyConflictError(DomainError):
     pass
\ No newline at end of file
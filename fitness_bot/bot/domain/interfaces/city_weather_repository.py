@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class CityWeatherRepository(ABC):
+    @abstractmethod
+    async def upsert_many(self, temperatures: Dict[str, Optional[float]], fetched_at: datetime) -> None:
+        pass
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from datetime import date
+from datetime import date, datetime
 from typing import Optional, List
 
 from domain.entities.daily_stats import DailyStats
+from domain.entities.daily_stats_series import DailyStatsSeries
 
 
 class DailyStatsRepository(ABC):
@@ -26,6 +27,30 @@ class DailyStatsRepository(ABC):
     async def get_or_create(self, user_id: int, date: date) -> DailyStats:
         pass
 
+    @abstractmethod
+    async def increment(
+        self,
+        user_id: int,
+        date: date,
+        water_ml: int = 0,
+        kcal_consumed: int = 0,
+        kcal_burned: int = 0,
+        water_goal_bonus: int = 0,
+    ) -> DailyStats:
+        pass
+
+    @abstractmethod
+    async def precreate_for_timezone(
+        self, timezone: str, stats_date: date, active_since: date, weather_since: datetime
+    ) -> int:
+        pass
+
     @abstractmethod
     async def get_for_user_in_range(self, user_id: int, date_from: date, date_to: date) -> List[DailyStats]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def get_series_for_user_in_range(
+        self, user_id: int, date_from: date, date_to: date, bucket: str = "day"
+    ) -> DailyStatsSeries:
+        pass
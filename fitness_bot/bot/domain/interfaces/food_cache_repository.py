@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+from domain.entities.food_cache_entry import FoodCacheEntry
+
+
+class FoodCacheRepository(ABC):
+    @abstractmethod
+    async def get(self, query: str, now: datetime) -> Optional[FoodCacheEntry]:
+        pass
+
+    @abstractmethod
+    async def upsert(self, entry: FoodCacheEntry) -> None:
+        pass
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List
+from typing import List, Tuple
 
+from domain.entities.daily_stats import DailyStats
 from domain.entities.food_log import FoodLog
 
 
@@ -10,6 +11,10 @@ class FoodLogRepository(ABC):
     async def add(self, food_log: FoodLog) -> int:
         pass
 
+    @abstractmethod
+    async def add_with_stats(self, food_log: FoodLog) -> Tuple[int, DailyStats]:
+        pass
+
     @abstractmethod
     async def get_by_user_and_date(self, user_id: int, date: date) -> List[FoodLog]:
         pass
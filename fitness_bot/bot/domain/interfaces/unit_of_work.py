@@ -44,4 +44,14 @@ class UnitOfWork(ABC):
     @property
     @abstractmethod
     def water_logs(self):
-        pass
\ No newline at end of file
+        pass
+
+    @property
+    @abstractmethod
+    def food_cache(self):
+        pass
+
+    @property
+    @abstractmethod
+    def city_weather(self):
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import date
+from typing import List, Optional
 
 from domain.entities.user import User
 
@@ -19,4 +20,12 @@ class UserRepository(ABC):
 
     @abstractmethod
     async def delete(self, user_id: int) -> None:
+        pass
+
+    @abstractmethod
+    async def get_timezones(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    async def get_active_cities(self, timezone: str, active_since: date) -> List[str]:
         pass
\ No newline at end of file
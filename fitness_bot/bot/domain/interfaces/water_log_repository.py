@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List
+from typing import List, Sequence, Tuple
 
+from domain.entities.daily_stats import DailyStats
 from domain.entities.water_log import WaterLog
 
 
@@ -10,6 +11,16 @@ class WaterLogRepository(ABC):
     async def add(self, water_log: WaterLog) -> int:
         pass
 
+    @abstractmethod
+    async def add_with_stats(self, water_log: WaterLog) -> Tuple[int, DailyStats]:
+        pass
+
+    @abstractmethod
+    async def add_many_with_stats(
+        self, water_logs: Sequence[WaterLog], synchronous_commit: bool = True
+    ) -> List[Tuple[int, DailyStats]]:
+        pass
+
     @abstractmethod
     async def get_by_user_and_date(self, user_id: int, date: date) -> List[WaterLog]:
         pass
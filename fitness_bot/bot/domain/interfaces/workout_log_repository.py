@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List
+from typing import List, Tuple
 
+from domain.entities.daily_stats import DailyStats
 from domain.entities.workout_log import WorkoutLog
 
 
@@ -10,6 +11,10 @@ class WorkoutLogRepository(ABC):
     async def add(self, workout_log: WorkoutLog) -> int:
         pass
 
+    @abstractmethod
+    async def add_with_stats(self, workout_log: WorkoutLog) -> Tuple[int, DailyStats]:
+        pass
+
     @abstractmethod
     async def get_by_user_and_date(self, user_id: int, date: date) -> List[WorkoutLog]:
         pass
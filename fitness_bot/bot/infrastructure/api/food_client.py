@@ -1,10 +1,16 @@
-import base64, hashlib, hmac, secrets, time, urllib.parse, logging, aiohttp
+import asyncio, base64, hashlib, hmac, secrets, time, urllib.parse, logging, aiohttp
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from infrastructure.api.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
+class FoodApiError(Exception):
+    pass
+
+
 @dataclass
 class FoodSearchItem:
     food_id: str
@@ -118,31 +124,44 @@ class FoodClient:
     FOODS_SEARCH_URL = "https://platform.fatsecret.com/rest/foods/search/v1"
     FOOD_GET_URL = "https://platform.fatsecret.com/rest/food/v5"
 
-    def __init__(self, consumer_key: str, consumer_secret: str):
+    def __init__(
+        self,
+        consumer_key: str,
+        consumer_secret: str,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
         """
         Инициализирует клиента FatSecret и подготавливает OAuth-подпись запросов.
 
         Входные параметры:
             consumer_key (str): OAuth consumer key приложения.
             consumer_secret (str): OAuth consumer secret приложения.
+            session (Optional[aiohttp.ClientSession]): Общая HTTP-сессия.
+            Переданную сессию клиент не закрывает.
 
         Логика работы:
             - Создаёт объект OAuth-подписи.
-            - Инициализирует сессию HTTP-клиента в неинициализированном состоянии.
+            - Использует переданную сессию или создаёт собственную
+              при первом запросе.
 
         Возвращаемое значение:
             None.
         """
         self.oauth = FatSecretOAuth1(consumer_key, consumer_secret)
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self.search_flight = SingleFlight()
+        self.kcal_flight = SingleFlight()
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
+            if not self._owns_session:
+                raise RuntimeError("Shared HTTP session is closed")
             self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
         return self._session
 
     async def close(self) -> None:
-        if self._session and not self._session.closed:
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
     async def foods_search(
@@ -150,6 +169,48 @@ class FoodClient:
         search_expression: str,
         max_results: int = 10,
         page_number: int = 0,
+    ) -> List[FoodSearchItem]:
+        """
+        Выполняет поиск продуктов, объединяя одновременные одинаковые запросы.
+
+        Входные параметры:
+            search_expression (str): Поисковая строка для запроса к API.
+            max_results (int): Максимальное количество результатов на страницу.
+            page_number (int): Номер страницы результатов.
+
+        Возвращаемое значение:
+            List[FoodSearchItem]: Список найденных продуктов (копия общего результата).
+
+        Исключения:
+            FoodApiError: Если сервис недоступен или вернул ошибку.
+        """
+        key = (" ".join(search_expression.lower().split()), max_results, page_number)
+        items = await self.search_flight.do(
+            key, lambda: self._foods_search(search_expression, max_results, page_number)
+        )
+        return list(items)
+
+    async def get_food_kcal_per_100g(self, food_id: str) -> Optional[float]:
+        """
+        Получает калорийность продукта, объединяя одновременные запросы
+        по одному идентификатору.
+
+        Входные параметры:
+            food_id (str): Идентификатор продукта во внешнем сервисе.
+
+        Возвращаемое значение:
+            Optional[float]: Калорийность на 100 грамм или None.
+
+        Исключения:
+            FoodApiError: Если сервис недоступен или вернул ошибку.
+        """
+        return await self.kcal_flight.do(food_id, lambda: self._get_food_kcal_per_100g(food_id))
+
+    async def _foods_search(
+        self,
+        search_expression: str,
+        max_results: int = 10,
+        page_number: int = 0,
     ) -> List[FoodSearchItem]:
         """
         Выполняет поиск продуктов по строке запроса и возвращает список найденных позиций.
@@ -164,12 +225,15 @@ class FoodClient:
             - Подписывает запрос OAuth 1.0.
             - Выполняет GET-запрос к endpoint поиска продуктов.
             - Пытается распарсить JSON-ответ.
-            - При ошибке парсинга или ошибке API возвращает пустой список.
             - Преобразует ответ API в список FoodSearchItem.
 
         Возвращаемое значение:
             List[FoodSearchItem]: Список найденных продуктов.
-            Может быть пустым, если продуктов нет или произошла ошибка.
+            Пустой, если сервис ответил, что продуктов нет.
+
+        Исключения:
+            FoodApiError: При сетевой ошибке, таймауте, ошибке парсинга
+            или ошибке API.
         """
         params = {
             "search_expression": search_expression,
@@ -179,34 +243,22 @@ class FoodClient:
         }
         signed = self.oauth.sign_query("GET", self.FOODS_SEARCH_URL, params)
 
-        session = await self._get_session()
-        async with session.get(self.FOODS_SEARCH_URL, params=signed) as resp:
-            raw = await resp.text()
-            print(raw)
-            try:
-                data = await resp.json(content_type=None)
-            except Exception:
-                logger.warning("FatSecret JSON parse error status=%s body=%s", resp.status, raw)
-                return []
-
-            if isinstance(data, dict) and "error" in data:
-                logger.warning("FatSecret API error status=%s body=%s", resp.status, data)
-                return []
-
-            foods = data.get("foods", {}).get("food", [])
-            if isinstance(foods, dict):
-                foods = [foods]
-
-            out: List[FoodSearchItem] = []
-            for f in foods:
-                fid = f.get("food_id")
-                name = f.get("food_name")
-                brand = f.get("brand_name")
-                if fid and name:
-                    out.append(FoodSearchItem(food_id=str(fid), name=str(name), brand=brand))
-            return out
+        data = await self._get_json(self.FOODS_SEARCH_URL, signed, "foods.search")
 
-    async def get_food_kcal_per_100g(self, food_id: str) -> Optional[float]:
+        foods = (data.get("foods") or {}).get("food", [])
+        if isinstance(foods, dict):
+            foods = [foods]
+
+        out: List[FoodSearchItem] = []
+        for f in foods:
+            fid = f.get("food_id")
+            name = f.get("food_name")
+            brand = f.get("brand_name")
+            if fid and name:
+                out.append(FoodSearchItem(food_id=str(fid), name=str(name), brand=brand))
+        return out
+
+    async def _get_food_kcal_per_100g(self, food_id: str) -> Optional[float]:
         """
         Получает калорийность продукта на 100 грамм по идентификатору продукта.
 
@@ -218,14 +270,18 @@ class FoodClient:
             - Подписывает запрос OAuth 1.0.
             - Выполняет GET-запрос к endpoint получения продукта.
             - Пытается распарсить JSON-ответ.
-            - При ошибке парсинга или ошибке API возвращает None.
             - Извлекает данные о порции и проверяет, что единицы измерения в граммах.
             - Пересчитывает калорийность порции к значению на 100 грамм.
 
         Возвращаемое значение:
             Optional[float]:
                 Калорийность на 100 грамм, если данные получены и корректны.
-                None, если данные отсутствуют или не поддаются интерпретации.
+                None, если в ответе сервиса нет данных о калорийности
+                или они не поддаются интерпретации.
+
+        Исключения:
+            FoodApiError: При сетевой ошибке, таймауте, ошибке парсинга
+            или ошибке API.
         """
         params = {
             "food_id": food_id,
@@ -233,38 +289,47 @@ class FoodClient:
         }
 
         signed = self.oauth.sign_query("GET", self.FOOD_GET_URL, params)
-        session = await self._get_session()
-
-        async with session.get(self.FOOD_GET_URL, params=signed) as resp:
-            raw = await resp.text()
-            try:
-                data = await resp.json(content_type=None)
-            except Exception:
-                logger.warning("FatSecret food.get parse error status=%s body=%s", resp.status, raw)
-                return None
-
-            if isinstance(data, dict) and "error" in data:
-                logger.warning("FatSecret food.get error status=%s body=%s", resp.status, data)
-                return None
-
-            food = data.get("food")
-            if not food:
-                return None
-
-            servings = food.get("servings", {}).get("serving")
-            if not servings:
-                return None
-
-            serving = servings[0] if isinstance(servings, list) else servings
-
-            kcal = serving.get("calories")
-            amount = serving.get("metric_serving_amount")
-            unit = serving.get("metric_serving_unit")
-
-            if not kcal or not amount or unit != "g":
-                return None
-
-            try:
-                return float(kcal) * (100.0 / float(amount))
-            except (ValueError, ZeroDivisionError):
-                return None
\ No newline at end of file
+        data = await self._get_json(self.FOOD_GET_URL, signed, "food.get")
+
+        food = data.get("food")
+        if not food:
+            return None
+
+        servings = (food.get("servings") or {}).get("serving")
+        if not servings:
+            return None
+
+        serving = servings[0] if isinstance(servings, list) else servings
+
+        kcal = serving.get("calories")
+        amount = serving.get("metric_serving_amount")
+        unit = serving.get("metric_serving_unit")
+
+        if not kcal or not amount or unit != "g":
+            return None
+
+        try:
+            return float(kcal) * (100.0 / float(amount))
+        except (ValueError, ZeroDivisionError):
+            return None
+
+    async def _get_json(self, url: str, params: Dict[str, str], method: str) -> Dict[str, Any]:
+        try:
+            session = await self._get_session()
+            async with session.get(url, params=params) as resp:
+                raw = await resp.text()
+                try:
+                    data = await resp.json(content_type=None)
+                except ValueError:
+                    data = None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            logger.warning("FatSecret %s request failed: %r", method, error)
+            raise FoodApiError(f"FatSecret {method} request failed") from error
+
+        if not isinstance(data, dict):
+            logger.warning("FatSecret %s parse error status=%s body=%s", method, resp.status, raw)
+            raise FoodApiError(f"FatSecret {method} returned an unreadable response")
+        if "error" in data:
+            logger.warning("FatSecret %s error status=%s body=%s", method, resp.status, data)
+            raise FoodApiError(f"FatSecret {method} returned an error")
+        return data
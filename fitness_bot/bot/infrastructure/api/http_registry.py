@@ -0,0 +1,119 @@
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+
+from config.settings import settings
+from infrastructure.api.food_client import FoodClient
+from infrastructure.api.weather_client import WeatherClient
+from infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientRegistry:
+    def __init__(self):
+        """
+        Инициализирует реестр HTTP-клиентов внешних сервисов на время жизни приложения.
+
+        Логика работы:
+            - Сессии и клиенты создаются в start() внутри работающего цикла событий.
+            - Для каждого внешнего сервиса используется отдельная сессия
+              со своим пулом соединений.
+
+        Возвращаемое значение:
+            None.
+        """
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._food_client: Optional[FoodClient] = None
+        self._weather_client: Optional[WeatherClient] = None
+
+    def _create_session(self, total_timeout_s: float) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT_S,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL_S,
+            use_dns_cache=True,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=total_timeout_s,
+            connect=settings.HTTP_CONNECT_TIMEOUT_S,
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def start(self) -> None:
+        """
+        Создаёт общие HTTP-сессии и клиенты внешних сервисов.
+
+        Логика работы:
+            - Создаёт сессии FatSecret и OpenWeather с настроенными
+              лимитами соединений, keepalive и кэшем DNS.
+            - Создаёт клиенты, использующие эти сессии.
+            - Регистрирует метрики пулов соединений и объединения запросов.
+
+        Возвращаемое значение:
+            None.
+        """
+        self._sessions["fatsecret"] = self._create_session(settings.HTTP_FOOD_TIMEOUT_S)
+        self._sessions["openweather"] = self._create_session(settings.HTTP_WEATHER_TIMEOUT_S)
+
+        self._food_client = FoodClient(
+            consumer_key=settings.FATSECRET_CONSUMER_KEY or "",
+            consumer_secret=settings.FATSECRET_CONSUMER_SECRET or "",
+            session=self._sessions["fatsecret"],
+        )
+        self._weather_client = WeatherClient(
+            settings.WEATHER_API_KEY,
+            session=self._sessions["openweather"],
+        )
+        metrics.register("http_pools", self.snapshot)
+        metrics.register("http_coalescing", self.coalescing_snapshot)
+
+    @property
+    def food_client(self) -> FoodClient:
+        if self._food_client is None:
+            raise RuntimeError("HttpClientRegistry not started.")
+        return self._food_client
+
+    @property
+    def weather_client(self) -> WeatherClient:
+        if self._weather_client is None:
+            raise RuntimeError("HttpClientRegistry not started.")
+        return self._weather_client
+
+    def snapshot(self) -> dict:
+        result = {}
+        for name, session in self._sessions.items():
+            connector = session.connector
+            if connector is None or connector.closed:
+                continue
+            pool = {
+                "limit": connector.limit,
+                "limit_per_host": connector.limit_per_host,
+            }
+            acquired = getattr(connector, "_acquired", None)
+            if acquired is not None:
+                pool["acquired"] = len(acquired)
+            result[name] = pool
+        return result
+
+    def coalescing_snapshot(self) -> dict:
+        if self._food_client is None or self._weather_client is None:
+            return {}
+        return {
+            "fatsecret_search": self._food_client.search_flight.snapshot(),
+            "fatsecret_food": self._food_client.kcal_flight.snapshot(),
+            "openweather": self._weather_client.weather_flight.snapshot(),
+        }
+
+    async def close(self) -> None:
+        for name, session in self._sessions.items():
+            if not session.closed:
+                try:
+                    await session.close()
+                except Exception:
+                    logger.exception("Failed to close HTTP session %s", name)
+        self._sessions.clear()
+        self._food_client = None
+        self._weather_client = None
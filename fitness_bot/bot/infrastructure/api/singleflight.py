@@ -0,0 +1,56 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Инициализирует слой объединения одновременных одинаковых запросов.
+
+        Логика работы:
+            - Для каждого ключа одновременно выполняется не более одного запроса.
+            - Остальные вызовы с тем же ключом ожидают его результат.
+
+        Возвращаемое значение:
+            None.
+        """
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполняет запрос по ключу или присоединяется к уже выполняющемуся.
+
+        Входные параметры:
+            key (Hashable): Нормализованный ключ запроса.
+            fn (Callable[[], Awaitable[T]]): Функция, выполняющая запрос.
+
+        Логика работы:
+            - Если запрос с таким ключом уже выполняется, ожидает его результат.
+            - Иначе запускает запрос отдельной задачей, чтобы отмена одного
+              из ожидающих не отменяла запрос для остальных.
+            - Исключение запроса получают все ожидающие.
+
+        Возвращаемое значение:
+            T: Результат запроса.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+            self.stats["calls"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "inflight": len(self._inflight)}
@@ -4,6 +4,8 @@ import asyncio
 import logging
 from functools import lru_cache
 
+from infrastructure.api.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,33 +17,40 @@ class WeatherInfo(NamedTuple):
 
 
 class WeatherClient:
-    def __init__(self, api_key: Optional[str]):
+    def __init__(self, api_key: Optional[str], session: Optional[aiohttp.ClientSession] = None):
         """
         Инициализирует клиент погоды.
 
         Входные параметры:
             api_key (Optional[str]): API-ключ внешнего погодного сервиса.
+            session (Optional[aiohttp.ClientSession]): Общая HTTP-сессия.
+            Переданную сессию клиент не закрывает.
 
         Логика работы:
             - Сохраняет API-ключ.
-            - Инициализирует HTTP-сессию в неинициализированном состоянии.
+            - Использует переданную сессию или создаёт собственную
+              при первом запросе.
             - Инициализирует кэш результатов геокодирования города.
 
         Возвращаемое значение:
             None.
         """
         self.api_key = api_key
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self._geocache: dict[str, tuple[float, float]] = {}
+        self.weather_flight = SingleFlight()
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
+            if not self._owns_session:
+                raise RuntimeError("Shared HTTP session is closed")
             timeout = aiohttp.ClientTimeout(total=10)
             self._session = aiohttp.ClientSession(timeout=timeout)
         return self._session
 
     async def close(self):
-        if self._session and not self._session.closed:
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
     async def __aenter__(self):
@@ -51,6 +60,20 @@ class WeatherClient:
         await self.close()
 
     async def get_weather(self, city: str) -> Optional[WeatherInfo]:
+        """
+        Получает погодные данные для города, объединяя одновременные
+        запросы по одному и тому же городу.
+
+        Входные параметры:
+            city (str): Название города.
+
+        Возвращаемое значение:
+            Optional[WeatherInfo]: Данные о погоде или None.
+        """
+        key = " ".join(city.lower().split())
+        return await self.weather_flight.do(key, lambda: self._get_weather(city))
+
+    async def _get_weather(self, city: str) -> Optional[WeatherInfo]:
         """
         Получает погодные данные для указанного города.
 
@@ -1,31 +1,36 @@
 import io
 import logging
-from datetime import date
-from typing import List, Optional
+from typing import Optional
 
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import numpy as np
 
-from domain.entities.daily_stats import DailyStats
+from application.services.progress_analytics import ProgressAnalytics
+from domain.entities.daily_stats_series import DailyStatsSeries
 
 logger = logging.getLogger(__name__)
 
 
-def build_progress_charts_png(daily_stats: List[DailyStats]) -> Optional[bytes]:
+def build_progress_charts_png(
+    series: DailyStatsSeries, analytics: Optional[ProgressAnalytics] = None
+) -> Optional[bytes]:
     """
     Строит PNG-изображение с графиками прогресса по воде и калориям
-    на основе списка суточной статистики.
+    на основе ряда суточной статистики.
 
     Входные параметры:
-        daily_stats (List[DailyStats]): Список объектов суточной статистики,
-        содержащих значения потребления воды и калорий по датам.
+        series (DailyStatsSeries): Ряд суточной статистики в колоночном виде.
+        analytics (Optional[ProgressAnalytics]): Скользящие средние и тренды,
+        которые нужно нанести на графики.
 
     Логика работы:
         - При отсутствии данных возвращает None.
-        - Извлекает временной ряд дат и ключевых показателей из списка статистики.
+        - Передаёт массивы ряда в matplotlib напрямую, без объектов на каждый день.
         - Строит два графика:
             - прогресс по воде (выпито и цель),
             - прогресс по калориям (потреблено, сожжено и цель).
+        - При наличии аналитики добавляет скользящие средние и линии тренда.
         - Форматирует ось дат.
         - Сохраняет результат в буфер памяти в формате PNG и возвращает байты.
 
@@ -34,38 +39,43 @@ def build_progress_charts_png(daily_stats: List[DailyStats]) -> Optional[bytes]:
             Байтовое содержимое PNG-файла с графиками прогресса
             или None при отсутствии данных.
     """
-    if not daily_stats:
+    if len(series) == 0:
         return None
 
     try:
-        dates = [s.date for s in daily_stats]
-        water_logged = [s.water_logged_ml for s in daily_stats]
-        water_goal = [s.water_goal_ml for s in daily_stats]
-        calories_consumed = [s.calories_consumed_kcal for s in daily_stats]
-        calories_burned = [s.calories_burned_kcal for s in daily_stats]
-        calorie_goal = [s.calorie_goal_kcal for s in daily_stats]
+        dates = series.dates
 
+        marker_size = 4 if len(dates) <= 60 else 0
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
         fig.suptitle("Прогресс по воде и калориям", fontsize=14)
 
 
-        ax1.plot(dates, water_logged, marker='o', label='Выпито, мл', color='#1f77b4')
-        ax1.plot(dates, water_goal, marker='s', linestyle='--', label='Цель, мл', color='#ff7f0e')
+        ax1.plot(dates, series.water_logged_ml, marker='o', markersize=marker_size, label='Выпито, мл', color='#1f77b4')
+        ax1.plot(dates, series.water_goal_ml, marker='s', markersize=marker_size, linestyle='--', label='Цель, мл', color='#ff7f0e')
+        if analytics is not None:
+            if analytics.water_rolling_avg is not None:
+                ax1.plot(dates, analytics.water_rolling_avg, linewidth=2, alpha=0.6, label='Среднее за 7 дней', color='#17becf')
+            ax1.plot(dates, analytics.water_trend, linestyle=':', label='Тренд', color='#7f7f7f')
         ax1.set_ylabel('Вода (мл)')
         ax1.legend(loc='upper left')
         ax1.grid(True, alpha=0.3)
 
 
-        ax2.plot(dates, calories_consumed, marker='o', label='Потреблено, ккал', color='#2ca02c')
-        ax2.plot(dates, calories_burned, marker='^', label='Сожжено, ккал', color='#d62728')
-        ax2.plot(dates, calorie_goal, marker='s', linestyle='--', label='Цель, ккал', color='#9467bd')
+        ax2.plot(dates, series.calories_consumed_kcal, marker='o', markersize=marker_size, label='Потреблено, ккал', color='#2ca02c')
+        ax2.plot(dates, series.calories_burned_kcal, marker='^', markersize=marker_size, label='Сожжено, ккал', color='#d62728')
+        ax2.plot(dates, series.calorie_goal_kcal, marker='s', markersize=marker_size, linestyle='--', label='Цель, ккал', color='#9467bd')
+        if analytics is not None:
+            if analytics.calories_rolling_avg is not None:
+                ax2.plot(dates, analytics.calories_rolling_avg, linewidth=2, alpha=0.6, label='Среднее за 7 дней', color='#bcbd22')
+            ax2.plot(dates, analytics.calories_trend, linestyle=':', label='Тренд', color='#7f7f7f')
         ax2.set_xlabel('Дата')
         ax2.set_ylabel('Калории (ккал)')
         ax2.legend(loc='upper left')
         ax2.grid(True, alpha=0.3)
 
 
-        date_fmt = mdates.DateFormatter('%d.%m')
+        span_days = int((dates[-1] - dates[0]) / np.timedelta64(1, 'D'))
+        date_fmt = mdates.DateFormatter('%m.%Y' if span_days > 180 else '%d.%m')
         ax2.xaxis.set_major_formatter(date_fmt)
         fig.autofmt_xdate(rotation=30)
 
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Set
+
+from application.services.progress_analytics import ProgressAnalytics
+from domain.entities.daily_stats_series import DailyStatsSeries
+from infrastructure.charts import render_worker
+from infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ChartRenderError(Exception):
+    pass
+
+
+class ChartRenderBusyError(ChartRenderError):
+    pass
+
+
+class ChartRenderTimeoutError(ChartRenderError):
+    pass
+
+
+class ChartRenderService:
+    def __init__(self, workers: int, max_queue: int, job_timeout_s: float):
+        """
+        Инициализирует сервис построения графиков в пуле процессов.
+
+        Входные параметры:
+            workers (int): Число процессов-рендереров.
+            max_queue (int): Сколько заданий может ожидать свободный процесс
+            сверх выполняющихся.
+            job_timeout_s (float): Максимальное время ожидания одного графика.
+
+        Логика работы:
+            - Процессы запускаются в start() через forkserver: сервер один раз
+              импортирует render_worker и matplotlib, а процессы-рендереры
+              порождаются от него и выбирают бэкенд Agg.
+            - Точка входа main.py не импортирует приложение на уровне модуля,
+              поэтому её повторный импорт в процессах-рендерерах дешёвый.
+            - Задания сверх workers + max_queue отклоняются сразу.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.job_timeout_s = job_timeout_s
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Set[Future] = set()
+        self.stats = {"rendered": 0, "rejected": 0, "timeouts": 0, "failures": 0}
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([render_worker.__name__, *render_worker.PRELOAD_MODULES])
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=render_worker.init_worker,
+        )
+
+    async def start(self) -> None:
+        """
+        Запускает пул процессов и прогревает все процессы.
+
+        Логика работы:
+            - Создаёт пул процессов.
+            - Отправляет по одному пустому заданию на каждый процесс,
+              чтобы процессы стартовали и выполнили инициализацию заранее.
+
+        Возвращаемое значение:
+            None.
+        """
+        self._executor = self._create_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, render_worker.warmup) for _ in range(self.workers))
+        )
+        metrics.register("chart_render", self.snapshot)
+
+    def _release(self, future: Future) -> None:
+        self._pending.discard(future)
+
+    def _on_done(self, loop: asyncio.AbstractEventLoop, future: Future) -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._release, future)
+
+    async def render_progress_charts(
+        self, series: DailyStatsSeries, analytics: Optional[ProgressAnalytics] = None
+    ) -> Optional[bytes]:
+        """
+        Строит PNG с графиками прогресса в отдельном процессе.
+
+        Входные параметры:
+            series (DailyStatsSeries): Ряд суточной статистики за период.
+            analytics (Optional[ProgressAnalytics]): Аналитика для нанесения
+            на графики.
+
+        Логика работы:
+            - Отклоняет задание, если очередь заполнена.
+            - Ожидает результат не дольше job_timeout_s, не блокируя цикл событий.
+            - Место в очереди освобождается, когда процесс действительно
+              закончил работу, даже если ожидание прервано по таймауту.
+            - Пересоздаёт пул, если процесс-рендерер аварийно завершился.
+
+        Возвращаемое значение:
+            Optional[bytes]: Байты PNG-изображения или None, если данных нет.
+
+        Исключения:
+            ChartRenderBusyError: Если очередь заданий заполнена.
+            ChartRenderTimeoutError: Если график не построен за job_timeout_s.
+            ChartRenderError: Если сервис не запущен или пул процессов сломан.
+        """
+        if len(series) == 0:
+            return None
+        if self._executor is None:
+            raise ChartRenderError("Chart render service is not started")
+        if len(self._pending) >= self.workers + self.max_queue:
+            self.stats["rejected"] += 1
+            raise ChartRenderBusyError("Chart render queue is full")
+
+        executor = self._executor
+        try:
+            future = executor.submit(render_worker.render_progress_charts, series, analytics)
+        except BrokenProcessPool as exc:
+            self._restart(executor)
+            self.stats["failures"] += 1
+            raise ChartRenderError("Chart render pool is broken") from exc
+
+        loop = asyncio.get_running_loop()
+        self._pending.add(future)
+        future.add_done_callback(lambda done: self._on_done(loop, done))
+
+        try:
+            png_bytes = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), self.job_timeout_s
+            )
+        except asyncio.TimeoutError as exc:
+            self.stats["timeouts"] += 1
+            raise ChartRenderTimeoutError("Chart rendering timed out") from exc
+        except BrokenProcessPool as exc:
+            self._restart(executor)
+            self.stats["failures"] += 1
+            raise ChartRenderError("Chart render pool is broken") from exc
+
+        self.stats["rendered"] += 1
+        return png_bytes
+
+    def _restart(self, broken_executor: ProcessPoolExecutor) -> None:
+        if self._executor is not broken_executor:
+            return
+        logger.warning("Chart render pool is broken, restarting")
+        self._executor = self._create_executor()
+        self._pending = set()
+        broken_executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "pending": len(self._pending)}
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
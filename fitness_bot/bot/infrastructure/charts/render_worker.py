@@ -0,0 +1,27 @@
+from typing import Optional
+
+from application.services.progress_analytics import ProgressAnalytics
+from domain.entities.daily_stats_series import DailyStatsSeries
+
+PRELOAD_MODULES = ["matplotlib", "infrastructure.charts.progress_charts"]
+
+
+def init_worker() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot
+
+    import infrastructure.charts.progress_charts
+
+
+def warmup() -> bool:
+    return True
+
+
+def render_progress_charts(
+    series: DailyStatsSeries, analytics: Optional[ProgressAnalytics]
+) -> Optional[bytes]:
+    from infrastructure.charts.progress_charts import build_progress_charts_png
+
+    return build_progress_charts_png(series, analytics)
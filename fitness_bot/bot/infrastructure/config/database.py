@@ -1,7 +1,190 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue, Empty
 
 from config.settings import settings
+from infrastructure.db.replica_router import ReplicaRouter
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from infrastructure.metrics import metrics
+
+BLOCKED_CHECKOUT_S = 0.001
+
+
+@dataclass
+class PoolMetrics:
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    pool_gets: int = 0
+    blocked_checkouts: int = 0
+    checkout_failures: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+
+    def record_wait(self, wait_s: float, failed: bool) -> None:
+        self.pool_gets += 1
+        if wait_s >= BLOCKED_CHECKOUT_S:
+            self.blocked_checkouts += 1
+        self.wait_total_s += wait_s
+        self.wait_max_s = max(self.wait_max_s, wait_s)
+        if failed:
+            self.checkout_failures += 1
+
+
+class InstrumentedAsyncQueue(AsyncAdaptedQueue):
+    """
+    Очередь свободных соединений пула, измеряющая время ожидания в ней.
+    Создание нового соединения при свободном переполнении в замер не входит.
+    """
+
+    pool_metrics: Optional[PoolMetrics] = None
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        started = time.perf_counter()
+        failed = False
+        try:
+            return super().get(block, timeout)
+        except Empty:
+            failed = block
+            raise
+        finally:
+            if self.pool_metrics is not None:
+                self.pool_metrics.record_wait(time.perf_counter() - started, failed)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    _queue_class = InstrumentedAsyncQueue
+
+
+def _instrument_pool(engine: AsyncEngine) -> PoolMetrics:
+    pool_metrics = PoolMetrics()
+    pool = engine.sync_engine.pool
+    pool.pool_metrics = pool_metrics
+    pool._pool.pool_metrics = pool_metrics
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool_metrics.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.checkouts += 1
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        pool_metrics.checkins += 1
+
+    return pool_metrics
+
+
+def build_engine(dsn: str, read_only: bool = False) -> AsyncEngine:
+    """
+    Создаёт асинхронный движок SQLAlchemy с параметрами пула из настроек.
+
+    Входные параметры:
+        dsn (str): Строка подключения к PostgreSQL (драйвер asyncpg).
+        read_only (bool): Движок для чтения: соединения работают
+        в автокоммите и с default_transaction_read_only.
+
+    Логика работы:
+        - Настраивает размер пула, переполнение, таймаут ожидания,
+          пересоздание и проверку соединений.
+        - Передаёт asyncpg размер кэша подготовленных выражений
+          и statement_timeout сервера.
+        - Для движка чтения отключает явные транзакции и запрещает запись
+          на стороне сервера.
+        - Подключает сбор метрик ожидания и выдачи соединений.
+
+    Возвращаемое значение:
+        AsyncEngine: Настроенный движок.
+    """
+    server_settings = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    engine_kwargs = {}
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+        engine_kwargs["isolation_level"] = "AUTOCOMMIT"
+    connect_args = {
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "server_settings": server_settings,
+    }
+    new_engine = create_async_engine(
+        dsn,
+        **engine_kwargs,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_READ_POOL_SIZE if read_only else settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_READ_MAX_OVERFLOW if read_only else settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    _instrument_pool(new_engine)
+    return new_engine
+
+
+def pool_snapshot(engine: AsyncEngine) -> dict:
+    """
+    Возвращает текущее состояние пула соединений движка.
+
+    Входные параметры:
+        engine (AsyncEngine): Движок, созданный через build_engine.
+
+    Возвращаемое значение:
+        dict: Размер пула, число выданных и переполненных соединений,
+        а также накопленные счётчики выдачи и ожидания. Ожиданием считается
+        только время в очереди свободных соединений, без открытия новых;
+        blocked_checkouts учитывает ожидания не меньше BLOCKED_CHECKOUT_S.
+    """
+    pool = engine.sync_engine.pool
+    pool_metrics: PoolMetrics = pool.pool_metrics
+    gets = pool_metrics.pool_gets
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "connects": pool_metrics.connects,
+        "checkouts": pool_metrics.checkouts,
+        "checkins": pool_metrics.checkins,
+        "blocked_checkouts": pool_metrics.blocked_checkouts,
+        "checkout_failures": pool_metrics.checkout_failures,
+        "wait_avg_ms": round(pool_metrics.wait_total_s / gets * 1000, 3) if gets else 0.0,
+        "wait_max_ms": round(pool_metrics.wait_max_s * 1000, 3),
+    }
+
+
+engine = build_engine(settings.POSTGRES_DSN)
+AsyncSessionFactory = async_sessionmaker(engine, expire_on_commit=False)
+
+read_engine = build_engine(settings.POSTGRES_DSN, read_only=True)
+replica_engines = [build_engine(dsn, read_only=True) for dsn in settings.POSTGRES_REPLICA_DSNS]
+
+ReadSessionFactory = ReplicaRouter(
+    primary=async_sessionmaker(read_engine, expire_on_commit=False, autoflush=False),
+    replicas=[
+        async_sessionmaker(replica_engine, expire_on_commit=False, autoflush=False)
+        for replica_engine in replica_engines
+    ],
+    staleness_window_s=settings.REPLICA_STALENESS_WINDOW_S,
+    failure_cooldown_s=settings.REPLICA_FAILURE_COOLDOWN_S,
+)
+SqlAlchemyUnitOfWork.add_commit_listener(ReadSessionFactory.mark_write)
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    await read_engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
 
 
-engine = create_async_engine(settings.POSTGRES_DSN, echo=True)
-AsyncSessionFactory = async_sessionmaker(engine, expire_on_commit=False)
\ No newline at end of file
+metrics.register("db_pool", lambda: pool_snapshot(engine))
+metrics.register("db_read_pool", lambda: pool_snapshot(read_engine))
+for _index, _replica_engine in enumerate(replica_engines):
+    metrics.register(f"db_replica_pool_{_index}", lambda e=_replica_engine: pool_snapshot(e))
+metrics.register("db_replica_router", ReadSessionFactory.snapshot)
@@ -1,6 +1,7 @@
 from datetime import date, datetime
 
-from sqlalchemy import BigInteger, Date, DateTime, Float, Integer, String, Text
+from sqlalchemy import BigInteger, Date, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -27,6 +28,7 @@ class UserModel(Base):
     calorie_goal_kcal_manual: Mapped[int | None] = mapped_column(Integer, nullable=True)
     water_goal_mode: Mapped[str] = mapped_column(Text, default="auto")
     water_goal_ml_manual: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
 
 
 class DailyStatsModel(Base):
@@ -41,12 +43,16 @@ class DailyStatsModel(Base):
     water_logged_ml: Mapped[int] = mapped_column(Integer, default=0)
     calories_consumed_kcal: Mapped[int] = mapped_column(Integer, default=0)
     calories_burned_kcal: Mapped[int] = mapped_column(Integer, default=0)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
-    __table_args__ = ({"schema": "public"},)
+    __table_args__ = (
+        Index("ux_daily_stats_user_id_date", "user_id", "date", unique=True),
+        {"schema": "public"},
+    )
 
 
 class FoodLogModel(Base):
@@ -85,4 +91,34 @@ class WaterLogModel(Base):
     user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     date: Mapped[date] = mapped_column(Date, nullable=False)
     logged_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    ml: Mapped[int] = mapped_column(Integer)
\ No newline at end of file
+    ml: Mapped[int] = mapped_column(Integer)
+
+class FoodCacheModel(Base):
+    __tablename__ = "food_cache"
+
+    query: Mapped[str] = mapped_column(Text, primary_key=True)
+    food_id: Mapped[str | None] = mapped_column(Text, nullable=True)
+    name: Mapped[str | None] = mapped_column(Text, nullable=True)
+    kcal_per_100g: Mapped[float | None] = mapped_column(Float, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class CityWeatherModel(Base):
+    __tablename__ = "city_weather"
+
+    city: Mapped[str] = mapped_column(Text, primary_key=True)
+    temperature_c: Mapped[float | None] = mapped_column(Float, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class FsmStorageModel(Base):
+    __tablename__ = "fsm_storage"
+
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    state: Mapped[str | None] = mapped_column(Text, nullable=True)
+    data: Mapped[dict] = mapped_column(JSONB, default=dict)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (Index("ix_fsm_storage_expires_at", "expires_at"),)
@@ -0,0 +1,207 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+_PRUNE_THRESHOLD = 10_000
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: Callable,
+        replicas: Sequence[Callable] = (),
+        staleness_window_s: float = 5.0,
+        failure_cooldown_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Маршрутизирует сессии только для чтения между репликами и основным сервером.
+
+        Входные параметры:
+            primary (Callable): Фабрика сессий чтения основного сервера.
+            replicas (Sequence[Callable]): Фабрики сессий реплик.
+            staleness_window_s (float): Сколько секунд после записи
+            пользователя его чтения идут на основной сервер.
+            failure_cooldown_s (float): Сколько секунд реплика исключена
+            из ротации после ошибки подключения.
+            clock (Callable[[], float]): Источник монотонного времени.
+
+        Логика работы:
+            - Реплики выбираются по кругу, пропуская недоступные.
+            - Соединение с репликой устанавливается при первом запросе
+              сессии; при ошибке подключения запрос выполняется
+              на следующей реплике.
+            - Если доступных реплик нет, используется основной сервер.
+            - Время последней записи пользователя хранится в памяти
+              процесса: запись, выполненная другим экземпляром бота,
+              не направляет чтения этого процесса на основной сервер.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.primary = primary
+        self.replicas: List[Callable] = list(replicas)
+        self.staleness_window_s = staleness_window_s
+        self.failure_cooldown_s = failure_cooldown_s
+        self._clock = clock
+        self._round_robin = itertools.cycle(range(len(self.replicas)))
+        self._unhealthy_until: Dict[int, float] = {}
+        self._recent_writes: Dict[int, float] = {}
+        self.stats = {
+            "replica_reads": 0,
+            "primary_reads": 0,
+            "fresh_reads": 0,
+            "failovers": 0,
+        }
+
+    def mark_write(self, user_id: Optional[int]) -> None:
+        if user_id is None or not self.replicas:
+            return
+        now = self._clock()
+        self._recent_writes[user_id] = now + self.staleness_window_s
+        if len(self._recent_writes) > _PRUNE_THRESHOLD:
+            self._recent_writes = {
+                key: until for key, until in self._recent_writes.items() if until > now
+            }
+
+    def mark_failed(self, replica_index: int) -> None:
+        self._unhealthy_until[replica_index] = self._clock() + self.failure_cooldown_s
+
+    def is_healthy(self, replica_index: int) -> bool:
+        until = self._unhealthy_until.get(replica_index)
+        if until is None:
+            return True
+        if until <= self._clock():
+            del self._unhealthy_until[replica_index]
+            return True
+        return False
+
+    def needs_primary(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        until = self._recent_writes.get(user_id)
+        if until is None:
+            return False
+        if until <= self._clock():
+            del self._recent_writes[user_id]
+            return False
+        return True
+
+    def replica_order(self) -> List[int]:
+        """
+        Возвращает порядок опроса реплик для очередного чтения.
+
+        Возвращаемое значение:
+            List[int]: Индексы доступных реплик, начиная со следующей по кругу.
+        """
+        if not self.replicas:
+            return []
+        start = next(self._round_robin)
+        count = len(self.replicas)
+        order = [(start + offset) % count for offset in range(count)]
+        return [index for index in order if self.is_healthy(index)]
+
+    def open_session(self, user_id: Optional[int] = None):
+        """
+        Открывает сессию чтения на подходящем сервере.
+
+        Входные параметры:
+            user_id (Optional[int]): Пользователь, от имени которого выполняется чтение.
+
+        Логика работы:
+            - Если пользователь недавно записывал данные, возвращает сессию
+              основного сервера.
+            - Иначе возвращает ReplicaSession, которая подключается
+              к доступным репликам по порядку только при первом запросе.
+
+        Возвращаемое значение:
+            Сессия SQLAlchemy основного сервера или ReplicaSession.
+        """
+        if self.needs_primary(user_id):
+            self.stats["fresh_reads"] += 1
+            self.stats["primary_reads"] += 1
+            return self.primary()
+        return ReplicaSession(self, self.replica_order())
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "replicas": len(self.replicas),
+            "unhealthy_replicas": sum(
+                1 for index in range(len(self.replicas)) if not self.is_healthy(index)
+            ),
+            "tracked_writers": len(self._recent_writes),
+        }
+
+
+class ReplicaSession:
+    def __init__(self, router: ReplicaRouter, replica_indexes: Sequence[int]):
+        """
+        Инициализирует сессию чтения с отложенным выбором реплики.
+
+        Входные параметры:
+            router (ReplicaRouter): Маршрутизатор, выдавший сессию.
+            replica_indexes (Sequence[int]): Реплики в порядке опроса.
+
+        Логика работы:
+            - Сессия первой реплики создаётся сразу, но соединение
+              не запрашивается до первого execute().
+            - При первом execute() получает соединение; если реплика
+              недоступна, закрывает её сессию, исключает реплику из ротации
+              и пробует следующую, а затем основной сервер.
+            - Ошибки самих запросов и ошибки основного сервера
+              передаются вызывающему.
+            - Остальные атрибуты передаются текущей сессии.
+
+        Возвращаемое значение:
+            None.
+        """
+        self._router = router
+        self._pending = list(replica_indexes)
+        self._replica_index: Optional[int] = None
+        self._connected = False
+        self._session = self._open_next()
+
+    def _open_next(self):
+        if self._pending:
+            self._replica_index = self._pending.pop(0)
+            return self._router.replicas[self._replica_index]()
+        self._replica_index = None
+        return self._router.primary()
+
+    async def _connect(self) -> None:
+        router = self._router
+        while self._replica_index is not None:
+            try:
+                await self._session.connection()
+            except (OSError, DBAPIError, asyncio.TimeoutError):
+                logger.warning(
+                    "Replica %s is unavailable, failing over", self._replica_index, exc_info=True
+                )
+                await self._session.close()
+                router.mark_failed(self._replica_index)
+                router.stats["failovers"] += 1
+                self._session = self._open_next()
+                continue
+            router.stats["replica_reads"] += 1
+            self._connected = True
+            return
+        router.stats["primary_reads"] += 1
+        self._connected = True
+
+    async def execute(self, *args, **kwargs):
+        if not self._connected:
+            await self._connect()
+        return await self._session.execute(*args, **kwargs)
+
+    async def close(self) -> None:
+        await self._session.close()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
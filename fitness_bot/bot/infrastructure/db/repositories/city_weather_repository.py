@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.interfaces.city_weather_repository import CityWeatherRepository
+from infrastructure.db.models import CityWeatherModel
+
+
+class CityWeatherRepositoryImpl(CityWeatherRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def upsert_many(self, temperatures: Dict[str, Optional[float]], fetched_at: datetime) -> None:
+        """
+        Сохраняет текущую температуру воздуха для нескольких городов.
+
+        Входные параметры:
+            temperatures (Dict[str, Optional[float]]): Температура по названию
+            города; None, если погоду получить не удалось.
+            fetched_at (datetime): Время получения данных.
+
+        Логика работы:
+            - Выполняет один многострочный INSERT ... ON CONFLICT (city) DO UPDATE.
+
+        Возвращаемое значение:
+            None.
+        """
+        if not temperatures:
+            return
+        stmt = pg_insert(CityWeatherModel).values(
+            [
+                {"city": city, "temperature_c": temperature_c, "fetched_at": fetched_at}
+                for city, temperature_c in sorted(temperatures.items())
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CityWeatherModel.city],
+            set_={
+                "temperature_c": stmt.excluded.temperature_c,
+                "fetched_at": stmt.excluded.fetched_at,
+            },
+        )
+        await self._session.execute(stmt)
@@ -1,12 +1,25 @@
-from datetime import date
+from datetime import date, datetime
 from typing import List
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import BigInteger, Date, DateTime, Insert as CoreInsert, Integer, Select, cast, func, literal, literal_column, select, update
+from sqlalchemy.dialects.postgresql import Insert, insert as pg_insert
 
 from domain.entities.daily_stats import DailyStats
+from domain.entities.daily_stats_series import DailyStatsSeries
+from domain.exceptions import ConcurrencyConflictError
 from domain.interfaces.daily_stats_repository import DailyStatsRepository
-from infrastructure.db.models import DailyStatsModel, UserModel
-from .user_repository import to_domain as user_to_domain
+from infrastructure.db.models import CityWeatherModel, DailyStatsModel, UserModel
+from .user_repository import active_user_clause, calorie_goal_kcal_expr, water_goal_ml_expr
+
+AGGREGATION_BUCKETS = ("week", "month")
+SERIES_COUNTERS = (
+    "water_logged_ml",
+    "water_goal_ml",
+    "calories_consumed_kcal",
+    "calories_burned_kcal",
+    "calorie_goal_kcal",
+)
 
 
 def to_domain(model: DailyStatsModel) -> DailyStats:
@@ -22,6 +35,7 @@ def to_domain(model: DailyStatsModel) -> DailyStats:
         calories_burned_kcal=model.calories_burned_kcal,
         created_at=model.created_at,
         updated_at=model.updated_at,
+        version=model.version,
     )
 
 
@@ -37,12 +51,228 @@ def to_model(stats: DailyStats) -> DailyStatsModel:
         "calories_burned_kcal": stats.calories_burned_kcal,
         "created_at": stats.created_at,
         "updated_at": stats.updated_at,
+        "version": stats.version,
     }
     if stats.id != 0:
         kwargs["id"] = stats.id
     return DailyStatsModel(**kwargs)
 
 
+def insert_from_user(
+    user_id: int,
+    stats_date: date,
+    now: datetime,
+    water_ml: int = 0,
+    kcal_consumed: int = 0,
+    kcal_burned: int = 0,
+    water_goal_bonus: int = 0,
+) -> Insert:
+    """
+    Формирует INSERT ... SELECT суточной статистики, цели которой
+    рассчитываются в SQL по строке пользователя.
+
+    Входные параметры:
+        user_id (int): Идентификатор пользователя.
+        stats_date (date): Дата суточной статистики.
+        now (datetime): Метка времени создания и обновления строки.
+        water_ml, kcal_consumed, kcal_burned, water_goal_bonus (int):
+        Начальные значения счётчиков и надбавка к цели по воде.
+
+    Логика работы:
+        - Рассчитывает цели по воде и калориям подзапросами к таблице users.
+        - Подставляет нулевые цели, если пользователь не найден.
+        - Инициализирует счётчики воды и калорий переданными значениями.
+
+    Возвращаемое значение:
+        Insert: Выражение вставки без обработки конфликтов.
+    """
+    water_goal_ml = (
+        select(water_goal_ml_expr()).where(UserModel.id == user_id).scalar_subquery()
+    )
+    calorie_goal_kcal = (
+        select(calorie_goal_kcal_expr()).where(UserModel.id == user_id).scalar_subquery()
+    )
+    source = select(
+        literal(user_id, BigInteger),
+        literal(stats_date, Date),
+        func.coalesce(water_goal_ml, 0) + water_goal_bonus,
+        func.coalesce(calorie_goal_kcal, 0),
+        literal(water_ml, Integer),
+        literal(kcal_consumed, Integer),
+        literal(kcal_burned, Integer),
+        literal(now, DateTime),
+        literal(now, DateTime),
+    )
+    return pg_insert(DailyStatsModel).from_select(
+        [
+            "user_id",
+            "date",
+            "water_goal_ml",
+            "calorie_goal_kcal",
+            "water_logged_ml",
+            "calories_consumed_kcal",
+            "calories_burned_kcal",
+            "created_at",
+            "updated_at",
+        ],
+        source,
+    )
+
+
+def increment_statement(
+    user_id: int,
+    stats_date: date,
+    water_ml: int = 0,
+    kcal_consumed: int = 0,
+    kcal_burned: int = 0,
+    water_goal_bonus: int = 0,
+) -> Insert:
+    """
+    Формирует upsert суточной статистики, прибавляющий приращения
+    к счётчикам строки (user_id, date) на стороне базы данных.
+
+    Входные параметры:
+        user_id (int): Идентификатор пользователя.
+        stats_date (date): Дата суточной статистики.
+        water_ml (int): Приращение выпитой воды в миллилитрах.
+        kcal_consumed (int): Приращение потреблённых калорий.
+        kcal_burned (int): Приращение сожжённых калорий.
+        water_goal_bonus (int): Приращение цели по воде в миллилитрах.
+
+    Возвращаемое значение:
+        Insert: Выражение INSERT ... ON CONFLICT DO UPDATE без RETURNING.
+    """
+    now = datetime.utcnow()
+    stmt = insert_from_user(
+        user_id,
+        stats_date,
+        now,
+        water_ml=water_ml,
+        kcal_consumed=kcal_consumed,
+        kcal_burned=kcal_burned,
+        water_goal_bonus=water_goal_bonus,
+    )
+    stats_table = DailyStatsModel.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "date"],
+        set_={
+            "water_logged_ml": stats_table.c.water_logged_ml + water_ml,
+            "calories_consumed_kcal": stats_table.c.calories_consumed_kcal + kcal_consumed,
+            "calories_burned_kcal": stats_table.c.calories_burned_kcal + kcal_burned,
+            "water_goal_ml": stats_table.c.water_goal_ml + water_goal_bonus,
+            "updated_at": now,
+            "version": stats_table.c.version + 1,
+        },
+    )
+
+
+def insert_with_increment_statement(
+    log_insert: CoreInsert,
+    user_id: int,
+    stats_date: date,
+    water_ml: int = 0,
+    kcal_consumed: int = 0,
+    kcal_burned: int = 0,
+    water_goal_bonus: int = 0,
+) -> Select:
+    """
+    Формирует запрос, вставляющий запись журнала и прибавляющий её
+    приращения к суточной статистике одним обращением к базе.
+
+    Входные параметры:
+        log_insert (Insert): Вставка одной записи журнала без RETURNING.
+        user_id (int): Идентификатор пользователя.
+        stats_date (date): Дата суточной статистики.
+        water_ml, kcal_consumed, kcal_burned, water_goal_bonus (int):
+        Приращения счётчиков, как в increment_statement.
+
+    Логика работы:
+        - Вставка выполняется в CTE new_log с RETURNING id.
+        - Upsert суточной статистики выполняется во втором изменяющем CTE
+          с RETURNING всех столбцов строки.
+
+    Возвращаемое значение:
+        Select: Запрос, возвращающий log_id и столбцы суточной статистики.
+    """
+    new_log = log_insert.returning(log_insert.table.c.id).cte("new_log")
+    stats = (
+        increment_statement(
+            user_id,
+            stats_date,
+            water_ml=water_ml,
+            kcal_consumed=kcal_consumed,
+            kcal_burned=kcal_burned,
+            water_goal_bonus=water_goal_bonus,
+        )
+        .returning(*DailyStatsModel.__table__.c)
+        .cte("stats")
+    )
+    return select(new_log.c.id.label("log_id"), stats)
+
+def precreate_statement(
+    timezone: str, stats_date: date, active_since: date, weather_since: datetime, now: datetime
+) -> Insert:
+    """
+    Формирует INSERT ... SELECT суточной статистики на дату для всех
+    активных пользователей часового пояса.
+
+    Входные параметры:
+        timezone (str): Часовой пояс пользователей (users.timezone).
+        stats_date (date): Дата создаваемых строк.
+        active_since (date): Пользователь активен, если у него есть
+        суточная статистика не раньше этой даты.
+        weather_since (datetime): Погода города учитывается, только если
+        получена не раньше этого момента.
+        now (datetime): Метка времени создания и обновления строк.
+
+    Логика работы:
+        - Цели рассчитываются в SQL по строке пользователя; цель по воде
+          учитывает температуру из city_weather, как finalize_profile.
+        - Уже существующие строки не изменяются.
+
+    Возвращаемое значение:
+        Insert: Выражение вставки с ON CONFLICT DO NOTHING.
+    """
+    weather_join = (CityWeatherModel.city == UserModel.city) & (
+        CityWeatherModel.fetched_at >= weather_since
+    )
+    source = (
+        select(
+            UserModel.id,
+            literal(stats_date, Date),
+            CityWeatherModel.temperature_c,
+            water_goal_ml_expr(CityWeatherModel.temperature_c),
+            calorie_goal_kcal_expr(),
+            literal(0, Integer),
+            literal(0, Integer),
+            literal(0, Integer),
+            literal(now, DateTime),
+            literal(now, DateTime),
+        )
+        .select_from(UserModel.__table__.outerjoin(CityWeatherModel, weather_join))
+        .where(UserModel.timezone == timezone, active_user_clause(active_since))
+    )
+    return (
+        pg_insert(DailyStatsModel)
+        .from_select(
+            [
+                "user_id",
+                "date",
+                "temperature_c",
+                "water_goal_ml",
+                "calorie_goal_kcal",
+                "water_logged_ml",
+                "calories_consumed_kcal",
+                "calories_burned_kcal",
+                "created_at",
+                "updated_at",
+            ],
+            source,
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "date"])
+    )
+
+
 class DailyStatsRepositoryImpl(DailyStatsRepository):
     def __init__(self, session: AsyncSession):
         self._session = session
@@ -52,24 +282,62 @@ class DailyStatsRepositoryImpl(DailyStatsRepository):
         self._session.add(model)
 
     async def get(self, user_id: int, date: date) -> DailyStats | None:
-        stmt = select(DailyStatsModel).where(
-            DailyStatsModel.user_id == user_id, DailyStatsModel.date == date
+        stmt = (
+            select(DailyStatsModel)
+            .where(DailyStatsModel.user_id == user_id, DailyStatsModel.date == date)
+            .execution_options(populate_existing=True)
         )
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
         return to_domain(model) if model else None
 
     async def update(self, daily_stats: DailyStats) -> None:
-        stmt = select(DailyStatsModel).where(DailyStatsModel.id == daily_stats.id)
+        """
+        Сохраняет суточную статистику, если строка не менялась с момента чтения.
+
+        Входные параметры:
+            daily_stats (DailyStats): Статистика с версией, прочитанной из базы.
+
+        Логика работы:
+            - Выполняет UPDATE ... WHERE id = :id AND version = :version
+              с увеличением версии, без предварительного чтения и блокировок.
+            - increment тоже увеличивает версию, поэтому перезапись
+              устаревших счётчиков обнаруживается.
+            - При успехе записывает новую версию в daily_stats.version.
+
+        Возвращаемое значение:
+            None.
+
+        Исключения:
+            ConcurrencyConflictError: Если строку успели изменить
+            или удалить параллельно.
+        """
+        stmt = (
+            update(DailyStatsModel)
+            .where(
+                DailyStatsModel.id == daily_stats.id,
+                DailyStatsModel.version == daily_stats.version,
+            )
+            .values(
+                temperature_c=daily_stats.temperature_c,
+                water_goal_ml=daily_stats.water_goal_ml,
+                calorie_goal_kcal=daily_stats.calorie_goal_kcal,
+                water_logged_ml=daily_stats.water_logged_ml,
+                calories_consumed_kcal=daily_stats.calories_consumed_kcal,
+                calories_burned_kcal=daily_stats.calories_burned_kcal,
+                updated_at=daily_stats.updated_at,
+                version=DailyStatsModel.version + 1,
+            )
+            .returning(DailyStatsModel.version)
+            .execution_options(synchronize_session=False)
+        )
         result = await self._session.execute(stmt)
-        model = result.scalar_one()
-        model.temperature_c = daily_stats.temperature_c
-        model.water_goal_ml = daily_stats.water_goal_ml
-        model.calorie_goal_kcal = daily_stats.calorie_goal_kcal
-        model.water_logged_ml = daily_stats.water_logged_ml
-        model.calories_consumed_kcal = daily_stats.calories_consumed_kcal
-        model.calories_burned_kcal = daily_stats.calories_burned_kcal
-        model.updated_at = daily_stats.updated_at
+        version = result.scalar_one_or_none()
+        if version is None:
+            raise ConcurrencyConflictError(
+                f"Daily stats {daily_stats.id} was modified concurrently"
+            )
+        daily_stats.version = version
 
     async def delete(self, daily_stats_id: int) -> None:
         stmt = select(DailyStatsModel).where(DailyStatsModel.id == daily_stats_id)
@@ -79,31 +347,145 @@ class DailyStatsRepositoryImpl(DailyStatsRepository):
             await self._session.delete(model)
 
     async def get_or_create(self, user_id: int, date: date) -> DailyStats:
-        existing = await self.get(user_id, date)
-        if existing:
-            return existing
-        from datetime import datetime
-        model = DailyStatsModel(
-            user_id=user_id,
-            date=date,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+        stats_table = DailyStatsModel.__table__
+        inserted = (
+            insert_from_user(user_id, date, datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=["user_id", "date"])
+            .returning(*stats_table.c)
+            .cte("inserted")
         )
-        user_model = await self._session.get(UserModel, user_id)
-        if user_model:
-            user = user_to_domain(user_model)
-            model.water_goal_ml = user.calculate_water_goal_ml(temperature_c=None)
-            model.calorie_goal_kcal = user.calculate_calorie_goal_kcal()
-        self._session.add(model)
-        await self._session.flush()
-        return to_domain(model)
+        stmt = (
+            select(inserted)
+            .union_all(
+                select(stats_table).where(
+                    stats_table.c.user_id == user_id, stats_table.c.date == date
+                )
+            )
+            .limit(1)
+        )
+        result = await self._session.execute(stmt)
+        row = result.first()
+        if row is not None:
+            return to_domain(row)
+        return await self.get(user_id, date)
+
+    async def increment(
+        self,
+        user_id: int,
+        date: date,
+        water_ml: int = 0,
+        kcal_consumed: int = 0,
+        kcal_burned: int = 0,
+        water_goal_bonus: int = 0,
+    ) -> DailyStats:
+        """
+        Атомарно изменяет счётчики суточной статистики на заданные приращения.
+
+        Входные параметры:
+            user_id (int): Идентификатор пользователя.
+            date (date): Дата суточной статистики.
+            water_ml (int): Приращение выпитой воды в миллилитрах.
+            kcal_consumed (int): Приращение потреблённых калорий.
+            kcal_burned (int): Приращение сожжённых калорий.
+            water_goal_bonus (int): Приращение цели по воде в миллилитрах.
+
+        Логика работы:
+            - Выполняет один INSERT ... ON CONFLICT DO UPDATE с выражениями
+              вида col = col + :delta, поэтому параллельные изменения не теряются.
+            - Если строки ещё нет, создаёт её с целями пользователя
+              и сразу применяет приращения.
+
+        Возвращаемое значение:
+            DailyStats: Суточная статистика после изменения.
+        """
+        stmt = increment_statement(
+            user_id,
+            date,
+            water_ml=water_ml,
+            kcal_consumed=kcal_consumed,
+            kcal_burned=kcal_burned,
+            water_goal_bonus=water_goal_bonus,
+        ).returning(*DailyStatsModel.__table__.c)
+        result = await self._session.execute(stmt)
+        return to_domain(result.one())
+
+    async def precreate_for_timezone(
+        self, timezone: str, stats_date: date, active_since: date, weather_since: datetime
+    ) -> int:
+        stmt = precreate_statement(timezone, stats_date, active_since, weather_since, datetime.utcnow())
+        result = await self._session.execute(stmt)
+        return result.rowcount
 
     async def get_for_user_in_range(self, user_id: int, date_from: date, date_to: date) -> List[DailyStats]:
-        stmt = select(DailyStatsModel).where(
+        stmt = select(*DailyStatsModel.__table__.c).where(
             DailyStatsModel.user_id == user_id,
             DailyStatsModel.date >= date_from,
             DailyStatsModel.date <= date_to
         ).order_by(DailyStatsModel.date)
         result = await self._session.execute(stmt)
-        models = result.scalars().all()
-        return [to_domain(model) for model in models]
\ No newline at end of file
+        return [to_domain(row) for row in result]
+
+    async def get_series_for_user_in_range(
+        self, user_id: int, date_from: date, date_to: date, bucket: str = "day"
+    ) -> DailyStatsSeries:
+        """
+        Возвращает ряд суточной статистики пользователя в колоночном виде.
+
+        Входные параметры:
+            user_id (int): Идентификатор пользователя.
+            date_from (date): Начальная дата диапазона (включительно).
+            date_to (date): Конечная дата диапазона (включительно).
+            bucket (str): Разрешение ряда: "day", "week" или "month".
+
+        Логика работы:
+            - Выбирает только дату и счётчики, без ORM-объектов.
+            - Для "week" и "month" группирует строки по date_trunc(bucket, date)
+              и считает средние за день значения интервала.
+            - Раскладывает строки результата по массивам NumPy:
+              даты — datetime64[D], счётчики — int32.
+
+        Возвращаемое значение:
+            DailyStatsSeries: Ряд, отсортированный по дате. Для недельного
+            и месячного разрешения даты — начала интервалов.
+
+        Исключения:
+            ValueError: Если bucket не поддерживается.
+        """
+        if bucket != "day" and bucket not in AGGREGATION_BUCKETS:
+            raise ValueError(f"Unsupported bucket: {bucket}")
+
+        counters = [getattr(DailyStatsModel, name) for name in SERIES_COUNTERS]
+        if bucket == "day":
+            date_column = DailyStatsModel.date
+            columns = counters
+        else:
+            date_column = cast(
+                func.date_trunc(literal_column(f"'{bucket}'"), DailyStatsModel.date), Date
+            )
+            columns = [cast(func.round(func.avg(column)), Integer) for column in counters]
+
+        stmt = (
+            select(date_column, *columns)
+            .where(
+                DailyStatsModel.user_id == user_id,
+                DailyStatsModel.date >= date_from,
+                DailyStatsModel.date <= date_to,
+            )
+            .order_by(date_column)
+        )
+        if bucket != "day":
+            stmt = stmt.group_by(date_column)
+
+        result = await self._session.execute(stmt)
+        rows = result.all()
+        if not rows:
+            return DailyStatsSeries.empty()
+
+        dates, *counter_values = zip(*rows)
+        return DailyStatsSeries(
+            dates=np.array(dates, dtype="datetime64[D]"),
+            **{
+                name: np.array(values, dtype=np.int32)
+                for name, values in zip(SERIES_COUNTERS, counter_values)
+            },
+        )
\ No newline at end of file
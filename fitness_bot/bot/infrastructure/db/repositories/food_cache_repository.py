@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.entities.food_cache_entry import FoodCacheEntry
+from domain.interfaces.food_cache_repository import FoodCacheRepository
+from infrastructure.db.models import FoodCacheModel
+
+
+def to_domain(model: FoodCacheModel) -> FoodCacheEntry:
+    return FoodCacheEntry(
+        query=model.query,
+        fetched_at=model.fetched_at,
+        expires_at=model.expires_at,
+        food_id=model.food_id,
+        name=model.name,
+        kcal_per_100g=model.kcal_per_100g,
+    )
+
+
+class FoodCacheRepositoryImpl(FoodCacheRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get(self, query: str, now: datetime) -> Optional[FoodCacheEntry]:
+        stmt = select(FoodCacheModel).where(
+            FoodCacheModel.query == query,
+            FoodCacheModel.expires_at > now,
+        )
+        result = await self._session.execute(stmt)
+        model = result.scalar_one_or_none()
+        return to_domain(model) if model else None
+
+    async def upsert(self, entry: FoodCacheEntry) -> None:
+        """
+        Сохраняет запись кэша поиска продукта, заменяя существующую.
+
+        Входные параметры:
+            entry (FoodCacheEntry): Запись кэша с нормализованным запросом.
+
+        Логика работы:
+            - Выполняет INSERT ... ON CONFLICT (query) DO UPDATE одним запросом.
+
+        Возвращаемое значение:
+            None.
+        """
+        values = {
+            "query": entry.query,
+            "food_id": entry.food_id,
+            "name": entry.name,
+            "kcal_per_100g": entry.kcal_per_100g,
+            "fetched_at": entry.fetched_at,
+            "expires_at": entry.expires_at,
+        }
+        stmt = pg_insert(FoodCacheModel).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FoodCacheModel.query],
+            set_={key: stmt.excluded[key] for key in values if key != "query"},
+        )
+        await self._session.execute(stmt)
@@ -1,10 +1,13 @@
 from datetime import date
+from typing import Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
+from domain.entities.daily_stats import DailyStats
 from domain.entities.food_log import FoodLog
 from domain.interfaces.food_log_repository import FoodLogRepository
 from infrastructure.db.models import FoodLogModel
+from .daily_stats_repository import insert_with_increment_statement, to_domain as daily_stats_to_domain
 
 
 def to_domain(model: FoodLogModel) -> FoodLog:
@@ -23,7 +26,7 @@ def to_domain(model: FoodLogModel) -> FoodLog:
     )
 
 
-def to_model(food_log: FoodLog) -> FoodLogModel:
+def to_row(food_log: FoodLog) -> dict:
     kwargs = {
         "user_id": food_log.user_id,
         "date": food_log.date,
@@ -38,7 +41,11 @@ def to_model(food_log: FoodLog) -> FoodLogModel:
     }
     if food_log.id != 0:
         kwargs["id"] = food_log.id
-    return FoodLogModel(**kwargs)
+    return kwargs
+
+
+def to_model(food_log: FoodLog) -> FoodLogModel:
+    return FoodLogModel(**to_row(food_log))
 
 
 class FoodLogRepositoryImpl(FoodLogRepository):
@@ -52,6 +59,35 @@ class FoodLogRepositoryImpl(FoodLogRepository):
         food_log.id = model.id
         return model.id
 
+    async def add_with_stats(self, food_log: FoodLog) -> Tuple[int, DailyStats]:
+        """
+        Сохраняет запись о приёме пищи и обновляет счётчики суточной статистики
+        одним запросом.
+
+        Входные параметры:
+            food_log (FoodLog): Новая запись; её id будет заполнен.
+
+        Логика работы:
+            - Вставляет запись в CTE с RETURNING id.
+            - Во втором изменяющем CTE выполняет upsert суточной статистики
+              за дату записи с приращением счётчиков.
+            - Возвращает идентификатор записи и актуальные суточные итоги.
+
+        Возвращаемое значение:
+            Tuple[int, DailyStats]: Идентификатор записи и суточная статистика
+            после изменения.
+        """
+        stmt = insert_with_increment_statement(
+            insert(FoodLogModel).values(**to_row(food_log)),
+            food_log.user_id,
+            food_log.date,
+            kcal_consumed=int(food_log.kcal_total),
+        )
+        result = await self._session.execute(stmt)
+        row = result.one()
+        food_log.id = row.log_id
+        return row.log_id, daily_stats_to_domain(row)
+
     async def get_by_user_and_date(self, user_id: int, date: date) -> list[FoodLog]:
         stmt = select(FoodLogModel).where(
             FoodLogModel.user_id == user_id, FoodLogModel.date == date
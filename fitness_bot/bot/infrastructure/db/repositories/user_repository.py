@@ -1,9 +1,13 @@
+from datetime import date
+from typing import List
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Integer, case, cast, exists, func, select, update
 
 from domain.entities.user import User
+from domain.exceptions import ConcurrencyConflictError
 from domain.interfaces.user_repository import UserRepository
-from infrastructure.db.models import UserModel
+from infrastructure.db.models import DailyStatsModel, UserModel
 
 
 def to_domain(user_model: UserModel) -> User:
@@ -22,6 +26,7 @@ def to_domain(user_model: UserModel) -> User:
         calorie_goal_kcal_manual=user_model.calorie_goal_kcal_manual,
         water_goal_mode=user_model.water_goal_mode,
         water_goal_ml_manual=user_model.water_goal_ml_manual,
+        version=user_model.version,
     )
 
 
@@ -41,6 +46,74 @@ def to_model(user: User) -> UserModel:
         calorie_goal_kcal_manual=user.calorie_goal_kcal_manual,
         water_goal_mode=user.water_goal_mode,
         water_goal_ml_manual=user.water_goal_ml_manual,
+        version=user.version,
+    )
+
+
+def water_goal_ml_expr(temperature_c: ColumnElement | None = None) -> ColumnElement[int]:
+    """
+    SQL-аналог User.calculate_water_goal_ml для использования в запросах
+    по таблице users.
+
+    Входные параметры:
+        temperature_c (ColumnElement | None): SQL-выражение температуры воздуха.
+        Если не задано, надбавка за жару не учитывается.
+
+    Возвращаемое значение:
+        ColumnElement[int]: Выражение суточной цели по воде в миллилитрах.
+    """
+    auto_goal_ml = (
+        cast(func.trunc(UserModel.weight_kg * 30), Integer)
+        + func.least((UserModel.activity_minutes_per_day // 30) * 500, 3000)
+    )
+    if temperature_c is not None:
+        auto_goal_ml = auto_goal_ml + case((temperature_c > 25, 500), else_=0)
+
+    return case(
+        (
+            (UserModel.water_goal_mode == "manual")
+            & UserModel.water_goal_ml_manual.is_not(None),
+            UserModel.water_goal_ml_manual,
+        ),
+        else_=auto_goal_ml,
+    )
+
+
+def calorie_goal_kcal_expr() -> ColumnElement[int]:
+    """
+    SQL-аналог User.calculate_calorie_goal_kcal для использования в запросах
+    по таблице users.
+
+    Возвращаемое значение:
+        ColumnElement[int]: Выражение суточной цели по калориям в килокалориях.
+    """
+    activity_kcal_bonus = case(
+        (UserModel.activity_minutes_per_day < 30, 200),
+        (UserModel.activity_minutes_per_day <= 60, 300),
+        else_=400,
+    )
+    auto_goal_kcal = cast(
+        func.trunc(
+            10 * UserModel.weight_kg
+            + 6.25 * UserModel.height_cm
+            - 5 * UserModel.age_years
+        ),
+        Integer,
+    ) + activity_kcal_bonus
+
+    return case(
+        (
+            UserModel.calorie_goal_mode != "auto",
+            func.coalesce(UserModel.calorie_goal_kcal_manual, 0),
+        ),
+        else_=auto_goal_kcal,
+    )
+
+
+def active_user_clause(active_since: date) -> ColumnElement[bool]:
+    return exists().where(
+        DailyStatsModel.user_id == UserModel.id,
+        DailyStatsModel.date >= active_since,
     )
 
 
@@ -53,31 +126,81 @@ class UserRepositoryImpl(UserRepository):
         self._session.add(model)
 
     async def get(self, user_id: int) -> User | None:
-        stmt = select(UserModel).where(UserModel.id == user_id)
+        stmt = (
+            select(UserModel)
+            .where(UserModel.id == user_id)
+            .execution_options(populate_existing=True)
+        )
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
         return to_domain(model) if model else None
 
     async def update(self, user: User) -> None:
-        stmt = select(UserModel).where(UserModel.id == user.id)
+        """
+        Сохраняет изменения пользователя, если строка не менялась с момента чтения.
+
+        Входные параметры:
+            user (User): Пользователь с версией, прочитанной из базы.
+
+        Логика работы:
+            - Выполняет UPDATE ... WHERE id = :id AND version = :version
+              с увеличением версии, без предварительного чтения и блокировок.
+            - При успехе записывает новую версию в user.version.
+
+        Возвращаемое значение:
+            None.
+
+        Исключения:
+            ConcurrencyConflictError: Если строку успели изменить
+            или удалить параллельно.
+        """
+        stmt = (
+            update(UserModel)
+            .where(UserModel.id == user.id, UserModel.version == user.version)
+            .values(
+                weight_kg=user.weight_kg,
+                height_cm=user.height_cm,
+                age_years=user.age_years,
+                sex=user.sex,
+                activity_minutes_per_day=user.activity_minutes_per_day,
+                city=user.city,
+                timezone=user.timezone,
+                calorie_goal_mode=user.calorie_goal_mode,
+                calorie_goal_kcal_manual=user.calorie_goal_kcal_manual,
+                water_goal_mode=user.water_goal_mode,
+                water_goal_ml_manual=user.water_goal_ml_manual,
+                updated_at=user.updated_at,
+                version=UserModel.version + 1,
+            )
+            .returning(UserModel.version)
+            .execution_options(synchronize_session=False)
+        )
         result = await self._session.execute(stmt)
-        model = result.scalar_one()
-        model.weight_kg = user.weight_kg
-        model.height_cm = user.height_cm
-        model.age_years = user.age_years
-        model.sex = user.sex
-        model.activity_minutes_per_day = user.activity_minutes_per_day
-        model.city = user.city
-        model.timezone = user.timezone
-        model.calorie_goal_mode = user.calorie_goal_mode
-        model.calorie_goal_kcal_manual = user.calorie_goal_kcal_manual
-        model.water_goal_mode = user.water_goal_mode
-        model.water_goal_ml_manual = user.water_goal_ml_manual
-        model.updated_at = user.updated_at
+        version = result.scalar_one_or_none()
+        if version is None:
+            raise ConcurrencyConflictError(f"User {user.id} was modified concurrently")
+        user.version = version
 
     async def delete(self, user_id: int) -> None:
         stmt = select(UserModel).where(UserModel.id == user_id)
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
         if model:
-            await self._session.delete(model)
\ No newline at end of file
+            await self._session.delete(model)
+
+    async def get_timezones(self) -> List[str]:
+        result = await self._session.execute(select(UserModel.timezone).distinct())
+        return [timezone for timezone in result.scalars() if timezone]
+
+    async def get_active_cities(self, timezone: str, active_since: date) -> List[str]:
+        stmt = (
+            select(UserModel.city)
+            .where(
+                UserModel.timezone == timezone,
+                UserModel.city != "",
+                active_user_clause(active_since),
+            )
+            .distinct()
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars())
@@ -1,10 +1,16 @@
-from datetime import date
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import BigInteger, Date, Integer, column, func, insert, literal, select, text, values
+from sqlalchemy.dialects.postgresql import Insert, insert as pg_insert
 
+from domain.entities.daily_stats import DailyStats
 from domain.entities.water_log import WaterLog
 from domain.interfaces.water_log_repository import WaterLogRepository
-from infrastructure.db.models import WaterLogModel
+from infrastructure.db.models import DailyStatsModel, UserModel, WaterLogModel
+from .daily_stats_repository import insert_with_increment_statement, to_domain as daily_stats_to_domain
+from .user_repository import calorie_goal_kcal_expr, water_goal_ml_expr
 
 
 def to_domain(model: WaterLogModel) -> WaterLog:
@@ -17,7 +23,7 @@ def to_domain(model: WaterLogModel) -> WaterLog:
     )
 
 
-def to_model(water_log: WaterLog) -> WaterLogModel:
+def to_row(water_log: WaterLog) -> dict:
     kwargs = {
         "user_id": water_log.user_id,
         "date": water_log.date,
@@ -26,7 +32,76 @@ def to_model(water_log: WaterLog) -> WaterLogModel:
     }
     if water_log.id != 0:
         kwargs["id"] = water_log.id
-    return WaterLogModel(**kwargs)
+    return kwargs
+
+
+def to_model(water_log: WaterLog) -> WaterLogModel:
+    return WaterLogModel(**to_row(water_log))
+
+
+def grouped_water_increment_statement(
+    totals: Dict[Tuple[int, date], int], now: datetime
+) -> Insert:
+    """
+    Формирует один upsert суточной статистики для нескольких пар
+    (пользователь, дата) с суммарными приращениями выпитой воды.
+
+    Входные параметры:
+        totals (Dict[Tuple[int, date], int]): Сумма миллилитров по паре
+        (user_id, date).
+        now (datetime): Метка времени создания и обновления строк.
+
+    Логика работы:
+        - Приращения передаются списком VALUES и соединяются с users
+          для расчёта целей новых строк, как в insert_from_user.
+        - Строки упорядочены по ключу, чтобы параллельные пакеты
+          блокировали их в одном порядке.
+        - При конфликте к счётчику прибавляется EXCLUDED.water_logged_ml,
+          версия строки увеличивается.
+
+    Возвращаемое значение:
+        Insert: Выражение INSERT ... SELECT ... ON CONFLICT DO UPDATE без RETURNING.
+    """
+    deltas = values(
+        column("user_id", BigInteger),
+        column("date", Date),
+        column("ml", Integer),
+        name="deltas",
+    ).data([(user_id, stats_date, ml) for (user_id, stats_date), ml in sorted(totals.items())])
+    source = select(
+        deltas.c.user_id,
+        deltas.c.date,
+        func.coalesce(water_goal_ml_expr(), 0),
+        func.coalesce(calorie_goal_kcal_expr(), 0),
+        deltas.c.ml,
+        literal(0, Integer),
+        literal(0, Integer),
+        literal(now),
+        literal(now),
+    ).select_from(deltas.outerjoin(UserModel, UserModel.id == deltas.c.user_id))
+    stmt = pg_insert(DailyStatsModel).from_select(
+        [
+            "user_id",
+            "date",
+            "water_goal_ml",
+            "calorie_goal_kcal",
+            "water_logged_ml",
+            "calories_consumed_kcal",
+            "calories_burned_kcal",
+            "created_at",
+            "updated_at",
+        ],
+        source,
+    )
+    stats_table = DailyStatsModel.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "date"],
+        set_={
+            "water_logged_ml": stats_table.c.water_logged_ml + stmt.excluded.water_logged_ml,
+            "updated_at": stmt.excluded.updated_at,
+            "version": stats_table.c.version + 1,
+        },
+    )
 
 
 class WaterLogRepositoryImpl(WaterLogRepository):
@@ -40,6 +115,96 @@ class WaterLogRepositoryImpl(WaterLogRepository):
         water_log.id = model.id
         return model.id
 
+    async def add_with_stats(self, water_log: WaterLog) -> Tuple[int, DailyStats]:
+        """
+        Сохраняет запись о воде и обновляет счётчики суточной статистики
+        одним запросом.
+
+        Входные параметры:
+            water_log (WaterLog): Новая запись; её id будет заполнен.
+
+        Логика работы:
+            - Вставляет запись в CTE с RETURNING id.
+            - Во втором изменяющем CTE выполняет upsert суточной статистики
+              за дату записи с приращением счётчиков.
+            - Возвращает идентификатор записи и актуальные суточные итоги.
+
+        Возвращаемое значение:
+            Tuple[int, DailyStats]: Идентификатор записи и суточная статистика
+            после изменения.
+        """
+        stmt = insert_with_increment_statement(
+            insert(WaterLogModel).values(**to_row(water_log)),
+            water_log.user_id,
+            water_log.date,
+            water_ml=water_log.ml,
+        )
+        result = await self._session.execute(stmt)
+        row = result.one()
+        water_log.id = row.log_id
+        return row.log_id, daily_stats_to_domain(row)
+
+    async def add_many_with_stats(
+        self, water_logs: Sequence[WaterLog], synchronous_commit: bool = True
+    ) -> List[Tuple[int, DailyStats]]:
+        """
+        Сохраняет пакет записей о воде разных пользователей и обновляет
+        их суточную статистику в текущей транзакции.
+
+        Входные параметры:
+            water_logs (Sequence[WaterLog]): Новые записи; их id будут заполнены.
+            synchronous_commit (bool): Если False, транзакция фиксируется
+            без ожидания записи WAL на диск (SET LOCAL synchronous_commit = off):
+            при сбое сервера можно потерять последние пакеты, но не нарушить
+            целостность.
+
+        Логика работы:
+            - Вставляет все записи одним многострочным INSERT ... RETURNING
+              и сопоставляет идентификаторы с записями по содержимому строки.
+            - Суммирует объёмы по паре (пользователь, дата) и обновляет
+              суточную статистику одним групповым upsert.
+
+        Возвращаемое значение:
+            List[Tuple[int, DailyStats]]: Для каждой записи в исходном порядке —
+            её идентификатор и суточная статистика после всего пакета.
+        """
+        if not water_logs:
+            return []
+        if not synchronous_commit:
+            await self._session.execute(text("SET LOCAL synchronous_commit = off"))
+
+        inserted = await self._session.execute(
+            insert(WaterLogModel)
+            .values([to_row(water_log) for water_log in water_logs])
+            .returning(
+                WaterLogModel.id,
+                WaterLogModel.user_id,
+                WaterLogModel.logged_at,
+                WaterLogModel.ml,
+            )
+        )
+        ids_by_row: Dict[tuple, List[int]] = defaultdict(list)
+        for row in inserted:
+            ids_by_row[(row.user_id, row.logged_at, row.ml)].append(row.id)
+
+        totals: Dict[Tuple[int, date], int] = defaultdict(int)
+        for water_log in water_logs:
+            water_log.id = ids_by_row[(water_log.user_id, water_log.logged_at, water_log.ml)].pop()
+            totals[(water_log.user_id, water_log.date)] += water_log.ml
+
+        stats_result = await self._session.execute(
+            grouped_water_increment_statement(totals, datetime.utcnow()).returning(
+                *DailyStatsModel.__table__.c
+            )
+        )
+        stats_by_key = {
+            (row.user_id, row.date): daily_stats_to_domain(row) for row in stats_result
+        }
+        return [
+            (water_log.id, stats_by_key[(water_log.user_id, water_log.date)])
+            for water_log in water_logs
+        ]
+
     async def get_by_user_and_date(self, user_id: int, date: date) -> list[WaterLog]:
         stmt = select(WaterLogModel).where(
             WaterLogModel.user_id == user_id, WaterLogModel.date == date
@@ -1,10 +1,13 @@
 from datetime import date
+from typing import Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
+from domain.entities.daily_stats import DailyStats
 from domain.entities.workout_log import WorkoutLog
 from domain.interfaces.workout_log_repository import WorkoutLogRepository
 from infrastructure.db.models import WorkoutLogModel
+from .daily_stats_repository import insert_with_increment_statement, to_domain as daily_stats_to_domain
 
 
 def to_domain(model: WorkoutLogModel) -> WorkoutLog:
@@ -20,7 +23,7 @@ def to_domain(model: WorkoutLogModel) -> WorkoutLog:
     )
 
 
-def to_model(workout_log: WorkoutLog) -> WorkoutLogModel:
+def to_row(workout_log: WorkoutLog) -> dict:
     kwargs = {
         "user_id": workout_log.user_id,
         "date": workout_log.date,
@@ -32,7 +35,11 @@ def to_model(workout_log: WorkoutLog) -> WorkoutLogModel:
     }
     if workout_log.id != 0:
         kwargs["id"] = workout_log.id
-    return WorkoutLogModel(**kwargs)
+    return kwargs
+
+
+def to_model(workout_log: WorkoutLog) -> WorkoutLogModel:
+    return WorkoutLogModel(**to_row(workout_log))
 
 
 class WorkoutLogRepositoryImpl(WorkoutLogRepository):
@@ -46,6 +53,36 @@ class WorkoutLogRepositoryImpl(WorkoutLogRepository):
         workout_log.id = model.id
         return model.id
 
+    async def add_with_stats(self, workout_log: WorkoutLog) -> Tuple[int, DailyStats]:
+        """
+        Сохраняет запись о тренировке и обновляет счётчики суточной статистики
+        одним запросом.
+
+        Входные параметры:
+            workout_log (WorkoutLog): Новая запись; её id будет заполнен.
+
+        Логика работы:
+            - Вставляет запись в CTE с RETURNING id.
+            - Во втором изменяющем CTE выполняет upsert суточной статистики
+              за дату записи с приращением счётчиков.
+            - Возвращает идентификатор записи и актуальные суточные итоги.
+
+        Возвращаемое значение:
+            Tuple[int, DailyStats]: Идентификатор записи и суточная статистика
+            после изменения.
+        """
+        stmt = insert_with_increment_statement(
+            insert(WorkoutLogModel).values(**to_row(workout_log)),
+            workout_log.user_id,
+            workout_log.date,
+            kcal_burned=int(workout_log.kcal_burned),
+            water_goal_bonus=workout_log.water_bonus_ml,
+        )
+        result = await self._session.execute(stmt)
+        row = result.one()
+        workout_log.id = row.log_id
+        return row.log_id, daily_stats_to_domain(row)
+
     async def get_by_user_and_date(self, user_id: int, date: date) -> list[WorkoutLog]:
         stmt = select(WorkoutLogModel).where(
             WorkoutLogModel.user_id == user_id, WorkoutLogModel.date == date
@@ -1,78 +1,148 @@
+import logging
+import time
+from typing import Callable, List, Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.interfaces.unit_of_work import UnitOfWork
+from infrastructure.db.replica_router import ReplicaRouter
 from infrastructure.db.repositories.user_repository import UserRepositoryImpl
 from infrastructure.db.repositories.daily_stats_repository import DailyStatsRepositoryImpl
 from infrastructure.db.repositories.food_log_repository import FoodLogRepositoryImpl
 from infrastructure.db.repositories.workout_log_repository import WorkoutLogRepositoryImpl
 from infrastructure.db.repositories.water_log_repository import WaterLogRepositoryImpl
+from infrastructure.db.repositories.food_cache_repository import FoodCacheRepositoryImpl
+from infrastructure.db.repositories.city_weather_repository import CityWeatherRepositoryImpl
+
+logger = logging.getLogger(__name__)
 
 
 class SqlAlchemyUnitOfWork(UnitOfWork):
-    def __init__(self, session_factory):
+    _commit_listeners: List[Callable[[Optional[int]], None]] = []
+
+    def __init__(
+        self,
+        session_factory,
+        read_only: bool = False,
+        user_id: Optional[int] = None,
+        on_release: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Инициализирует единицу работы поверх фабрики сессий SQLAlchemy.
+
+        Входные параметры:
+            session_factory: Фабрика асинхронных сессий
+            или ReplicaRouter для чтения с реплик.
+            read_only (bool): Режим только для чтения. В этом режиме
+            фиксация транзакции не выполняется, а фабрику следует брать
+            из ReadSessionFactory (движок с автокоммитом и read only).
+            user_id (Optional[int]): Пользователь, от имени которого
+            выполняется работа. Используется для выбора реплики
+            и передаётся слушателям фиксации.
+            on_release (Optional[Callable[[float], None]]): Получает время
+            в секундах, в течение которого была открыта сессия, после
+            каждого выхода из async with.
+
+        Логика работы:
+            - Репозитории создаются лениво при первом обращении к свойству.
+            - Сессия основного сервера берёт соединение из пула только
+              при первом запросе и возвращает его при выходе из async with.
+            - Экземпляр можно использовать в нескольких последовательных
+              блоках async with; каждый блок открывает свою сессию.
+            - После успешной фиксации вызываются зарегистрированные слушатели.
+
+        Возвращаемое значение:
+            None.
+        """
         self.session_factory = session_factory
+        self.read_only = read_only
+        self.user_id = user_id
         self._session: AsyncSession | None = None
-        self._users: UserRepositoryImpl | None = None
-        self._daily_stats: DailyStatsRepositoryImpl | None = None
-        self._food_logs: FoodLogRepositoryImpl | None = None
-        self._workout_logs: WorkoutLogRepositoryImpl | None = None
-        self._water_logs: WaterLogRepositoryImpl | None = None
+        self._repositories: dict = {}
         self._entered: bool = False
+        self._on_release = on_release
+        self._entered_at = 0.0
+
+    @classmethod
+    def add_commit_listener(cls, listener: Callable[[Optional[int]], None]) -> None:
+        cls._commit_listeners.append(listener)
+
+    @classmethod
+    def notify_commit(cls, user_id: Optional[int]) -> None:
+        for listener in cls._commit_listeners:
+            try:
+                listener(user_id)
+            except Exception:
+                logger.exception("Commit listener failed")
+
+    def _repository(self, repository_cls):
+        if not self._entered:
+            raise RuntimeError("UnitOfWork not entered. Use async with.")
+        repository = self._repositories.get(repository_cls)
+        if repository is None:
+            repository = repository_cls(self._session)
+            self._repositories[repository_cls] = repository
+        return repository
 
     @property
     def users(self) -> "UserRepositoryImpl":
-        if self._users is None:
-            raise RuntimeError("UnitOfWork not entered. Use async with.")
-        return self._users
+        return self._repository(UserRepositoryImpl)
 
     @property
     def daily_stats(self) -> "DailyStatsRepositoryImpl":
-        if self._daily_stats is None:
-            raise RuntimeError("UnitOfWork not entered. Use async with.")
-        return self._daily_stats
+        return self._repository(DailyStatsRepositoryImpl)
 
     @property
     def food_logs(self) -> "FoodLogRepositoryImpl":
-        if self._food_logs is None:
-            raise RuntimeError("UnitOfWork not entered. Use async with.")
-        return self._food_logs
+        return self._repository(FoodLogRepositoryImpl)
 
     @property
     def workout_logs(self) -> "WorkoutLogRepositoryImpl":
-        if self._workout_logs is None:
-            raise RuntimeError("UnitOfWork not entered. Use async with.")
-        return self._workout_logs
+        return self._repository(WorkoutLogRepositoryImpl)
 
     @property
     def water_logs(self) -> "WaterLogRepositoryImpl":
-        if self._water_logs is None:
-            raise RuntimeError("UnitOfWork not entered. Use async with.")
-        return self._water_logs
+        return self._repository(WaterLogRepositoryImpl)
+
+    @property
+    def food_cache(self) -> "FoodCacheRepositoryImpl":
+        return self._repository(FoodCacheRepositoryImpl)
+
+    @property
+    def city_weather(self) -> "CityWeatherRepositoryImpl":
+        return self._repository(CityWeatherRepositoryImpl)
 
     async def __aenter__(self) -> "SqlAlchemyUnitOfWork":
         if self._entered:
             raise RuntimeError("UnitOfWork already entered. Do not nest async with.")
-        self._session = self.session_factory()
-        self._users = UserRepositoryImpl(self._session)
-        self._daily_stats = DailyStatsRepositoryImpl(self._session)
-        self._food_logs = FoodLogRepositoryImpl(self._session)
-        self._workout_logs = WorkoutLogRepositoryImpl(self._session)
-        self._water_logs = WaterLogRepositoryImpl(self._session)
+        if isinstance(self.session_factory, ReplicaRouter):
+            self._session = self.session_factory.open_session(self.user_id)
+        else:
+            self._session = self.session_factory()
+        self._repositories = {}
         self._entered = True
+        self._entered_at = time.perf_counter()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        if exc_type is not None:
-            await self.rollback()
-        else:
-            await self.commit()
-        await self._session.close()
-        self._entered = False
+        try:
+            if exc_type is not None:
+                await self.rollback()
+            else:
+                await self.commit()
+        finally:
+            await self._session.close()
+            self._session = None
+            self._repositories = {}
+            self._entered = False
+            if self._on_release is not None:
+                self._on_release(time.perf_counter() - self._entered_at)
 
     async def commit(self) -> None:
-        if self._session:
+        if self._session and not self.read_only:
             await self._session.commit()
+            self.notify_commit(self.user_id)
 
     async def rollback(self) -> None:
-        if self._session:
-            await self._session.rollback()
\ No newline at end of file
+        if self._session and not self.read_only:
+            await self._session.rollback()
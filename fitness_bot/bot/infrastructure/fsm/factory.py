@@ -0,0 +1,42 @@
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder
+
+from config.settings import settings
+from infrastructure.config.database import AsyncSessionFactory
+from infrastructure.fsm.lru_storage import LruMemoryStorage
+from infrastructure.fsm.postgres_storage import PostgresStorage
+from infrastructure.metrics import metrics
+
+
+def build_fsm_storage() -> BaseStorage:
+    """
+    Создаёт хранилище FSM, выбранное в настройках.
+
+    Логика работы:
+        - memory: LRU в памяти процесса, ограниченное FSM_MEMORY_MAX_KEYS.
+        - postgres: таблица fsm_storage в основной базе данных.
+        - redis: RedisStorage aiogram, подходит любой сервер с протоколом
+          Redis (Redis, Valkey, локальная замена для тестов).
+        - Во всех вариантах сессия удаляется через FSM_TTL_S без записи.
+
+    Возвращаемое значение:
+        BaseStorage: Хранилище для Dispatcher.
+    """
+    if settings.FSM_STORAGE == "postgres":
+        storage = PostgresStorage(AsyncSessionFactory, ttl_s=settings.FSM_TTL_S)
+        metrics.register("fsm_storage", storage.snapshot)
+        return storage
+
+    if settings.FSM_STORAGE == "redis":
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        ttl_s = int(settings.FSM_TTL_S)
+        return RedisStorage.from_url(
+            settings.REDIS_URL,
+            key_builder=DefaultKeyBuilder(with_destiny=True),
+            state_ttl=ttl_s,
+            data_ttl=ttl_s,
+        )
+
+    storage = LruMemoryStorage(max_keys=settings.FSM_MEMORY_MAX_KEYS, ttl_s=settings.FSM_TTL_S)
+    metrics.register("fsm_storage", storage.snapshot)
+    return storage
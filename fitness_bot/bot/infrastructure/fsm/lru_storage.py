@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Optional, Tuple
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorageRecord
+
+
+class LruMemoryStorage(BaseStorage):
+    def __init__(
+        self,
+        max_keys: int,
+        ttl_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Инициализирует хранилище FSM в памяти процесса с ограничением размера.
+
+        Входные параметры:
+            max_keys (int): Максимальное число хранимых пользователей/чатов.
+            ttl_s (float): Через сколько секунд без записи сессия удаляется.
+            clock (Callable[[], float]): Источник монотонного времени.
+
+        Логика работы:
+            - Записи хранятся в порядке последнего обращения, при переполнении
+              удаляется самая давняя.
+            - Запись с истёкшим сроком считается пустой.
+            - Чтение не создаёт записей, пустые записи удаляются сразу.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.max_keys = max_keys
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._records: "OrderedDict[StorageKey, Tuple[float, MemoryStorageRecord]]" = OrderedDict()
+        self.stats = {"evictions": 0, "expirations": 0}
+
+    def _get(self, key: StorageKey) -> Optional[MemoryStorageRecord]:
+        cached = self._records.get(key)
+        if cached is None:
+            return None
+        expires_at, record = cached
+        if expires_at <= self._clock():
+            del self._records[key]
+            self.stats["expirations"] += 1
+            return None
+        self._records.move_to_end(key)
+        return record
+
+    def _put(self, key: StorageKey, record: MemoryStorageRecord) -> None:
+        if record.state is None and not record.data:
+            self._records.pop(key, None)
+            return
+        self._records[key] = (self._clock() + self.ttl_s, record)
+        self._records.move_to_end(key)
+        while len(self._records) > self.max_keys:
+            self._records.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = self._get(key) or MemoryStorageRecord()
+        record.state = state.state if isinstance(state, State) else state
+        self._put(key, record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = self._get(key)
+        return record.state if record else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+        record = self._get(key) or MemoryStorageRecord()
+        record.data = data.copy()
+        self._put(key, record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        record = self._get(key)
+        return record.data.copy() if record else {}
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "keys": len(self._records)}
+
+    async def close(self) -> None:
+        self._records.clear()
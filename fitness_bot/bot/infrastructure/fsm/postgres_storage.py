@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from sqlalchemy import case, delete, literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infrastructure.db.models import FsmStorageModel
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresStorage(BaseStorage):
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        ttl_s: float,
+        key_builder: Optional[KeyBuilder] = None,
+    ):
+        """
+        Инициализирует хранилище FSM в таблице fsm_storage.
+
+        Входные параметры:
+            session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий
+            основной базы данных.
+            ttl_s (float): Через сколько секунд без записи сессия считается истёкшей.
+            key_builder (Optional[KeyBuilder]): Построитель ключа записи.
+
+        Логика работы:
+            - Состояние и данные пользователя хранятся в одной строке,
+              данные — в колонке JSONB.
+            - Каждая запись выполняется одним INSERT ... ON CONFLICT DO UPDATE
+              и продлевает срок жизни строки.
+            - Строки с истёкшим сроком не читаются и удаляются purge_expired().
+
+        Возвращаемое значение:
+            None.
+        """
+        self.session_factory = session_factory
+        self.ttl_s = ttl_s
+        self.key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+        self.stats = {"reads": 0, "writes": 0, "purged": 0}
+
+    async def _upsert(self, key: StorageKey, column: str, value: Any) -> None:
+        now = datetime.utcnow()
+        expired = FsmStorageModel.expires_at <= now
+        values = {
+            "key": self.key_builder.build(key),
+            "state": None,
+            "data": {},
+            "updated_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl_s),
+            column: value,
+        }
+        stmt = pg_insert(FsmStorageModel).values(**values)
+        if column == "state":
+            stale = {"data": case((expired, literal({}, JSONB)), else_=FsmStorageModel.data)}
+        else:
+            stale = {"state": case((expired, None), else_=FsmStorageModel.state)}
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FsmStorageModel.key],
+            set_={
+                column: stmt.excluded[column],
+                "updated_at": stmt.excluded.updated_at,
+                "expires_at": stmt.excluded.expires_at,
+                **stale,
+            },
+        )
+        async with self.session_factory() as session, session.begin():
+            await session.execute(stmt)
+        self.stats["writes"] += 1
+
+    async def _select(self, key: StorageKey, column: str) -> Any:
+        stmt = select(getattr(FsmStorageModel, column)).where(
+            FsmStorageModel.key == self.key_builder.build(key),
+            FsmStorageModel.expires_at > datetime.utcnow(),
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+        self.stats["reads"] += 1
+        return result.scalar_one_or_none()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self._upsert(key, "state", state.state if isinstance(state, State) else state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return await self._select(key, "state")
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+        await self._upsert(key, "data", dict(data))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        data = await self._select(key, "data")
+        return dict(data) if data else {}
+
+    async def purge_expired(self) -> int:
+        """
+        Удаляет строки FSM с истёкшим сроком жизни.
+
+        Возвращаемое значение:
+            int: Число удалённых строк.
+        """
+        stmt = delete(FsmStorageModel).where(FsmStorageModel.expires_at <= datetime.utcnow())
+        async with self.session_factory() as session, session.begin():
+            result = await session.execute(stmt)
+        self.stats["purged"] += result.rowcount
+        return result.rowcount
+
+    async def purge_periodically(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await self.purge_expired()
+            except Exception:
+                logger.exception("Failed to purge expired FSM sessions")
+
+    def snapshot(self) -> dict:
+        return dict(self.stats)
+
+    async def close(self) -> None:
+        pass
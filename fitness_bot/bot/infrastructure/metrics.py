@@ -0,0 +1,46 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Инициализирует реестр поставщиков метрик процесса.
+
+        Логика работы:
+            - Хранит именованные функции, возвращающие текущие значения метрик.
+
+        Возвращаемое значение:
+            None.
+        """
+        self._providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+        self._providers[name] = provider
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Собирает текущие значения всех зарегистрированных метрик.
+
+        Возвращаемое значение:
+            Dict[str, Dict[str, Any]]: Значения метрик, сгруппированные
+            по имени поставщика.
+        """
+        result: Dict[str, Dict[str, Any]] = {}
+        for name, provider in self._providers.items():
+            try:
+                result[name] = provider()
+            except Exception:
+                logger.exception("Metrics provider %s failed", name)
+        return result
+
+    async def log_periodically(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            logger.info("metrics %s", self.snapshot())
+
+
+metrics = MetricsRegistry()
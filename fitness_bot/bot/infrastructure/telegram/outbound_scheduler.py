@@ -0,0 +1,226 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+outbound_priority: ContextVar[int] = ContextVar("outbound_priority", default=PRIORITY_INTERACTIVE)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def delay(self, now: float) -> float:
+        self._refill(now)
+        wait = max(0.0, self.updated_at - now)
+        if self.tokens < 1:
+            wait += (1 - self.tokens) / self.rate
+        return wait
+
+    def reserve(self, now: float) -> float:
+        wait = self.delay(now)
+        self.tokens -= 1
+        return wait
+
+    def block(self, now: float, seconds: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.tokens + 1, 1.0)
+        self.updated_at = max(self.updated_at, now + seconds)
+
+    def is_idle(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity and self.updated_at <= now
+
+
+class OutboundScheduler(BaseRequestMiddleware):
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        chat_burst: float,
+        max_retries: int = 3,
+        max_tracked_chats: int = 10000,
+        global_penalty_chats: int = 3,
+        global_penalty_window_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Инициализирует планировщик исходящих запросов к Bot API.
+
+        Входные параметры:
+            global_rate (float): Допустимое число сообщений в секунду на бота.
+            chat_rate (float): Допустимое число сообщений в секунду в один чат.
+            chat_burst (float): Сколько сообщений в чат можно отправить подряд.
+            max_retries (int): Сколько раз повторять запрос после 429.
+            max_tracked_chats (int): Порог числа корзин чатов, после которого
+            простаивающие корзины удаляются.
+            global_penalty_chats (int): Сколько разных чатов должны получить 429
+            за global_penalty_window_s, чтобы пауза применилась ко всему боту.
+            global_penalty_window_s (float): Окно подсчёта 429 разных чатов.
+            clock (Callable[[], float]): Источник монотонного времени.
+
+        Логика работы:
+            - Подключается к сессии бота через bot.session.middleware().
+            - Ограничивает только методы, адресованные чату (есть chat_id);
+              answerCallbackQuery, getMe и подобные проходят без очереди.
+            - Сначала ожидает место в корзине чата, затем глобальную корзину.
+            - Глобальные места выдаются по приоритету из outbound_priority:
+              интерактивные ответы раньше фоновых (PRIORITY_BACKGROUND),
+              внутри приоритета — по порядку поступления.
+            - На TelegramRetryAfter блокирует на retry_after корзину чата
+              и повторяет запрос. Глобальная корзина блокируется, только если
+              429 за короткое окно получили несколько разных чатов: ограничение
+              одного чата не должно останавливать ответы остальным.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.max_tracked_chats = max_tracked_chats
+        self._clock = clock
+        self._global = TokenBucket(global_rate, global_rate, clock())
+        self._chats: Dict[int, TokenBucket] = {}
+        self.global_penalty_chats = global_penalty_chats
+        self.global_penalty_window_s = global_penalty_window_s
+        self._recent_flood_chats: Dict[int, float] = {}
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._pump_task: Optional[asyncio.Task] = None
+        self._waiting_for_chat = 0
+        self.stats = {
+            "requests": 0,
+            "bypassed": 0,
+            "delayed": 0,
+            "retry_after": 0,
+            "retry_after_s": 0.0,
+            "global_penalties": 0,
+            "max_wait_s": 0.0,
+        }
+
+    def _chat_bucket(self, chat_id: int, now: float) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= self.max_tracked_chats:
+                self._chats = {
+                    key: value for key, value in self._chats.items() if not value.is_idle(now)
+                }
+            bucket = TokenBucket(self.chat_rate, self.chat_burst, now)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    async def _pump(self) -> None:
+        while self._waiters:
+            wait = self._global.delay(self._clock())
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._global.tokens -= 1
+            future.set_result(None)
+        self._pump_task = None
+
+    async def _acquire_global(self, priority: int) -> None:
+        if not self._waiters and self._global.delay(self._clock()) == 0:
+            self._global.tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._pump_task is None:
+            self._pump_task = asyncio.create_task(self._pump())
+        await future
+
+    async def _acquire(self, chat_id: int, priority: int) -> None:
+        started = self._clock()
+        wait = self._chat_bucket(chat_id, started).reserve(started)
+        if wait > 0:
+            self._waiting_for_chat += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._waiting_for_chat -= 1
+        await self._acquire_global(priority)
+        waited = self._clock() - started
+        if waited > 0.001:
+            self.stats["delayed"] += 1
+            self.stats["max_wait_s"] = max(self.stats["max_wait_s"], waited)
+
+    def _penalize(self, chat_id: int, retry_after: float) -> None:
+        now = self._clock()
+        self._chat_bucket(chat_id, now).block(now, retry_after)
+        self.stats["retry_after"] += 1
+        self.stats["retry_after_s"] += retry_after
+
+        window_start = now - self.global_penalty_window_s
+        self._recent_flood_chats = {
+            key: at for key, at in self._recent_flood_chats.items() if at > window_start
+        }
+        self._recent_flood_chats[chat_id] = now
+        if len(self._recent_flood_chats) >= self.global_penalty_chats:
+            self._global.block(now, retry_after)
+            self.stats["global_penalties"] += 1
+            self._recent_flood_chats.clear()
+            logger.warning(
+                "Telegram flood control in several chats, pausing all sends for %ss", retry_after
+            )
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if not isinstance(chat_id, int):
+            self.stats["bypassed"] += 1
+            return await make_request(bot, method)
+
+        priority = outbound_priority.get()
+        self.stats["requests"] += 1
+        attempt = 0
+        while True:
+            await self._acquire(chat_id, priority)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as exc:
+                self._penalize(chat_id, exc.retry_after)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                logger.warning(
+                    "Telegram flood control for chat %s, retrying in %ss", chat_id, exc.retry_after
+                )
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "global_queue": len(self._waiters),
+            "chat_queue": self._waiting_for_chat,
+            "tracked_chats": len(self._chats),
+        }
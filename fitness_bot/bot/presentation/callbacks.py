@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.fsm.state import State
+from aiogram.types import CallbackQuery
+
+DEFAULT_PARENT_CONTEXT = "main_menu"
+
+
+@dataclass(frozen=True)
+class MenuCallback:
+    action: str
+    arg: Optional[str] = None
+    value: Any = None
+    parent_context: str = DEFAULT_PARENT_CONTEXT
+
+    def pack(self) -> str:
+        parts = [self.action]
+        if self.arg is not None:
+            parts.append(self.arg)
+        parts.append(self.parent_context)
+        return ":".join(parts)
+
+
+@dataclass(frozen=True)
+class CallbackRoute:
+    action: str
+    handler: CallableObject
+    with_arg: bool = False
+    value: Any = None
+    state: Optional[str] = None
+
+    def parse(self, data: str) -> MenuCallback:
+        parts = data.split(":")
+        arg = None
+        parent_index = 1
+        if self.with_arg:
+            arg = parts[1] if len(parts) > 1 else None
+            parent_index = 2
+        parent_context = parts[parent_index] if len(parts) > parent_index else ""
+        return MenuCallback(
+            action=self.action,
+            arg=arg,
+            value=self.value,
+            parent_context=parent_context or DEFAULT_PARENT_CONTEXT,
+        )
+
+
+class CallbackDispatcher:
+    def __init__(self):
+        """
+        Инициализирует таблицу разбора и маршрутизации callback_data.
+
+        Логика работы:
+            - Формат callback_data: "действие[:аргумент][:parent_context]".
+            - Обработчик выбирается по действию (часть до первого ":")
+              поиском в словаре, без перебора фильтров.
+            - Строка разбирается один раз, обработчик получает готовый
+              MenuCallback в параметре callback_data.
+            - Маршрут может требовать состояние FSM; при несовпадении
+              событие считается необработанным.
+
+        Возвращаемое значение:
+            None.
+        """
+        self._routes: Dict[str, CallbackRoute] = {}
+        self.stats = {"dispatched": 0, "unknown": 0, "state_mismatch": 0}
+
+    def route(
+        self,
+        *actions: str,
+        with_arg: bool = False,
+        values: Optional[Dict[str, Any]] = None,
+        state: Optional[State] = None,
+    ) -> Callable:
+        """
+        Декоратор регистрации обработчика callback-запроса.
+
+        Входные параметры:
+            *actions (str): Действия, которые обрабатывает обработчик.
+            with_arg (bool): Второй сегмент callback_data — аргумент
+            (идентификатор записи, дата), а не parent_context.
+            values (Optional[Dict[str, Any]]): Действия семейства с фиксированным
+            значением каждого (например, "water_250" -> 250), передаётся
+            в MenuCallback.value.
+            state (Optional[State]): Состояние FSM, в котором допустим обработчик.
+
+        Возвращаемое значение:
+            Callable: Декоратор.
+
+        Исключения:
+            ValueError: Если действие уже зарегистрировано.
+        """
+        mapping = dict(values or {})
+        mapping.update({action: None for action in actions})
+
+        def decorator(handler: Callable) -> Callable:
+            callable_object = CallableObject(callback=handler)
+            for action, value in mapping.items():
+                if action in self._routes:
+                    raise ValueError(f"Callback action {action!r} is already registered")
+                self._routes[action] = CallbackRoute(
+                    action=action,
+                    handler=callable_object,
+                    with_arg=with_arg,
+                    value=value,
+                    state=state.state if state is not None else None,
+                )
+            return handler
+
+        return decorator
+
+    async def _dispatch(self, callback: CallbackQuery, **data: Any) -> Any:
+        raw = callback.data or ""
+        route = self._routes.get(raw.split(":", 1)[0])
+        if route is None:
+            self.stats["unknown"] += 1
+            return UNHANDLED
+        if route.state is not None and data.get("raw_state") != route.state:
+            self.stats["state_mismatch"] += 1
+            return UNHANDLED
+
+        self.stats["dispatched"] += 1
+        data["callback_data"] = route.parse(raw)
+        return await route.handler.call(callback, **data)
+
+    def handler_name(self, data: Optional[str]) -> Optional[str]:
+        route = self._routes.get((data or "").split(":", 1)[0])
+        return route.handler.callback.__name__ if route is not None else None
+
+    def router(self) -> Router:
+        router = Router(name="callbacks")
+        router.callback_query.register(self._dispatch)
+        return router
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "routes": len(self._routes)}
+
+
+callbacks = CallbackDispatcher()
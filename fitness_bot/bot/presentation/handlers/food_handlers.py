@@ -9,22 +9,23 @@ from presentation.validators.food import validate_product_name, validate_grams
 from domain.exceptions import ValidationError, EntityNotFoundError
 from presentation.services.menu_manager import replace_menu_message, show_menu, send_menu_new, clear_markup
 from presentation.services.keyboard_mapper import get_callback_data_for_parent_context, get_keyboard_for_parent_context
-from infrastructure.config.database import AsyncSessionFactory
 from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
 from application.use_cases.food.resolve_food_item import resolve_food_item
+from application.services.food_lookup_cache import FoodLookupCache
+from infrastructure.api.food_client import FoodApiError, FoodClient
 from application.use_cases.food.set_food_grams import set_food_grams
 from application.use_cases.food.finalize_food_log import finalize_food_log
 from application.use_cases.food.delete_food_log import delete_food_log
+from presentation.callbacks import MenuCallback, callbacks
 
 router = Router()
 
 
-@router.callback_query(F.data.startswith("food_add"))
-async def callback_food_add(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("food_add")
+async def callback_food_add(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                        
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                        
     await state.update_data(parent_context=parent_context)
@@ -37,12 +38,11 @@ async def callback_food_add(callback: CallbackQuery, state: FSMContext):
         keyboard=None,
     )
 
-@router.callback_query(F.data.startswith("food_reject"))
-async def callback_food_reject(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("food_reject")
+async def callback_food_reject(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                             
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                    
     await state.update_data(
@@ -64,12 +64,11 @@ async def callback_food_reject(callback: CallbackQuery, state: FSMContext):
         keyboard=None,
     )
 
-@router.callback_query(F.data.startswith("food_cancel"))
-async def callback_food_cancel(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("food_cancel")
+async def callback_food_cancel(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                             
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                    
     await state.update_data(
@@ -94,7 +93,12 @@ async def callback_food_cancel(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(FoodLogStates.enter_product_name), F.text)
-async def process_food_input(message: Message, state: FSMContext):
+async def process_food_input(
+    message: Message,
+    state: FSMContext,
+    food_client: FoodClient,
+    food_cache: FoodLookupCache,
+):
     
     product_query = message.text.strip()
 
@@ -106,7 +110,11 @@ async def process_food_input(message: Message, state: FSMContext):
         return
 
                                                               
-    result = await resolve_food_item(product_query)
+    try:
+        result = await resolve_food_item(product_query, food_client, food_cache)
+    except FoodApiError:
+        await message.answer("❌ Сервис поиска продуктов временно недоступен. Попробуйте позже.")
+        return
 
     if result is None:
                                                        
@@ -163,7 +171,7 @@ async def process_food_input(message: Message, state: FSMContext):
 
 
 @router.message(StateFilter(FoodLogStates.enter_grams), F.text)
-async def process_grams_input(message: Message, state: FSMContext):
+async def process_grams_input(message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork):
     
                      
     try:
@@ -196,7 +204,7 @@ async def process_grams_input(message: Message, state: FSMContext):
         grams, kcal_total = set_food_grams(kcal_per_100g, grams)
 
                         
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             log_id = await finalize_food_log(
                 user_id=message.from_user.id,
                 product_query=product_query,
@@ -229,7 +237,7 @@ async def process_grams_input(message: Message, state: FSMContext):
     keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent="main_menu")
                               
     rows = keyboard.inline_keyboard.copy()
-    rows.append([InlineKeyboardButton(text="🗑 Удалить", callback_data=f"delete_food:{log_id}:{parent_context}")])
+    rows.append([InlineKeyboardButton(text="🗑 Удалить", callback_data=MenuCallback("delete_food", arg=str(log_id), parent_context=parent_context).pack())])
     keyboard_with_delete = InlineKeyboardMarkup(inline_keyboard=rows)
 
     await send_menu_new(
@@ -243,19 +251,20 @@ async def process_grams_input(message: Message, state: FSMContext):
     )
 
 
-@router.callback_query(F.data.startswith("delete_food"))
-async def callback_delete_food(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("delete_food", with_arg=True)
+async def callback_delete_food(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, uow: SqlAlchemyUnitOfWork
+):
     
                                                                            
-    parts = callback.data.split(":")
-    if len(parts) < 3:
+    if callback_data.arg is None or not callback_data.arg.isdigit():
         await callback.answer("Неверный формат")
         return
-    log_id = int(parts[1])
-    parent_context = parts[2] if parts[2] != "" else "main_menu"
+    log_id = int(callback_data.arg)
+    parent_context = callback_data.parent_context
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await delete_food_log(log_id, callback.from_user.id, uow)
     except EntityNotFoundError:
         await callback.answer("Запись не найдена")
@@ -1,5 +1,5 @@
 from aiogram import Router, F
-from aiogram.types import CallbackQuery, Message, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import CallbackQuery, Message
 from aiogram.filters import CommandStart, Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import default_state
@@ -11,6 +11,7 @@ from presentation.keyboards.inline import (
     profile_setup_keyboard,
     calorie_goal_mode_keyboard,
     water_goal_mode_keyboard,
+    cancel_input_keyboard,
 )
 from presentation.services.menu_manager import show_menu, replace_menu_message, send_menu_new
 from presentation.services.keyboard_mapper import get_keyboard_for_parent_context, get_callback_data_for_parent_context
@@ -24,7 +25,6 @@ from presentation.validators.profile import (
     validate_water_goal,
 )
 from domain.exceptions import ValidationError
-from infrastructure.config.database import AsyncSessionFactory
 from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
 from application.use_cases.set_profile.start_set_profile import start_set_profile
 from application.use_cases.set_profile.set_weight import set_weight
@@ -37,6 +37,7 @@ from application.use_cases.set_profile.set_calorie_goal_manual import set_calori
 from application.use_cases.set_profile.set_water_goal_mode import set_water_goal_mode
 from application.use_cases.set_profile.set_water_goal_manual import set_water_goal_manual
 from application.use_cases.set_profile.finalize_profile import finalize_profile
+from presentation.callbacks import MenuCallback, callbacks
 
 router = Router()
 
@@ -88,45 +89,45 @@ async def cmd_start(message: Message):
 
 
 @router.message(Command("set_profile"))
-async def cmd_set_profile(message: Message):
+async def cmd_set_profile(message: Message, uow: SqlAlchemyUnitOfWork):
     
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+    async with uow:
         await start_set_profile(message.from_user.id, uow)
         profile_text = await get_formatted_profile_text(message.from_user.id, uow)
-        await message.answer(
-            profile_text,
-            reply_markup=profile_setup_keyboard(parent_context="main_menu"),
-            parse_mode="Markdown",
-        )
+    await message.answer(
+        profile_text,
+        reply_markup=profile_setup_keyboard(parent_context="main_menu"),
+        parse_mode="Markdown",
+    )
 
 
-@router.callback_query(F.data.startswith("profile_setup"))
-async def callback_profile_setup(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("profile_setup")
+async def callback_profile_setup(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, uow: SqlAlchemyUnitOfWork
+):
     
                                                                                                  
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
                                                                                 
     await state.update_data(profile_setup_parent=parent_context)
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+    async with uow:
         await start_set_profile(callback.from_user.id, uow)
         profile_text = await get_formatted_profile_text(callback.from_user.id, uow)
-        await replace_menu_message(
-            message_or_callback=callback,
-            text=profile_text,
-            keyboard=profile_setup_keyboard(parent_context=parent_context),
-            state=state,
-            return_menu=parent_context,
-        )
+    await replace_menu_message(
+        message_or_callback=callback,
+        text=profile_text,
+        keyboard=profile_setup_keyboard(parent_context=parent_context),
+        state=state,
+        return_menu=parent_context,
+    )
 
 
-@router.callback_query(F.data.startswith("profile_set_weight"))
-async def callback_set_weight(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("profile_set_weight")
+async def callback_set_weight(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                                            
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -138,9 +139,7 @@ async def callback_set_weight(callback: CallbackQuery, state: FSMContext):
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -152,7 +151,7 @@ async def callback_set_weight(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(SetProfileStates.set_weight), F.text)
-async def process_weight_input(message: Message, state: FSMContext):
+async def process_weight_input(message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork):
     
                      
     try:
@@ -163,9 +162,7 @@ async def process_weight_input(message: Message, state: FSMContext):
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -177,35 +174,15 @@ async def process_weight_input(message: Message, state: FSMContext):
         return
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await set_weight(message.from_user.id, weight, uow)
-                                                                                    
-            data = await state.get_data()
-            parent_context = data.get("parent_context") or "main_menu"
-            profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
-                                                                      
-            keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-
-            await send_menu_new(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                text=f"✅ Вес сохранён: {weight} кг",
-                keyboard=keyboard,
-                state=state,
-                return_menu=parent_context,
-            )
-            await state.set_state(None)
-                                                              
-            await state.update_data(parent_context=None, profile_setup_parent=None)
     except ValidationError as e:
                                                       
         data = await state.get_data()
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -214,16 +191,33 @@ async def process_weight_input(message: Message, state: FSMContext):
             state=state,
             return_menu=parent_context,
         )
+        return
 
+                                                                            
+    data = await state.get_data()
+    parent_context = data.get("parent_context") or "main_menu"
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
 
+    await send_menu_new(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        text=f"✅ Вес сохранён: {weight} кг",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
+    await state.set_state(None)
+                                                      
+    await state.update_data(parent_context=None, profile_setup_parent=None)
 
 
-@router.callback_query(F.data.startswith("profile_set_height"))
-async def callback_set_height(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("profile_set_height")
+async def callback_set_height(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                                            
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -235,9 +229,7 @@ async def callback_set_height(callback: CallbackQuery, state: FSMContext):
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -249,7 +241,7 @@ async def callback_set_height(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(SetProfileStates.set_height), F.text)
-async def process_height_input(message: Message, state: FSMContext):
+async def process_height_input(message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork):
     
                      
     try:
@@ -260,9 +252,7 @@ async def process_height_input(message: Message, state: FSMContext):
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -274,35 +264,15 @@ async def process_height_input(message: Message, state: FSMContext):
         return
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await set_height(message.from_user.id, height, uow)
-                                                                                    
-            data = await state.get_data()
-            parent_context = data.get("parent_context") or "main_menu"
-            profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
-                                                                      
-            keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-
-            await send_menu_new(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                text=f"✅ Рост сохранён: {height} см",
-                keyboard=keyboard,
-                state=state,
-                return_menu=parent_context,
-            )
-            await state.set_state(None)
-                                                              
-            await state.update_data(parent_context=None, profile_setup_parent=None)
     except ValidationError as e:
                                                       
         data = await state.get_data()
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -311,14 +281,33 @@ async def process_height_input(message: Message, state: FSMContext):
             state=state,
             return_menu=parent_context,
         )
+        return
 
+                                                                            
+    data = await state.get_data()
+    parent_context = data.get("parent_context") or "main_menu"
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
 
-@router.callback_query(F.data.startswith("profile_set_age"))
-async def callback_set_age(callback: CallbackQuery, state: FSMContext):
+    await send_menu_new(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        text=f"✅ Рост сохранён: {height} см",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
+    await state.set_state(None)
+                                                      
+    await state.update_data(parent_context=None, profile_setup_parent=None)
+
+
+@callbacks.route("profile_set_age")
+async def callback_set_age(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                                      
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -330,9 +319,7 @@ async def callback_set_age(callback: CallbackQuery, state: FSMContext):
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -344,7 +331,7 @@ async def callback_set_age(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(SetProfileStates.set_age), F.text)
-async def process_age_input(message: Message, state: FSMContext):
+async def process_age_input(message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork):
     
                      
     try:
@@ -355,9 +342,7 @@ async def process_age_input(message: Message, state: FSMContext):
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -369,35 +354,15 @@ async def process_age_input(message: Message, state: FSMContext):
         return
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await set_age(message.from_user.id, age, uow)
-                                                                                    
-            data = await state.get_data()
-            parent_context = data.get("parent_context") or "main_menu"
-            profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
-                                                                      
-            keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-
-            await send_menu_new(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                text=f"✅ Возраст сохранён: {age} лет",
-                keyboard=keyboard,
-                state=state,
-                return_menu=parent_context,
-            )
-            await state.set_state(None)
-                                                              
-            await state.update_data(parent_context=None, profile_setup_parent=None)
     except ValidationError as e:
                                                       
         data = await state.get_data()
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -406,14 +371,33 @@ async def process_age_input(message: Message, state: FSMContext):
             state=state,
             return_menu=parent_context,
         )
+        return
+
+                                                                            
+    data = await state.get_data()
+    parent_context = data.get("parent_context") or "main_menu"
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+
+    await send_menu_new(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        text=f"✅ Возраст сохранён: {age} лет",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
+    await state.set_state(None)
+                                                      
+    await state.update_data(parent_context=None, profile_setup_parent=None)
 
 
-@router.callback_query(F.data.startswith("profile_set_activity"))
-async def callback_set_activity_minutes(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("profile_set_activity")
+async def callback_set_activity_minutes(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                                                
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -425,9 +409,7 @@ async def callback_set_activity_minutes(callback: CallbackQuery, state: FSMConte
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -439,7 +421,7 @@ async def callback_set_activity_minutes(callback: CallbackQuery, state: FSMConte
 
 
 @router.message(StateFilter(SetProfileStates.set_activity_minutes), F.text)
-async def process_activity_minutes_input(message: Message, state: FSMContext):
+async def process_activity_minutes_input(message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork):
     
                      
     try:
@@ -450,9 +432,7 @@ async def process_activity_minutes_input(message: Message, state: FSMContext):
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -464,35 +444,15 @@ async def process_activity_minutes_input(message: Message, state: FSMContext):
         return
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await set_activity_minutes(message.from_user.id, minutes, uow)
-                                                                                    
-            data = await state.get_data()
-            parent_context = data.get("parent_context") or "main_menu"
-            profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
-                                                                      
-            keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-
-            await send_menu_new(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                text=f"✅ Активность сохранена: {minutes} мин/день",
-                keyboard=keyboard,
-                state=state,
-                return_menu=parent_context,
-            )
-            await state.set_state(None)
-                                                              
-            await state.update_data(parent_context=None, profile_setup_parent=None)
     except ValidationError as e:
                                                       
         data = await state.get_data()
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -501,14 +461,33 @@ async def process_activity_minutes_input(message: Message, state: FSMContext):
             state=state,
             return_menu=parent_context,
         )
+        return
+
+                                                                            
+    data = await state.get_data()
+    parent_context = data.get("parent_context") or "main_menu"
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+
+    await send_menu_new(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        text=f"✅ Активность сохранена: {minutes} мин/день",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
+    await state.set_state(None)
+                                                      
+    await state.update_data(parent_context=None, profile_setup_parent=None)
 
 
-@router.callback_query(F.data.startswith("profile_set_city"))
-async def callback_set_city(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("profile_set_city")
+async def callback_set_city(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                                        
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -520,9 +499,7 @@ async def callback_set_city(callback: CallbackQuery, state: FSMContext):
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -534,7 +511,7 @@ async def callback_set_city(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(SetProfileStates.set_city), F.text)
-async def process_city_input(message: Message, state: FSMContext):
+async def process_city_input(message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork):
     
                 
     try:
@@ -543,32 +520,31 @@ async def process_city_input(message: Message, state: FSMContext):
         await message.answer(f"❌ {e.message}")
         return
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+    async with uow:
         await set_city(message.from_user.id, city, uow)
-                                                                                
-        data = await state.get_data()
-        parent_context = data.get("parent_context") or "main_menu"
-        profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
-                                                                  
-        keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+                                                                            
+    data = await state.get_data()
+    parent_context = data.get("parent_context") or "main_menu"
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
 
-        await send_menu_new(
-            bot=message.bot,
-            chat_id=message.chat.id,
-            text=f"✅ Город сохранён: {city}",
-            keyboard=keyboard,
-            state=state,
-            return_menu=parent_context,
-        )
-        await state.clear()
+    await send_menu_new(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        text=f"✅ Город сохранён: {city}",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
+    await state.clear()
 
 
-@router.callback_query(F.data.startswith("profile_set_calorie_goal"))
-async def callback_set_calorie_goal(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("profile_set_calorie_goal")
+async def callback_set_calorie_goal(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                                                        
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -579,30 +555,32 @@ async def callback_set_calorie_goal(callback: CallbackQuery, state: FSMContext):
     )
 
 
-@router.callback_query(F.data.startswith("calorie_goal_auto"))
-async def callback_calorie_goal_auto(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("calorie_goal_auto")
+async def callback_calorie_goal_auto(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, uow: SqlAlchemyUnitOfWork
+):
     
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+    async with uow:
         await set_calorie_goal_mode(callback.from_user.id, "auto", uow)
 
-        keyboard = profile_setup_keyboard(parent_context=parent_context)
-        await replace_menu_message(
-            message_or_callback=callback,
-            text="✅ Режим цели калорий установлен: авто расчет.",
-            keyboard=keyboard,
-            state=state,
-            return_menu=parent_context,
-        )
+    keyboard = profile_setup_keyboard(parent_context=parent_context)
+    await replace_menu_message(
+        message_or_callback=callback,
+        text="✅ Режим цели калорий установлен: авто расчет.",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
 
 
-@router.callback_query(F.data.startswith("calorie_goal_manual"))
-async def callback_calorie_goal_manual(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("calorie_goal_manual")
+async def callback_calorie_goal_manual(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, uow: SqlAlchemyUnitOfWork
+):
     
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -612,14 +590,12 @@ async def callback_calorie_goal_manual(callback: CallbackQuery, state: FSMContex
     await state.update_data(parent_context=parent_context, profile_setup_parent=profile_setup_parent)
     await state.set_state(SetProfileStates.set_calorie_goal_manual)
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+    async with uow:
         await set_calorie_goal_mode(callback.from_user.id, "manual", uow)
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -630,11 +606,10 @@ async def callback_calorie_goal_manual(callback: CallbackQuery, state: FSMContex
     )
 
 
-@router.callback_query(F.data.startswith("profile_set_water_goal"))
-async def callback_set_water_goal(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("profile_set_water_goal")
+async def callback_set_water_goal(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -645,30 +620,32 @@ async def callback_set_water_goal(callback: CallbackQuery, state: FSMContext):
     )
 
 
-@router.callback_query(F.data.startswith("water_goal_auto"))
-async def callback_water_goal_auto(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("water_goal_auto")
+async def callback_water_goal_auto(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, uow: SqlAlchemyUnitOfWork
+):
     
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+    async with uow:
         await set_water_goal_mode(callback.from_user.id, "auto", uow)
 
-        keyboard = profile_setup_keyboard(parent_context=parent_context)
-        await replace_menu_message(
-            message_or_callback=callback,
-            text="✅ Режим цели по воде установлен: авто расчет.",
-            keyboard=keyboard,
-            state=state,
-            return_menu=parent_context,
-        )
+    keyboard = profile_setup_keyboard(parent_context=parent_context)
+    await replace_menu_message(
+        message_or_callback=callback,
+        text="✅ Режим цели по воде установлен: авто расчет.",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
 
 
-@router.callback_query(F.data.startswith("water_goal_manual"))
-async def callback_water_goal_manual(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("water_goal_manual")
+async def callback_water_goal_manual(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, uow: SqlAlchemyUnitOfWork
+):
     
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -678,14 +655,12 @@ async def callback_water_goal_manual(callback: CallbackQuery, state: FSMContext)
     await state.update_data(parent_context=parent_context, profile_setup_parent=profile_setup_parent)
     await state.set_state(SetProfileStates.set_water_goal_manual)
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+    async with uow:
         await set_water_goal_mode(callback.from_user.id, "manual", uow)
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -697,7 +672,7 @@ async def callback_water_goal_manual(callback: CallbackQuery, state: FSMContext)
 
 
 @router.message(StateFilter(SetProfileStates.set_calorie_goal_manual), F.text)
-async def process_calorie_goal_manual_input(message: Message, state: FSMContext):
+async def process_calorie_goal_manual_input(message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork):
     
                      
     try:
@@ -708,9 +683,7 @@ async def process_calorie_goal_manual_input(message: Message, state: FSMContext)
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -722,35 +695,15 @@ async def process_calorie_goal_manual_input(message: Message, state: FSMContext)
         return
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await set_calorie_goal_manual(message.from_user.id, calories, uow)
-                                                                                    
-            data = await state.get_data()
-            parent_context = data.get("parent_context") or "main_menu"
-            profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
-                                                                      
-            keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-
-            await send_menu_new(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                text=f"✅ Цель по калориям сохранена: {calories} ккал",
-                keyboard=keyboard,
-                state=state,
-                return_menu=parent_context,
-            )
-            await state.set_state(None)
-                                                              
-            await state.update_data(parent_context=None, profile_setup_parent=None)
     except ValidationError as e:
                                                       
         data = await state.get_data()
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -759,10 +712,30 @@ async def process_calorie_goal_manual_input(message: Message, state: FSMContext)
             state=state,
             return_menu=parent_context,
         )
+        return
+
+                                                                            
+    data = await state.get_data()
+    parent_context = data.get("parent_context") or "main_menu"
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+
+    await send_menu_new(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        text=f"✅ Цель по калориям сохранена: {calories} ккал",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
+    await state.set_state(None)
+                                                      
+    await state.update_data(parent_context=None, profile_setup_parent=None)
 
 
 @router.message(StateFilter(SetProfileStates.set_water_goal_manual), F.text)
-async def process_water_goal_manual_input(message: Message, state: FSMContext):
+async def process_water_goal_manual_input(message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork):
     
                      
     try:
@@ -773,9 +746,7 @@ async def process_water_goal_manual_input(message: Message, state: FSMContext):
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -787,35 +758,15 @@ async def process_water_goal_manual_input(message: Message, state: FSMContext):
         return
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await set_water_goal_manual(message.from_user.id, water_ml, uow)
-                                                                                    
-            data = await state.get_data()
-            parent_context = data.get("parent_context") or "main_menu"
-            profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
-                                                                      
-            keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-
-            await send_menu_new(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                text=f"✅ Цель по воде сохранена: {water_ml} мл",
-                keyboard=keyboard,
-                state=state,
-                return_menu=parent_context,
-            )
-            await state.set_state(None)
-                                                              
-            await state.update_data(parent_context=None, profile_setup_parent=None)
     except ValidationError as e:
                                                       
         data = await state.get_data()
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -824,9 +775,29 @@ async def process_water_goal_manual_input(message: Message, state: FSMContext):
             state=state,
             return_menu=parent_context,
         )
+        return
+
+                                                                            
+    data = await state.get_data()
+    parent_context = data.get("parent_context") or "main_menu"
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+
+    await send_menu_new(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        text=f"✅ Цель по воде сохранена: {water_ml} мл",
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
+    await state.set_state(None)
+                                                      
+    await state.update_data(parent_context=None, profile_setup_parent=None)
 
 
-@router.callback_query(F.data == "main_menu")
+@callbacks.route("main_menu")
 async def callback_main_menu(callback: CallbackQuery, state: FSMContext):
     
     await replace_menu_message(
@@ -1,3 +1,5 @@
+from typing import Optional, Tuple
+
 from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.fsm.context import FSMContext
@@ -5,25 +7,35 @@ from aiogram.filters import StateFilter
 
 from presentation.fsm.states import WaterLogStates
 from presentation.validators.water import validate_water_ml
+from domain.entities.daily_stats import DailyStats
 from domain.exceptions import ValidationError, EntityNotFoundError
-from presentation.keyboards.inline import main_menu_keyboard, water_volume_keyboard, profile_setup_keyboard
-from infrastructure.config.database import AsyncSessionFactory
+from presentation.keyboards.inline import main_menu_keyboard, water_volume_keyboard, profile_setup_keyboard, cancel_input_keyboard
 from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
 from application.use_cases.water.log_water import log_water
 from application.use_cases.water.get_water_progress import get_water_progress
 from application.use_cases.water.delete_water_log import delete_water_log
+from application.services.water_write_buffer import WaterWriteBuffer
 from presentation.services.menu_manager import show_menu, replace_menu_message, send_menu_new
 from presentation.services.keyboard_mapper import get_keyboard_for_parent_context, get_callback_data_for_parent_context
+from presentation.callbacks import MenuCallback, callbacks
 
 router = Router()
 
 
-@router.callback_query(F.data.startswith("water_add"))
-async def callback_water_add(callback: CallbackQuery, state: FSMContext):
+async def record_water(
+    user_id: int, volume: int, uow: SqlAlchemyUnitOfWork, water_buffer: Optional[WaterWriteBuffer]
+) -> Tuple[int, DailyStats]:
+    if water_buffer is not None:
+        return await water_buffer.submit(user_id, volume)
+    async with uow:
+        return await log_water(user_id, volume, uow)
+
+
+@callbacks.route("water_add")
+async def callback_water_add(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                          
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -34,11 +46,10 @@ async def callback_water_add(callback: CallbackQuery, state: FSMContext):
     )
 
 
-@router.callback_query(F.data.startswith("water_custom"))
-async def callback_water_custom(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("water_custom")
+async def callback_water_custom(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -50,9 +61,7 @@ async def callback_water_custom(callback: CallbackQuery, state: FSMContext):
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -63,102 +72,93 @@ async def callback_water_custom(callback: CallbackQuery, state: FSMContext):
     )
 
 
-@router.callback_query(F.data.startswith("water_"))
-async def callback_water_volume(callback: CallbackQuery, state: FSMContext):
+@callbacks.route(values={"water_250": 250, "water_500": 500, "water_750": 750, "water_1000": 1000})
+async def callback_water_volume(
+    callback: CallbackQuery,
+    state: FSMContext,
+    callback_data: MenuCallback,
+    uow: SqlAlchemyUnitOfWork,
+    water_buffer: Optional[WaterWriteBuffer],
+):
     
                                                                      
-    parts = callback.data.split(":")
-    volume_key = parts[0]
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
-
-    volume_map = {
-        "water_250": 250,
-        "water_500": 500,
-        "water_750": 750,
-        "water_1000": 1000,
-    }
-    volume = volume_map.get(volume_key)
-    if volume is None:
-        await callback.answer("Неизвестный объём")
-        return
+    volume = callback_data.value
+    parent_context = callback_data.parent_context
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
-        log_id = await log_water(callback.from_user.id, volume, uow)
+    log_id, daily_stats = await record_water(callback.from_user.id, volume, uow, water_buffer)
 
-                                       
-        progress = await get_water_progress(callback.from_user.id, uow)
-        logged, goal, remaining = progress
+                                                             
+    data = await state.get_data()
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
 
-                                                                 
-        data = await state.get_data()
-        profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+                              
+    rows = keyboard.inline_keyboard.copy()
+    rows.append([InlineKeyboardButton(text="🗑 Удалить", callback_data=MenuCallback("delete_water", arg=str(log_id), parent_context=parent_context).pack())])
+    keyboard_with_delete = InlineKeyboardMarkup(inline_keyboard=rows)
 
-                                                                  
-        keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-                                  
-        rows = keyboard.inline_keyboard.copy()
-        rows.append([InlineKeyboardButton(text="🗑 Удалить", callback_data=f"delete_water:{log_id}:{parent_context}")])
-        keyboard_with_delete = InlineKeyboardMarkup(inline_keyboard=rows)
-
-        await replace_menu_message(
-            message_or_callback=callback,
-            text=(
-                f"💧 Вода добавлена: {volume} мл\n\n"
-                f"📊 Прогресс:\n"
-                f"Выпито: {logged} мл\n"
-                f"Цель: {goal} мл\n"
-                f"Осталось: {remaining} мл"
-            ),
-            keyboard=keyboard_with_delete,
-            state=state,
-            return_menu=parent_context,
-        )
+    await replace_menu_message(
+        message_or_callback=callback,
+        text=(
+            f"💧 Вода добавлена: {volume} мл\n\n"
+            f"📊 Прогресс:\n"
+            f"Выпито: {daily_stats.water_logged_ml} мл\n"
+            f"Цель: {daily_stats.water_goal_ml} мл\n"
+            f"Осталось: {daily_stats.water_remaining_ml} мл"
+        ),
+        keyboard=keyboard_with_delete,
+        state=state,
+        return_menu=parent_context,
+    )
 
 
-@router.callback_query(F.data.startswith("water_progress"))
-async def callback_water_progress(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("water_progress")
+async def callback_water_progress(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, read_uow: SqlAlchemyUnitOfWork
+):
     
                                                                                                    
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
-        logged, goal, remaining = await get_water_progress(callback.from_user.id, uow)
+    async with read_uow:
+        logged, goal, remaining = await get_water_progress(callback.from_user.id, read_uow)
 
-                                                                 
-        data = await state.get_data()
-        profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+                                                             
+    data = await state.get_data()
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
 
-                                                                  
-        keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-
-        await replace_menu_message(
-            message_or_callback=callback,
-            text=(
-                f"📊 Прогресс по воде:\n"
-                f"Выпито: {logged} мл\n"
-                f"Цель: {goal} мл\n"
-                f"Осталось: {remaining} мл"
-            ),
-            keyboard=keyboard,
-            state=state,
-            return_menu=parent_context,
-        )
+                                                              
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
 
+    await replace_menu_message(
+        message_or_callback=callback,
+        text=(
+            f"📊 Прогресс по воде:\n"
+            f"Выпито: {logged} мл\n"
+            f"Цель: {goal} мл\n"
+            f"Осталось: {remaining} мл"
+        ),
+        keyboard=keyboard,
+        state=state,
+        return_menu=parent_context,
+    )
 
-@router.callback_query(F.data.startswith("delete_water"))
-async def callback_delete_water(callback: CallbackQuery, state: FSMContext):
+
+@callbacks.route("delete_water", with_arg=True)
+async def callback_delete_water(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, uow: SqlAlchemyUnitOfWork
+):
     
                                                                             
-    parts = callback.data.split(":")
-    if len(parts) < 3:
+    if callback_data.arg is None or not callback_data.arg.isdigit():
         await callback.answer("Неверный формат")
         return
-    log_id = int(parts[1])
-    parent_context = parts[2] if parts[2] != "" else "main_menu"
+    log_id = int(callback_data.arg)
+    parent_context = callback_data.parent_context
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await delete_water_log(log_id, callback.from_user.id, uow)
     except EntityNotFoundError:
         await callback.answer("Запись не найдена")
@@ -181,7 +181,12 @@ async def callback_delete_water(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(WaterLogStates.enter_ml), F.text)
-async def process_water_ml_input(message: Message, state: FSMContext):
+async def process_water_ml_input(
+    message: Message,
+    state: FSMContext,
+    uow: SqlAlchemyUnitOfWork,
+    water_buffer: Optional[WaterWriteBuffer],
+):
     
                      
     try:
@@ -192,9 +197,7 @@ async def process_water_ml_input(message: Message, state: FSMContext):
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -205,38 +208,34 @@ async def process_water_ml_input(message: Message, state: FSMContext):
         )
         return
 
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
-        log_id = await log_water(message.from_user.id, volume, uow)
-
-                                       
-        logged, goal, remaining = await get_water_progress(message.from_user.id, uow)
-
-                                                                     
-        data = await state.get_data()
-        parent_context = data.get("parent_context") or "main_menu"
-        profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
+    log_id, daily_stats = await record_water(message.from_user.id, volume, uow, water_buffer)
 
-                                                          
-        keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-                                  
-        rows = keyboard.inline_keyboard.copy()
-        rows.append([InlineKeyboardButton(text="🗑 Удалить", callback_data=f"delete_water:{log_id}:{parent_context}")])
-        keyboard_with_delete = InlineKeyboardMarkup(inline_keyboard=rows)
+                                                                 
+    data = await state.get_data()
+    parent_context = data.get("parent_context") or "main_menu"
+    profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
 
-        await send_menu_new(
-            bot=message.bot,
-            chat_id=message.chat.id,
-            text=(
-                f"💧 Вода добавлена: {volume} мл\n\n"
-                f"📊 Прогресс:\n"
-                f"Выпито: {logged} мл\n"
-                f"Цель: {goal} мл\n"
-                f"Осталось: {remaining} мл"
-            ),
-            keyboard=keyboard_with_delete,
-            state=state,
-            return_menu=parent_context,
-        )
-        await state.set_state(None)
-                                                          
-        await state.update_data(parent_context=None, profile_setup_parent=None)
\ No newline at end of file
+                                                      
+    keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+                              
+    rows = keyboard.inline_keyboard.copy()
+    rows.append([InlineKeyboardButton(text="🗑 Удалить", callback_data=MenuCallback("delete_water", arg=str(log_id), parent_context=parent_context).pack())])
+    keyboard_with_delete = InlineKeyboardMarkup(inline_keyboard=rows)
+
+    await send_menu_new(
+        bot=message.bot,
+        chat_id=message.chat.id,
+        text=(
+            f"💧 Вода добавлена: {volume} мл\n\n"
+            f"📊 Прогресс:\n"
+            f"Выпито: {daily_stats.water_logged_ml} мл\n"
+            f"Цель: {daily_stats.water_goal_ml} мл\n"
+            f"Осталось: {daily_stats.water_remaining_ml} мл"
+        ),
+        keyboard=keyboard_with_delete,
+        state=state,
+        return_menu=parent_context,
+    )
+    await state.set_state(None)
+                                                      
+    await state.update_data(parent_context=None, profile_setup_parent=None)
\ No newline at end of file
@@ -4,10 +4,9 @@ from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 
 from presentation.fsm.states import WorkoutLogStates
-from presentation.keyboards.inline import main_menu_keyboard, workout_type_keyboard, profile_setup_keyboard
+from presentation.keyboards.inline import main_menu_keyboard, workout_type_keyboard, profile_setup_keyboard, cancel_input_keyboard
 from presentation.validators.workout import validate_workout_minutes
 from domain.exceptions import ValidationError, EntityNotFoundError
-from infrastructure.config.database import AsyncSessionFactory
 from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
 from application.use_cases.workout.set_workout_type import get_workout_met
 from application.use_cases.workout.set_workout_minutes import calculate_workout_calories_and_water
@@ -15,16 +14,16 @@ from application.use_cases.workout.finalize_workout_log import finalize_workout_
 from application.use_cases.workout.delete_workout_log import delete_workout_log
 from presentation.services.menu_manager import show_menu, replace_menu_message, send_menu_new
 from presentation.services.keyboard_mapper import get_keyboard_for_parent_context, get_callback_data_for_parent_context
+from presentation.callbacks import MenuCallback, callbacks
 
 router = Router()
 
 
-@router.callback_query(F.data.startswith("workout_add"))
-async def callback_workout_add(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("workout_add")
+async def callback_workout_add(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
     
                                                                                              
-    parts = callback.data.split(":")
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
+    parent_context = callback_data.parent_context
 
                                        
     await state.update_data(parent_context=parent_context)
@@ -38,24 +37,20 @@ async def callback_workout_add(callback: CallbackQuery, state: FSMContext):
     )
 
 
-@router.callback_query(StateFilter(WorkoutLogStates.select_workout_type), F.data.startswith("workout_"))
-async def callback_workout_type(callback: CallbackQuery, state: FSMContext):
-    
-                                                                                 
-    parts = callback.data.split(":")
-    workout_key = parts[0]
-    parent_context = parts[1] if len(parts) > 1 and parts[1] != "" else "main_menu"
-
-    type_map = {
+@callbacks.route(
+    values={
         "workout_running": "бег",
         "workout_walking": "ходьба",
         "workout_strength": "силовая",
         "workout_swimming": "плавание",
-    }
-    workout_type = type_map.get(workout_key)
-    if workout_type is None:
-        await callback.answer("Неизвестный тип тренировки")
-        return
+    },
+    state=WorkoutLogStates.select_workout_type,
+)
+async def callback_workout_type(callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback):
+    
+                                                                                 
+    workout_type = callback_data.value
+    parent_context = callback_data.parent_context
 
                                                              
     data = await state.get_data()
@@ -69,9 +64,7 @@ async def callback_workout_type(callback: CallbackQuery, state: FSMContext):
 
                                                          
     cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-    cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-    ])
+    cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
 
     await replace_menu_message(
         message_or_callback=callback,
@@ -86,7 +79,9 @@ async def callback_workout_type(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(WorkoutLogStates.enter_minutes), F.text)
-async def process_workout_minutes_input(message: Message, state: FSMContext):
+async def process_workout_minutes_input(
+    message: Message, state: FSMContext, uow: SqlAlchemyUnitOfWork, read_uow: SqlAlchemyUnitOfWork
+):
     
                      
     try:
@@ -98,9 +93,7 @@ async def process_workout_minutes_input(message: Message, state: FSMContext):
         parent_context = data.get("parent_context") or "main_menu"
         profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
         cancel_callback_data = get_callback_data_for_parent_context(parent_context, profile_setup_parent)
-        cancel_keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ Отмена", callback_data=cancel_callback_data)]
-        ])
+        cancel_keyboard = cancel_input_keyboard(cancel_callback_data)
         await show_menu(
             bot=message.bot,
             chat_id=message.chat.id,
@@ -116,46 +109,45 @@ async def process_workout_minutes_input(message: Message, state: FSMContext):
     workout_type = data.get("workout_type", "бег")                         
     parent_context = data.get("parent_context") or "main_menu"
     profile_setup_parent = data.get("profile_setup_parent") or "main_menu"
-    log_id = None
-
-    async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
-                                                   
-        user = await uow.users.get(message.from_user.id)
-        if user is None:
-                                                                      
-            keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-
-            await show_menu(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                text="❌ Сначала настройте профиль.",
-                keyboard=keyboard,
-                state=state,
-                return_menu=parent_context,
-            )
-            await state.set_state(None)
-                                                              
-            await state.update_data(parent_context=None, profile_setup_parent=None, workout_type=None)
-            return
-
-        weight_kg = user.weight_kg
-        try:
-            kcal_burned, water_bonus_ml = calculate_workout_calories_and_water(
-                weight_kg, workout_type, minutes
-            )
-        except ValidationError as e:
-                                                                      
-            keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
-            await show_menu(
-                bot=message.bot,
-                chat_id=message.chat.id,
-                text=f"❌ {e.message}",
-                keyboard=keyboard,
-                state=state,
-                return_menu=parent_context,
-            )
-            return
 
+    async with read_uow:
+        user = await read_uow.users.get(message.from_user.id)
+
+    if user is None:
+                                                                  
+        keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+
+        await show_menu(
+            bot=message.bot,
+            chat_id=message.chat.id,
+            text="❌ Сначала настройте профиль.",
+            keyboard=keyboard,
+            state=state,
+            return_menu=parent_context,
+        )
+        await state.set_state(None)
+                                                          
+        await state.update_data(parent_context=None, profile_setup_parent=None, workout_type=None)
+        return
+
+    try:
+        kcal_burned, water_bonus_ml = calculate_workout_calories_and_water(
+            user.weight_kg, workout_type, minutes
+        )
+    except ValidationError as e:
+                                                                  
+        keyboard = get_keyboard_for_parent_context(parent_context, profile_setup_parent)
+        await show_menu(
+            bot=message.bot,
+            chat_id=message.chat.id,
+            text=f"❌ {e.message}",
+            keyboard=keyboard,
+            state=state,
+            return_menu=parent_context,
+        )
+        return
+
+    async with uow:
         log_id = await finalize_workout_log(
             user_id=message.from_user.id,
             workout_type=workout_type,
@@ -174,7 +166,7 @@ async def process_workout_minutes_input(message: Message, state: FSMContext):
         keyboard = main_menu_keyboard()            
                               
     rows = keyboard.inline_keyboard.copy()
-    rows.append([InlineKeyboardButton(text="🗑 Удалить", callback_data=f"delete_workout:{log_id}:{parent_context}")])
+    rows.append([InlineKeyboardButton(text="🗑 Удалить", callback_data=MenuCallback("delete_workout", arg=str(log_id), parent_context=parent_context).pack())])
     keyboard_with_delete = InlineKeyboardMarkup(inline_keyboard=rows)
 
     await send_menu_new(
@@ -194,19 +186,20 @@ async def process_workout_minutes_input(message: Message, state: FSMContext):
     await state.clear()
 
 
-@router.callback_query(F.data.startswith("delete_workout"))
-async def callback_delete_workout(callback: CallbackQuery, state: FSMContext):
+@callbacks.route("delete_workout", with_arg=True)
+async def callback_delete_workout(
+    callback: CallbackQuery, state: FSMContext, callback_data: MenuCallback, uow: SqlAlchemyUnitOfWork
+):
     
                                                                               
-    parts = callback.data.split(":")
-    if len(parts) < 3:
+    if callback_data.arg is None or not callback_data.arg.isdigit():
         await callback.answer("Неверный формат")
         return
-    log_id = int(parts[1])
-    parent_context = parts[2] if parts[2] != "" else "main_menu"
+    log_id = int(callback_data.arg)
+    parent_context = callback_data.parent_context
 
     try:
-        async with SqlAlchemyUnitOfWork(AsyncSessionFactory) as uow:
+        async with uow:
             await delete_workout_log(log_id, callback.from_user.id, uow)
     except EntityNotFoundError:
         await callback.answer("Запись не найдена")
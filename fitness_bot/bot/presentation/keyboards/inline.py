@@ -1,12 +1,15 @@
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from datetime import date
 
+from presentation.keyboards.registry import registered_keyboard
+
 #тут клавиатуры
 def _normalize_parent_context(parent_context: str) -> str:
     
     return parent_context if parent_context != "" else "main_menu"
 
 
+@registered_keyboard(daily=True)
 def main_menu_keyboard() -> InlineKeyboardMarkup:
     
     buttons = [
@@ -31,6 +34,7 @@ def main_menu_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard()
 def profile_setup_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
     
     parent_context = _normalize_parent_context(parent_context)
@@ -57,6 +61,7 @@ def profile_setup_keyboard(parent_context: str = "main_menu") -> InlineKeyboardM
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard()
 def water_volume_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
     
     parent_context = _normalize_parent_context(parent_context)
@@ -79,6 +84,7 @@ def water_volume_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMa
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard()
 def food_type_keyboard() -> InlineKeyboardMarkup:
     
     buttons = [
@@ -97,6 +103,7 @@ def food_type_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard()
 def food_product_confirmation_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
     
     parent_context = _normalize_parent_context(parent_context)
@@ -109,6 +116,7 @@ def food_product_confirmation_keyboard(parent_context: str = "main_menu") -> Inl
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard()
 def workout_type_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
     
     parent_context = _normalize_parent_context(parent_context)
@@ -128,6 +136,7 @@ def workout_type_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMa
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard()
 def calorie_goal_mode_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
     
     parent_context = _normalize_parent_context(parent_context)
@@ -143,6 +152,7 @@ def calorie_goal_mode_keyboard(parent_context: str = "main_menu") -> InlineKeybo
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard()
 def water_goal_mode_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
     
     parent_context = _normalize_parent_context(parent_context)
@@ -158,6 +168,7 @@ def water_goal_mode_keyboard(parent_context: str = "main_menu") -> InlineKeyboar
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard(daily=True)
 def weekly_stats_keyboard(reference_date: date) -> InlineKeyboardMarkup:
     
     from datetime import timedelta
@@ -182,6 +193,7 @@ def weekly_stats_keyboard(reference_date: date) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard(daily=True)
 def progress_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
     
     from datetime import date
@@ -201,6 +213,7 @@ def progress_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@registered_keyboard()
 def charts_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
     
     parent_context = _normalize_parent_context(parent_context)
@@ -208,9 +221,22 @@ def charts_keyboard(parent_context: str = "main_menu") -> InlineKeyboardMarkup:
         [
             InlineKeyboardButton(text="7 дней", callback_data=f"charts_period_7:{parent_context}"),
             InlineKeyboardButton(text="30 дней", callback_data=f"charts_period_30:{parent_context}"),
+            InlineKeyboardButton(text="90 дней", callback_data=f"charts_period_90:{parent_context}"),
+        ],
+        [
+            InlineKeyboardButton(text="1 год", callback_data=f"charts_period_365:{parent_context}"),
+            InlineKeyboardButton(text="5 лет", callback_data=f"charts_period_1825:{parent_context}"),
         ],
         [
             InlineKeyboardButton(text="◀️ Назад", callback_data=parent_context),
         ],
     ]
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
\ No newline at end of file
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+@registered_keyboard()
+def cancel_input_keyboard(callback_data: str) -> InlineKeyboardMarkup:
+    
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="◀️ Отмена", callback_data=callback_data)]
+    ])
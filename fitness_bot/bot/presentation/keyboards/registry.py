@@ -0,0 +1,101 @@
+import functools
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from aiogram.types import InlineKeyboardMarkup
+
+KeyboardKey = Tuple[Hashable, ...]
+
+
+def validate_inline_keyboard(keyboard: InlineKeyboardMarkup) -> None:
+    for row_idx, row in enumerate(keyboard.inline_keyboard):
+        for btn_idx, button in enumerate(row):
+            if not button.callback_data and not button.url:
+                raise ValueError(
+                    f"Inline keyboard button at row {row_idx}, column {btn_idx} "
+                    f"has text '{button.text}' but lacks both callback_data and url. "
+                    f"Text buttons are not allowed in inline keyboards."
+                )
+
+
+class KeyboardRegistry:
+    def __init__(self, max_entries: int = 512):
+        """
+        Инициализирует реестр готовых inline-клавиатур.
+
+        Входные параметры:
+            max_entries (int): Максимальное число клавиатур в реестре.
+
+        Логика работы:
+            - Клавиатура строится и проверяется один раз на ключ
+              (вид, parent_context, дата для клавиатур с кнопками на сегодня).
+            - Повторные запросы получают тот же экземпляр; модели aiogram
+              неизменяемы, поэтому экземпляр безопасно разделять.
+            - Реестр помнит выданные экземпляры, чтобы menu_manager не
+              проверял их повторно.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[KeyboardKey, InlineKeyboardMarkup]" = OrderedDict()
+        self._prebuilt_ids: Dict[int, KeyboardKey] = {}
+        self.stats = {"hits": 0, "builds": 0}
+
+    def get_or_build(
+        self, key: KeyboardKey, build: Callable[[], InlineKeyboardMarkup]
+    ) -> InlineKeyboardMarkup:
+        keyboard = self._entries.get(key)
+        if keyboard is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return keyboard
+
+        keyboard = build()
+        validate_inline_keyboard(keyboard)
+        self._entries[key] = keyboard
+        self._prebuilt_ids[id(keyboard)] = key
+        self.stats["builds"] += 1
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._prebuilt_ids.pop(id(evicted), None)
+        return keyboard
+
+    def is_prebuilt(self, keyboard: InlineKeyboardMarkup) -> bool:
+        key = self._prebuilt_ids.get(id(keyboard))
+        return key is not None and self._entries.get(key) is keyboard
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "entries": len(self._entries)}
+
+
+keyboard_registry = KeyboardRegistry()
+
+
+def registered_keyboard(daily: bool = False) -> Callable:
+    """
+    Декоратор функции-построителя клавиатуры, кэширующий результат в реестре.
+
+    Входные параметры:
+        daily (bool): Клавиатура содержит кнопки с сегодняшней датой
+        и должна перестраиваться раз в сутки.
+
+    Возвращаемое значение:
+        Callable: Декоратор.
+    """
+
+    def decorator(builder: Callable[..., InlineKeyboardMarkup]) -> Callable[..., InlineKeyboardMarkup]:
+        @functools.wraps(builder)
+        def wrapper(*args: Any, **kwargs: Any) -> InlineKeyboardMarkup:
+            key = (
+                builder.__name__,
+                args,
+                tuple(sorted(kwargs.items())),
+                date.today() if daily else None,
+            )
+            return keyboard_registry.get_or_build(key, lambda: builder(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
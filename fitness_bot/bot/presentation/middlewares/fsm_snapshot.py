@@ -0,0 +1,160 @@
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from copy import copy
+from typing import Any, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.types import TelegramObject
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedFSMContext(FSMContext):
+    def __init__(self, storage: BaseStorage, key: StorageKey, raw_state: Optional[str]):
+        """
+        Контекст FSM, работающий со снимком состояния и данных в пределах одного обновления.
+
+        Входные параметры:
+            storage (BaseStorage): Хранилище FSM.
+            key (StorageKey): Ключ пользователя/чата.
+            raw_state (Optional[str]): Состояние, уже прочитанное aiogram.
+
+        Логика работы:
+            - Данные читаются из хранилища не более одного раза, при первом обращении.
+            - Изменения накапливаются в памяти и записываются методом flush().
+            - Запись выполняется только для реально изменившихся состояния и данных.
+
+        Возвращаемое значение:
+            None.
+        """
+        super().__init__(storage=storage, key=key)
+        self._state = raw_state
+        self._data: Optional[Dict[str, Any]] = None
+        self._state_dirty = False
+        self._data_dirty = False
+        self.calls = 0
+        self.loads = 0
+
+    async def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = await self.storage.get_data(key=self.key)
+            self.loads += 1
+        return self._data
+
+    async def set_state(self, state: StateType = None) -> None:
+        self.calls += 1
+        value = state.state if isinstance(state, State) else state
+        if value != self._state:
+            self._state = value
+            self._state_dirty = True
+
+    async def get_state(self) -> Optional[str]:
+        self.calls += 1
+        return self._state
+
+    async def set_data(self, data: Mapping[str, Any]) -> None:
+        self.calls += 1
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+        if self._data is None or data != self._data:
+            self._data = data.copy()
+            self._data_dirty = True
+
+    async def get_data(self) -> Dict[str, Any]:
+        self.calls += 1
+        return (await self._load()).copy()
+
+    async def get_value(self, key: str, default: Any = None) -> Any:
+        self.calls += 1
+        return copy((await self._load()).get(key, default))
+
+    async def update_data(
+        self,
+        data: Optional[Mapping[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        self.calls += 1
+        if data:
+            kwargs.update(data)
+        current = await self._load()
+        if any(key not in current or current[key] != value for key, value in kwargs.items()):
+            current.update(kwargs)
+            self._data_dirty = True
+        return current.copy()
+
+    async def flush(self) -> int:
+        """
+        Записывает накопленные изменения в хранилище.
+
+        Возвращаемое значение:
+            int: Число выполненных записей в хранилище (0, 1 или 2).
+        """
+        writes = 0
+        if self._state_dirty:
+            await self.storage.set_state(key=self.key, state=self._state)
+            self._state_dirty = False
+            writes += 1
+        if self._data_dirty:
+            await self.storage.set_data(key=self.key, data=self._data)
+            self._data_dirty = False
+            writes += 1
+        return writes
+
+
+class FSMSnapshotMiddleware(BaseMiddleware):
+    def __init__(self):
+        """
+        Инициализирует middleware, подменяющий контекст FSM буферизованным.
+
+        Логика работы:
+            - Регистрируется на dp.update после встроенного FSMContextMiddleware
+              и заменяет data["state"] на BufferedFSMContext.
+            - После обработки обновления, в том числе завершившейся ошибкой,
+              записывает изменения одним flush().
+            - Ошибка записи только логируется, чтобы не заменить собой
+              исключение обработчика.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.stats = {
+            "updates": 0,
+            "context_calls": 0,
+            "storage_reads": 0,
+            "storage_writes": 0,
+            "flush_failures": 0,
+        }
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        context = data.get("state")
+        if context is None:
+            return await handler(event, data)
+
+        buffered = BufferedFSMContext(context.storage, context.key, data.get("raw_state"))
+        data["state"] = buffered
+        try:
+            return await handler(event, data)
+        finally:
+            writes = 0
+            try:
+                writes = await buffered.flush()
+            except Exception:
+                self.stats["flush_failures"] += 1
+                logger.exception("Failed to flush FSM state for %s", buffered.key)
+            self.stats["updates"] += 1
+            self.stats["context_calls"] += buffered.calls
+            self.stats["storage_reads"] += buffered.loads
+            self.stats["storage_writes"] += writes
+
+    def snapshot(self) -> dict:
+        return dict(self.stats)
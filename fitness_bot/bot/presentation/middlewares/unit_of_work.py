@@ -0,0 +1,93 @@
+from collections.abc import Awaitable, Callable
+from typing import Any, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject
+
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from presentation.callbacks import callbacks
+
+
+class SessionHoldStats:
+    __slots__ = ("sessions", "hold_total_s", "hold_max_s")
+
+    def __init__(self):
+        self.sessions = 0
+        self.hold_total_s = 0.0
+        self.hold_max_s = 0.0
+
+    def record(self, hold_s: float) -> None:
+        self.sessions += 1
+        self.hold_total_s += hold_s
+        self.hold_max_s = max(self.hold_max_s, hold_s)
+
+    def snapshot(self) -> dict:
+        return {
+            "sessions": self.sessions,
+            "hold_avg_ms": round(self.hold_total_s / self.sessions * 1000, 3) if self.sessions else 0.0,
+            "hold_max_ms": round(self.hold_max_s * 1000, 3),
+        }
+
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    def __init__(self, session_factory, read_session_factory):
+        """
+        Инициализирует middleware, передающий обработчикам единицы работы.
+
+        Входные параметры:
+            session_factory: Фабрика сессий основного сервера (запись).
+            read_session_factory: Фабрика сессий чтения (ReplicaRouter).
+
+        Логика работы:
+            - Регистрируется как внутренний middleware сообщений и callback-запросов
+              и передаёт обработчику неоткрытые uow и read_uow пользователя.
+            - Сессия открывается только в блоке async with обработчика,
+              поэтому обновления без обращения к базе не занимают соединений.
+            - Обработчик держит блок async with только на время сценария
+              и отправляет ответы в Telegram уже после него.
+            - Время удержания сессии учитывается по имени обработчика.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self._handlers: Dict[str, SessionHoldStats] = {}
+
+    def _handler_name(self, event: TelegramObject, data: Dict[str, Any]) -> str:
+        if isinstance(event, CallbackQuery):
+            name = callbacks.handler_name(event.data)
+            if name is not None:
+                return name
+        handler = data.get("handler")
+        if handler is not None:
+            return handler.callback.__name__
+        return type(event).__name__
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        user_id: Optional[int] = user.id if user is not None else None
+        name = self._handler_name(event, data)
+        stats = self._handlers.get(name)
+        if stats is None:
+            stats = self._handlers[name] = SessionHoldStats()
+
+        data["uow"] = SqlAlchemyUnitOfWork(
+            self.session_factory, user_id=user_id, on_release=stats.record
+        )
+        data["read_uow"] = SqlAlchemyUnitOfWork(
+            self.read_session_factory, read_only=True, user_id=user_id, on_release=stats.record
+        )
+        return await handler(event, data)
+
+    def snapshot(self) -> dict:
+        return {
+            name: stats.snapshot()
+            for name, stats in self._handlers.items()
+            if stats.sessions
+        }
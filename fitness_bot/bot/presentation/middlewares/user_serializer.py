@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import TelegramObject, Update
+
+logger = logging.getLogger(__name__)
+
+BUSY_NOTICE = "⏳ Предыдущие действия ещё обрабатываются, повторите через пару секунд."
+
+
+class _UserSlot:
+    __slots__ = ("lock", "pending", "waiting")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.pending = 0
+        self.waiting = 0
+
+
+class UserSerializerMiddleware(BaseMiddleware):
+    def __init__(self, max_depth: int = 5, clock: Callable[[], float] = time.perf_counter):
+        """
+        Инициализирует middleware, обрабатывающий обновления одного пользователя по очереди.
+
+        Входные параметры:
+            max_depth (int): Сколько обновлений пользователя может ожидать
+            в очереди одновременно; сверх этого обновления отбрасываются.
+            clock (Callable[[], float]): Источник монотонного времени.
+
+        Логика работы:
+            - Регистрируется на dp.update до FSMSnapshotMiddleware.
+            - Для каждого пользователя заводится своя блокировка, поэтому
+              обновления разных пользователей обрабатываются параллельно,
+              а одного — строго в порядке поступления.
+            - Блокировка удаляется, когда у пользователя не остаётся
+              обновлений в обработке.
+            - Если при поступлении у пользователя уже было обновление
+              в обработке или в очереди, состояние FSM перечитывается после
+              получения блокировки: предыдущее обновление могло его изменить.
+              Признак берётся из счётчика, а не из lock.locked(), который
+              ложен в момент передачи блокировки следующему ожидающему.
+            - На отброшенный callback-запрос отвечает коротким уведомлением,
+              чтобы у кнопки не висел индикатор загрузки.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.max_depth = max_depth
+        self._clock = clock
+        self._slots: Dict[int, _UserSlot] = {}
+        self.stats = {
+            "updates": 0,
+            "queued": 0,
+            "rejected": 0,
+            "wait_total_s": 0.0,
+            "wait_max_s": 0.0,
+        }
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        slot = self._slots.get(user.id)
+        if slot is None:
+            slot = self._slots[user.id] = _UserSlot()
+        if slot.pending > 0 and slot.waiting >= self.max_depth:
+            self.stats["rejected"] += 1
+            logger.warning("User %s update queue is full, dropping update", user.id)
+            if isinstance(event, Update) and event.callback_query is not None:
+                try:
+                    await event.callback_query.answer(BUSY_NOTICE)
+                except TelegramAPIError:
+                    logger.debug("Failed to answer dropped callback query", exc_info=True)
+            return None
+
+        queued = slot.pending > 0
+        slot.pending += 1
+        try:
+            started = self._clock()
+            slot.waiting += 1
+            try:
+                await slot.lock.acquire()
+            finally:
+                slot.waiting -= 1
+            try:
+                self.stats["updates"] += 1
+                if queued:
+                    waited = self._clock() - started
+                    self.stats["queued"] += 1
+                    self.stats["wait_total_s"] += waited
+                    self.stats["wait_max_s"] = max(self.stats["wait_max_s"], waited)
+                    context = data.get("state")
+                    if context is not None:
+                        data["raw_state"] = await context.get_state()
+                return await handler(event, data)
+            finally:
+                slot.lock.release()
+        finally:
+            slot.pending -= 1
+            if slot.pending == 0:
+                self._slots.pop(user.id, None)
+
+    def snapshot(self) -> dict:
+        queued = self.stats["queued"]
+        return {
+            "updates": self.stats["updates"],
+            "queued": queued,
+            "rejected": self.stats["rejected"],
+            "active_users": len(self._slots),
+            "wait_avg_ms": round(self.stats["wait_total_s"] / queued * 1000, 3) if queued else 0.0,
+            "wait_max_ms": round(self.stats["wait_max_s"] * 1000, 3),
+        }
@@ -1,5 +1,6 @@
 from aiogram import Router
 
+from presentation.callbacks import callbacks
 from presentation.handlers import profile_handlers, water_handlers, food_handlers, workout_handlers, progress_handlers
 
 
@@ -10,6 +11,6 @@ def setup_routers() -> Router:
     router.include_router(water_handlers.router)
     router.include_router(food_handlers.router)
     router.include_router(workout_handlers.router)
-    router.include_router(progress_handlers.router)
+    router.include_router(callbacks.router())
 
     return router
@@ -0,0 +1,110 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from domain.entities.daily_stats_series import DailyStatsSeries
+
+ChartKey = Tuple[int, int, str]
+
+
+@dataclass
+class CachedChart:
+    fingerprint: str
+    caption: str = ""
+    png_bytes: Optional[bytes] = None
+    file_id: Optional[str] = None
+
+
+def fingerprint_series(series: DailyStatsSeries) -> str:
+    """
+    Вычисляет отпечаток ряда суточной статистики для ключа кэша графиков.
+
+    Входные параметры:
+        series (DailyStatsSeries): Ряд статистики за период.
+
+    Логика работы:
+        - Хэширует байты массивов, которые отображаются на графиках.
+
+    Возвращаемое значение:
+        str: Шестнадцатеричный отпечаток ряда.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for f in fields(series):
+        digest.update(np.ascontiguousarray(getattr(series, f.name)).tobytes())
+    return digest.hexdigest()
+
+
+class ChartCache:
+    def __init__(self, max_entries: int):
+        """
+        Инициализирует кэш отрисованных графиков прогресса.
+
+        Входные параметры:
+            max_entries (int): Максимальное число графиков в памяти процесса.
+
+        Логика работы:
+            - Ключ записи — (user_id, период, отпечаток данных); ряд всегда
+              загружается из базы, поэтому изменения, сделанные другими
+              экземплярами бота, не приводят к отправке устаревшего графика.
+            - После отправки хранится только file_id Telegram, байты PNG удаляются.
+            - Все записи пользователя сбрасываются при изменении его данных.
+
+        Возвращаемое значение:
+            None.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[ChartKey, CachedChart]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[ChartKey]] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, user_id: int, period_days: int, fingerprint: str) -> Optional[CachedChart]:
+        key = (user_id, period_days, fingerprint)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry
+
+    def put(self, user_id: int, period_days: int, entry: CachedChart) -> None:
+        key = (user_id, period_days, entry.fingerprint)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._forget(evicted_key)
+
+    def _forget(self, key: ChartKey) -> None:
+        user_id = key[0]
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+    def invalidate_user(self, user_id: Optional[int]) -> None:
+        """
+        Удаляет все графики пользователя после изменения его данных.
+
+        Входные параметры:
+            user_id (Optional[int]): Идентификатор пользователя.
+
+        Возвращаемое значение:
+            None.
+        """
+        if user_id is None:
+            return
+        keys = self._keys_by_user.pop(user_id, None)
+        if not keys:
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+        self.stats["invalidations"] += 1
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "entries": len(self._entries)}
@@ -1,16 +1,68 @@
-from typing import List, Optional
-from domain.entities.daily_stats import DailyStats
-from infrastructure.charts.progress_charts import build_progress_charts_png
+from typing import Optional
 
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, Message
 
-def build_progress_chart(daily_stats: List[DailyStats]) -> Optional[bytes]:
+from application.services.progress_analytics import ProgressAnalytics
+from domain.entities.daily_stats_series import DailyStatsSeries
+from infrastructure.charts.render_service import ChartRenderService
+from presentation.services.chart_cache import CachedChart
+
+
+async def build_progress_chart(
+    series: DailyStatsSeries,
+    analytics: Optional[ProgressAnalytics],
+    chart_renderer: ChartRenderService,
+) -> Optional[bytes]:
     """
     Генерирует PNG-график прогресса по воде и калориям.
 
     Входные параметры:
-        daily_stats (List[DailyStats]): Список суточной статистики.
+        series (DailyStatsSeries): Ряд суточной статистики.
+        analytics (Optional[ProgressAnalytics]): Скользящие средние и тренды.
+        chart_renderer (ChartRenderService): Сервис построения графиков
+        в пуле процессов.
 
     Возвращаемое значение:
         Optional[bytes]: Байты PNG-изображения или None, если данных нет.
     """
-    return build_progress_charts_png(daily_stats)
+    return await chart_renderer.render_progress_charts(series, analytics)
+
+
+async def send_cached_chart(message: Message, cached: CachedChart, caption: str) -> bool:
+    """
+    Отправляет закэшированный график пользователю.
+
+    Входные параметры:
+        message (Message): Сообщение, в чат которого отправляется график.
+        cached (CachedChart): Запись кэша графиков.
+        caption (str): Подпись к изображению.
+
+    Логика работы:
+        - Если известен file_id, отправляет фото по нему без загрузки файла.
+        - Если Telegram отклонил file_id, сбрасывает его.
+        - Иначе загружает PNG и сохраняет полученный file_id,
+          после чего байты PNG больше не хранятся.
+
+    Возвращаемое значение:
+        bool: True, если график отправлен; False, если в записи
+        нет ни file_id, ни байтов PNG.
+    """
+    if cached.file_id is not None:
+        try:
+            await message.answer_photo(photo=cached.file_id, caption=caption)
+            return True
+        except TelegramBadRequest:
+            cached.file_id = None
+
+    if cached.png_bytes is None:
+        return False
+
+    sent = await message.answer_photo(
+        photo=BufferedInputFile(cached.png_bytes, filename="progress_chart.png"),
+        caption=caption,
+    )
+    if sent.photo:
+        cached.file_id = sent.photo[-1].file_id
+        cached.png_bytes = None
+    return True
@@ -1,20 +1,24 @@
 
+import hashlib
 from typing import Optional, Union
 from aiogram import Bot
 from aiogram.types import InlineKeyboardMarkup, Message, CallbackQuery
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 from aiogram.fsm.context import FSMContext
 
+from presentation.keyboards.registry import keyboard_registry, validate_inline_keyboard
 
-def _validate_inline_keyboard(keyboard: InlineKeyboardMarkup) -> None:
-    
-    for row_idx, row in enumerate(keyboard.inline_keyboard):
-        for btn_idx, button in enumerate(row):
-            if not button.callback_data and not button.url:
-                raise ValueError(
-                    f"Inline keyboard button at row {row_idx}, column {btn_idx} "
-                    f"has text '{button.text}' but lacks both callback_data and url. "
-                    f"Text buttons are not allowed in inline keyboards."
-                )
+
+def _menu_fingerprint(message_id: int, text: str, keyboard: Optional[InlineKeyboardMarkup]) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(text.encode())
+    if keyboard is not None:
+        digest.update(keyboard.model_dump_json(exclude_none=True).encode())
+    return f"{message_id}:{digest.hexdigest()}"
+
+
+def _is_not_modified(error: TelegramBadRequest) -> bool:
+    return "message is not modified" in error.message
 
 
 async def show_menu(
@@ -31,21 +35,24 @@ async def show_menu(
     await state.update_data(return_menu=return_menu)
 
                                    
-    if keyboard is not None:
-        _validate_inline_keyboard(keyboard)
+    if keyboard is not None and not keyboard_registry.is_prebuilt(keyboard):
+        validate_inline_keyboard(keyboard)
 
                                                    
+    data = await state.get_data()
     previous_message_id: Optional[int] = None
     if force_message_id is not None:
                                                        
         previous_message_id = force_message_id
         await state.update_data(menu_message_id=force_message_id)
     else:
-        data = await state.get_data()
         previous_message_id = data.get("menu_message_id")
 
     try:
         if previous_message_id is not None:
+            fingerprint = _menu_fingerprint(previous_message_id, text, keyboard)
+            if data.get("menu_fingerprint") == fingerprint:
+                return
                                               
             edit_kwargs = {
                 "chat_id": chat_id,
@@ -55,9 +62,15 @@ async def show_menu(
             }
             if keyboard is not None:
                 edit_kwargs["reply_markup"] = keyboard
-            await bot.edit_message_text(**edit_kwargs)
-                                                   
+            try:
+                await bot.edit_message_text(**edit_kwargs)
+            except TelegramBadRequest as error:
+                if not _is_not_modified(error):
+                    raise
+            await state.update_data(menu_fingerprint=fingerprint)
             return
+    except TelegramRetryAfter:
+        raise
     except Exception:
                                                                         
                                                
@@ -80,7 +93,10 @@ async def show_menu(
     if keyboard is not None:
         send_kwargs["reply_markup"] = keyboard
     message: Message = await bot.send_message(**send_kwargs)
-    await state.update_data(menu_message_id=message.message_id)
+    await state.update_data(
+        menu_message_id=message.message_id,
+        menu_fingerprint=_menu_fingerprint(message.message_id, text, keyboard),
+    )
 
 
 async def replace_menu_message(
@@ -151,8 +167,8 @@ async def send_menu_new(
     await state.update_data(return_menu=return_menu)
 
                                    
-    if keyboard is not None:
-        _validate_inline_keyboard(keyboard)
+    if keyboard is not None and not keyboard_registry.is_prebuilt(keyboard):
+        validate_inline_keyboard(keyboard)
 
                                           
     data = await state.get_data()
@@ -173,7 +189,10 @@ async def send_menu_new(
     message: Message = await bot.send_message(**send_kwargs)
 
                                
-    await state.update_data(menu_message_id=message.message_id)
+    await state.update_data(
+        menu_message_id=message.message_id,
+        menu_fingerprint=_menu_fingerprint(message.message_id, text, keyboard),
+    )
 
 
 async def get_return_menu(state: FSMContext) -> str:
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from typing import Any, List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedRequestHandler(SimpleRequestHandler):
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        workers: int,
+        queue_size: int,
+        secret_token: Optional[str] = None,
+        drain_timeout_s: float = 10.0,
+        **data: Any,
+    ):
+        """
+        Обработчик вебхука Telegram с очередью и фиксированным числом воркеров.
+
+        Входные параметры:
+            dispatcher (Dispatcher): Диспетчер aiogram.
+            bot (Bot): Экземпляр бота.
+            workers (int): Число задач, параллельно обрабатывающих обновления.
+            queue_size (int): Максимальное число ожидающих обновлений.
+            secret_token (Optional[str]): Секрет из заголовка
+            X-Telegram-Bot-Api-Secret-Token.
+            drain_timeout_s (float): Сколько ждать обработки очереди при остановке.
+
+        Логика работы:
+            - Проверяет секрет и сразу отвечает Telegram 200.
+            - Обновление кладётся в очередь и обрабатывается воркером.
+            - При переполненной очереди отвечает 503, чтобы Telegram повторил доставку.
+
+        Возвращаемое значение:
+            None.
+        """
+        super().__init__(
+            dispatcher=dispatcher,
+            bot=bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+        self.workers = workers
+        self.drain_timeout_s = drain_timeout_s
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._worker_tasks: List[asyncio.Task] = []
+        self.stats = {"accepted": 0, "rejected": 0, "processed": 0, "failed": 0}
+
+    def register(self, app: web.Application, /, path: str, **kwargs: Any) -> None:
+        app.on_startup.append(self._start_workers)
+        super().register(app, path=path, **kwargs)
+
+    async def _start_workers(self, *args: Any, **kwargs: Any) -> None:
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), name=f"webhook-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            bot, update = await self._queue.get()
+            try:
+                await self._background_feed_update(bot=bot, update=update)
+                self.stats["processed"] += 1
+            except Exception:
+                self.stats["failed"] += 1
+                logger.exception("Failed to process webhook update")
+            finally:
+                self._queue.task_done()
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        update = await request.json(loads=bot.session.json_loads)
+        try:
+            self._queue.put_nowait((bot, update))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            return web.Response(status=503, text="Busy")
+        self.stats["accepted"] += 1
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "queued": self._queue.qsize(),
+            "workers": len(self._worker_tasks),
+        }
+
+    async def close(self) -> None:
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout_s)
+        except asyncio.TimeoutError:
+            logger.warning("Webhook queue not drained, %s updates dropped", self._queue.qsize())
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        await super().close()
+
+
+async def _healthz(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok"})
+
+
+async def _metrics(request: web.Request) -> web.Response:
+    return web.json_response(metrics.snapshot())
+
+
+def build_webhook_app(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    path: str,
+    workers: int,
+    queue_size: int,
+    secret_token: Optional[str] = None,
+) -> web.Application:
+    """
+    Создаёт aiohttp-приложение, принимающее обновления Telegram через вебхук.
+
+    Входные параметры:
+        dispatcher (Dispatcher): Диспетчер aiogram.
+        bot (Bot): Экземпляр бота.
+        path (str): Путь вебхука.
+        workers (int): Число воркеров обработки обновлений.
+        queue_size (int): Размер очереди обновлений.
+        secret_token (Optional[str]): Секрет для проверки запросов Telegram.
+
+    Логика работы:
+        - Регистрирует обработчик вебхука с очередью.
+        - Добавляет /healthz для балансировщика и /metrics с метриками процесса.
+        - Подключает события запуска и остановки диспетчера.
+
+    Возвращаемое значение:
+        web.Application: Готовое приложение; его можно запускать
+        через web.AppRunner или отправлять в него запросы тестовым клиентом.
+    """
+    app = web.Application()
+    handler = QueuedRequestHandler(
+        dispatcher=dispatcher,
+        bot=bot,
+        workers=workers,
+        queue_size=queue_size,
+        secret_token=secret_token,
+    )
+    handler.register(app, path=path)
+    app.router.add_get("/healthz", _healthz)
+    app.router.add_get("/metrics", _metrics)
+    setup_application(app, dispatcher, bot=bot)
+    metrics.register("webhook", handler.snapshot)
+    return app
+
+
+async def run_webhook(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    host: str,
+    port: int,
+    path: str,
+    workers: int,
+    queue_size: int,
+    secret_token: Optional[str] = None,
+    public_url: Optional[str] = None,
+) -> None:
+    """
+    Запускает приём обновлений через вебхук до отмены задачи.
+
+    Входные параметры:
+        dispatcher (Dispatcher): Диспетчер aiogram.
+        bot (Bot): Экземпляр бота.
+        host (str): Адрес, на котором слушает HTTP-сервер.
+        port (int): Порт HTTP-сервера.
+        path (str): Путь вебхука.
+        workers (int): Число воркеров обработки обновлений.
+        queue_size (int): Размер очереди обновлений.
+        secret_token (Optional[str]): Секрет для проверки запросов Telegram.
+        public_url (Optional[str]): Публичный адрес вебхука. Если задан,
+        вебхук регистрируется в Telegram при запуске.
+
+    Возвращаемое значение:
+        None.
+    """
+    app = build_webhook_app(dispatcher, bot, path, workers, queue_size, secret_token)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=host, port=port)
+    await site.start()
+    logger.info("Webhook server listening on %s:%s%s", host, port, path)
+
+    if public_url:
+        await bot.set_webhook(
+            url=public_url,
+            secret_token=secret_token,
+            allowed_updates=dispatcher.resolve_used_update_types(),
+        )
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
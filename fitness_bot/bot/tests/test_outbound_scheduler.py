@@ -0,0 +1,79 @@
+import pytest
+
+from infrastructure.telegram.outbound_scheduler import OutboundScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return OutboundScheduler(
+        global_rate=30,
+        chat_rate=1,
+        chat_burst=3,
+        global_penalty_chats=3,
+        global_penalty_window_s=1.0,
+        clock=clock,
+    )
+
+
+def chat_delay(scheduler, chat_id, clock):
+    return scheduler._chat_bucket(chat_id, clock.now).delay(clock.now)
+
+
+def test_single_chat_flood_blocks_only_that_chat(scheduler, clock):
+    scheduler._penalize(1, 5)
+
+    assert chat_delay(scheduler, 1, clock) == pytest.approx(5)
+    assert chat_delay(scheduler, 2, clock) == 0
+    assert scheduler._global.delay(clock.now) == 0
+    assert scheduler.stats["global_penalties"] == 0
+
+    clock.now += 5
+    assert chat_delay(scheduler, 1, clock) == 0
+
+
+def test_repeated_flood_in_one_chat_does_not_block_globally(scheduler, clock):
+    for _ in range(5):
+        scheduler._penalize(1, 2)
+        clock.now += 0.1
+
+    assert scheduler._global.delay(clock.now) == 0
+    assert scheduler.stats["global_penalties"] == 0
+
+
+def test_flood_in_several_chats_blocks_globally(scheduler, clock):
+    scheduler._penalize(1, 3)
+    clock.now += 0.2
+    scheduler._penalize(2, 3)
+    clock.now += 0.2
+    scheduler._penalize(3, 4)
+
+    assert scheduler._global.delay(clock.now) == pytest.approx(4)
+    assert chat_delay(scheduler, 4, clock) == 0
+    assert scheduler.stats["global_penalties"] == 1
+
+    clock.now += 4
+    assert scheduler._global.delay(clock.now) == 0
+
+
+def test_floods_outside_window_do_not_add_up(scheduler, clock):
+    scheduler._penalize(1, 1)
+    clock.now += 0.6
+    scheduler._penalize(2, 1)
+    clock.now += 0.6
+    scheduler._penalize(3, 1)
+
+    assert scheduler._global.delay(clock.now) == 0
+    assert scheduler.stats["global_penalties"] == 0
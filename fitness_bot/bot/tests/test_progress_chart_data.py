@@ -0,0 +1,97 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from application.use_cases.progress.get_progress_chart_data import (
+    DEFAULT_MAX_CHART_POINTS,
+    chart_resolution_for_period,
+    downsample_series,
+    get_progress_chart_data,
+    rolling_window_for_period,
+)
+from domain.entities.daily_stats_series import DailyStatsSeries
+
+CHART_PERIODS_DAYS = (7, 30, 90, 365, 1825)
+RESOLUTION_STEP_DAYS = {"day": 1, "week": 7, "month": 30}
+
+
+def make_series(points: int, step_days: int = 1) -> DailyStatsSeries:
+    start = np.datetime64(date(2024, 1, 1), "D")
+    dates = start + np.arange(points) * step_days
+    rng = np.random.default_rng(points)
+    water = rng.integers(500, 2500, points).astype(np.int32)
+    kcal = rng.integers(1200, 2800, points).astype(np.int32)
+    water[points // 3] = 9000
+    kcal[2 * points // 3] = 8000
+    goals = np.full(points, 2000, dtype=np.int32)
+    return DailyStatsSeries(
+        dates=dates,
+        water_logged_ml=water,
+        water_goal_ml=goals,
+        calories_consumed_kcal=kcal,
+        calories_burned_kcal=np.zeros(points, dtype=np.int32),
+        calorie_goal_kcal=goals,
+    )
+
+
+class FakeDailyStats:
+    def __init__(self):
+        self.calls = []
+
+    async def get_series_for_user_in_range(self, user_id, date_from, date_to, resolution):
+        self.calls.append(resolution)
+        step = RESOLUTION_STEP_DAYS[resolution]
+        days = (date_to - date_from).days + 1
+        return make_series(-(-days // step), step)
+
+
+class FakeUnitOfWork:
+    def __init__(self):
+        self.daily_stats = FakeDailyStats()
+
+
+def test_downsample_keeps_budget_ends_and_peaks():
+    series = make_series(365)
+
+    result = downsample_series(series, DEFAULT_MAX_CHART_POINTS)
+
+    assert len(result) <= DEFAULT_MAX_CHART_POINTS
+    assert result.dates[0] == series.dates[0]
+    assert result.dates[-1] == series.dates[-1]
+    assert np.all(np.diff(result.dates.astype(np.int64)) > 0)
+    assert result.water_logged_ml.max() == 9000
+    assert result.calories_consumed_kcal.max() == 8000
+
+
+def test_downsample_returns_short_series_unchanged():
+    series = make_series(90)
+    assert downsample_series(series, DEFAULT_MAX_CHART_POINTS) is series
+
+
+@pytest.mark.parametrize("period_days", CHART_PERIODS_DAYS)
+async def test_offered_periods_fit_point_budget(period_days):
+    uow = FakeUnitOfWork()
+
+    series = await get_progress_chart_data(1, period_days, uow)
+
+    assert 0 < len(series) <= DEFAULT_MAX_CHART_POINTS
+    assert uow.daily_stats.calls == [chart_resolution_for_period(period_days)]
+
+
+@pytest.mark.parametrize("period_days", (365, 1825))
+async def test_long_offered_periods_are_downsampled(period_days):
+    resolution = chart_resolution_for_period(period_days)
+    loaded = -(-period_days // RESOLUTION_STEP_DAYS[resolution])
+    assert loaded > DEFAULT_MAX_CHART_POINTS
+
+    series = await get_progress_chart_data(1, period_days, FakeUnitOfWork())
+
+    assert len(series) < loaded
+    assert rolling_window_for_period(period_days) is None
+
+
+def test_rolling_window_only_for_unthinned_daily_series():
+    assert rolling_window_for_period(30) == 7
+    assert rolling_window_for_period(90) == 7
+    assert rolling_window_for_period(365) is None
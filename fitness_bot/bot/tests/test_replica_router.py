@@ -0,0 +1,126 @@
+import pytest
+
+from infrastructure.db.replica_router import ReplicaRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSession:
+    def __init__(self, name: str, fail_connect: bool):
+        self.name = name
+        self.fail_connect = fail_connect
+        self.connects = 0
+        self.closed = False
+
+    async def connection(self):
+        self.connects += 1
+        if self.fail_connect:
+            raise ConnectionRefusedError(self.name)
+        return self
+
+    async def execute(self, statement):
+        return self.name, statement
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeEngine:
+    def __init__(self, name: str):
+        self.name = name
+        self.down = False
+        self.sessions = []
+
+    def __call__(self) -> FakeSession:
+        session = FakeSession(self.name, self.down)
+        self.sessions.append(session)
+        return session
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def engines():
+    return FakeEngine("primary"), [FakeEngine("r0"), FakeEngine("r1")]
+
+
+@pytest.fixture
+def router(engines, clock):
+    primary, replicas = engines
+    return ReplicaRouter(
+        primary,
+        replicas,
+        staleness_window_s=5.0,
+        failure_cooldown_s=30.0,
+        clock=clock,
+    )
+
+
+async def read(router, user_id=None):
+    session = router.open_session(user_id)
+    try:
+        name, _ = await session.execute("SELECT 1")
+    finally:
+        await session.close()
+    return name
+
+
+async def test_round_robin_between_replicas(router):
+    assert [await read(router) for _ in range(4)] == ["r0", "r1", "r0", "r1"]
+    assert router.stats["replica_reads"] == 4
+
+
+async def test_open_session_does_not_connect(router, engines):
+    _, replicas = engines
+    session = router.open_session()
+    assert replicas[0].sessions[0].connects == 0
+    await session.close()
+
+
+async def test_failover_and_cooldown(router, engines, clock):
+    _, replicas = engines
+    replicas[0].down = True
+
+    assert await read(router) == "r1"
+    assert replicas[0].sessions[0].closed
+    assert router.stats["failovers"] == 1
+    assert not router.is_healthy(0)
+
+    replicas[0].down = False
+    assert [await read(router) for _ in range(3)] == ["r1", "r1", "r1"]
+
+    clock.now += 30.0
+    assert [await read(router) for _ in range(2)] == ["r0", "r1"]
+
+
+async def test_primary_when_all_replicas_down(router, engines):
+    _, replicas = engines
+    for replica in replicas:
+        replica.down = True
+
+    assert await read(router) == "primary"
+    assert router.stats["failovers"] == 2
+    assert router.stats["primary_reads"] == 1
+    assert await read(router) == "primary"
+    assert router.stats["failovers"] == 2
+
+
+async def test_recent_writer_reads_primary_within_window(router, clock):
+    router.mark_write(7)
+
+    assert await read(router, user_id=7) == "primary"
+    assert await read(router, user_id=8) == "r0"
+    assert router.stats["fresh_reads"] == 1
+
+    clock.now += 5.0
+    assert await read(router, user_id=7) == "r1"
+    assert router.snapshot()["tracked_writers"] == 0
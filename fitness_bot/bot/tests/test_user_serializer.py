@@ -0,0 +1,77 @@
+import asyncio
+
+from presentation.middlewares.user_serializer import UserSerializerMiddleware
+
+
+class FakeUser:
+    id = 42
+
+
+class FakeContext:
+    def __init__(self, storage: dict):
+        self.storage = storage
+
+    async def get_state(self):
+        return self.storage["state"]
+
+
+def make_data(storage: dict) -> dict:
+    return {
+        "event_from_user": FakeUser(),
+        "state": FakeContext(storage),
+        "raw_state": storage["state"],
+    }
+
+
+async def test_update_arriving_during_lock_handoff_rereads_state():
+    middleware = UserSerializerMiddleware(max_depth=5)
+    storage = {"state": "old"}
+    release_a = asyncio.Event()
+    handoff = asyncio.Event()
+    seen = {}
+
+    async def handler(event, data):
+        seen[event] = data["raw_state"]
+        if event == "A":
+            await release_a.wait()
+            storage["state"] = "new"
+            handoff.set()
+
+    async def late_update():
+        await handoff.wait()
+        await middleware(handler, "C", dict(make_data(storage), raw_state="old"))
+
+    late = asyncio.create_task(late_update())
+    a_data = make_data(storage)
+    b_data = make_data(storage)
+    a = asyncio.create_task(middleware(handler, "A", a_data))
+    await asyncio.sleep(0)
+    b = asyncio.create_task(middleware(handler, "B", b_data))
+    await asyncio.sleep(0)
+    release_a.set()
+    await asyncio.gather(a, b, late)
+
+    assert seen == {"A": "old", "B": "new", "C": "new"}
+    assert middleware.snapshot()["active_users"] == 0
+
+
+async def test_rejects_updates_beyond_max_depth_waiters():
+    middleware = UserSerializerMiddleware(max_depth=2)
+    gate = asyncio.Event()
+    storage = {"state": None}
+    handled = []
+
+    async def handler(event, data):
+        await gate.wait()
+        handled.append(event)
+
+    tasks = []
+    for event in range(5):
+        tasks.append(asyncio.create_task(middleware(handler, event, make_data(storage))))
+        await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    assert handled == [0, 1, 2]
+    assert middleware.stats["rejected"] == 2
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message
+from aiohttp.test_utils import TestClient, TestServer
+
+from presentation.webhook import build_webhook_app
+
+PATH = "/telegram/webhook"
+SECRET = "s3cret"
+
+
+def make_update(update_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": 1, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+            "text": f"update {update_id}",
+        },
+    }
+
+
+class GatedDispatcher:
+    def __init__(self):
+        self.dispatcher = Dispatcher()
+        self.gate = asyncio.Event()
+        self.started = asyncio.Event()
+        self.processed = []
+        self.dispatcher.message.register(self._handle)
+
+    async def _handle(self, message: Message) -> None:
+        self.started.set()
+        await self.gate.wait()
+        self.processed.append(message.message_id)
+
+
+@pytest.fixture
+async def gated():
+    return GatedDispatcher()
+
+
+async def make_client(gated: GatedDispatcher, workers: int, queue_size: int) -> TestClient:
+    bot = Bot("123456:test-token")
+    app = build_webhook_app(
+        gated.dispatcher, bot, PATH, workers=workers, queue_size=queue_size, secret_token=SECRET
+    )
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    return client
+
+
+async def send(client: TestClient, update_id: int, secret: str = SECRET):
+    return await client.post(
+        PATH,
+        json=make_update(update_id),
+        headers={"X-Telegram-Bot-Api-Secret-Token": secret},
+    )
+
+
+async def test_rejects_wrong_secret_token(gated):
+    gated.gate.set()
+    client = await make_client(gated, workers=1, queue_size=10)
+    try:
+        response = await send(client, 1, secret="wrong")
+        assert response.status == 401
+        response = await send(client, 2)
+        assert response.status == 200
+    finally:
+        await client.close()
+    assert gated.processed == [2]
+
+
+async def test_returns_503_when_queue_is_full(gated):
+    client = await make_client(gated, workers=1, queue_size=1)
+    try:
+        assert (await send(client, 1)).status == 200
+        await asyncio.wait_for(gated.started.wait(), 1.0)
+        assert (await send(client, 2)).status == 200
+        assert (await send(client, 3)).status == 503
+        metrics = await (await client.get("/metrics")).json()
+        assert metrics["webhook"]["rejected"] == 1
+        assert metrics["webhook"]["queued"] == 1
+        gated.gate.set()
+    finally:
+        await client.close()
+    assert gated.processed == [1, 2]
+
+
+async def test_close_drains_queued_updates(gated):
+    client = await make_client(gated, workers=2, queue_size=10)
+    for update_id in range(1, 7):
+        assert (await send(client, update_id)).status == 200
+    await asyncio.wait_for(gated.started.wait(), 1.0)
+    assert gated.processed == []
+
+    asyncio.get_running_loop().call_later(0.05, gated.gate.set)
+    await client.close()
+    assert sorted(gated.processed) == [1, 2, 3, 4, 5, 6]